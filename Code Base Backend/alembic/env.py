@@ -7,11 +7,6 @@ from sqlalchemy.engine import Connection
 
 from alembic import context
 
-# Import models to ensure they're registered with Base
-from app.db.database import Base
-from app.models import *  # noqa
-from app.core.config import settings
-
 # Alembic Config object
 config = context.config
 
@@ -19,12 +14,25 @@ config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
-# Model's MetaData object for 'autogenerate' support
-target_metadata = Base.metadata
+
+def _load_app():
+    """Import settings and every model (registering them with Base).
+
+    Deferred to the run_migrations_* functions so the app, its settings
+    validation and the full model graph are only loaded when a migration
+    actually needs a database URL or metadata.
+    """
+    from app.core.config import settings
+    from app.db.database import Base
+    import app.models  # noqa: F401
+
+    # Model's MetaData object for 'autogenerate' support
+    return settings, Base.metadata
 
 
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode."""
+    settings, target_metadata = _load_app()
     context.configure(
         url=settings.DATABASE_SYNC_URL,
         target_metadata=target_metadata,
@@ -37,6 +45,7 @@ def run_migrations_offline() -> None:
 
 def run_migrations_online() -> None:
     """Run migrations using sync psycopg2 engine (avoids asyncpg IPv6 issues)."""
+    settings, target_metadata = _load_app()
     connectable = create_engine(
         settings.DATABASE_SYNC_URL,
         poolclass=pool.NullPool,
@@ -0,0 +1,31 @@
+"""audit_logs (tenant_id, created_at DESC) index
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Already part of scripts/database_schema.sql; IF NOT EXISTS keeps this a
+    # no-op on databases created from it.
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_audit_created "
+        "ON audit_logs (tenant_id, created_at DESC)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_audit_created")
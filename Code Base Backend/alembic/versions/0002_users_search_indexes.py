@@ -0,0 +1,42 @@
+"""users name/email search indexes (pg_trgm + prefix)
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Substring search (lower(col) LIKE '%term%') in the admin staff listing
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS users_name_email_trgm ON users "
+        "USING gin (lower(name) gin_trgm_ops, lower(email) gin_trgm_ops)"
+    )
+    # Prefix search for terms shorter than a trigram
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_users_name_prefix "
+        "ON users (lower(name) text_pattern_ops)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_users_email_prefix "
+        "ON users (lower(email) text_pattern_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_users_email_prefix")
+    op.execute("DROP INDEX IF EXISTS idx_users_name_prefix")
+    op.execute("DROP INDEX IF EXISTS users_name_email_trgm")
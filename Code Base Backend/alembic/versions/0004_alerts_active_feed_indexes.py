@@ -0,0 +1,33 @@
+"""alerts active-feed and recipient indexes
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_alerts_active_created "
+        "ON alerts (tenant_id, created_at DESC) WHERE status IN ('unread', 'read')"
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS idx_alerts_for_roles ON alerts USING gin (for_roles)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_alerts_for_user_ids ON alerts USING gin (for_user_ids)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_alerts_for_user_ids")
+    op.execute("DROP INDEX IF EXISTS idx_alerts_for_roles")
+    op.execute("DROP INDEX IF EXISTS idx_alerts_active_created")
@@ -0,0 +1,39 @@
+"""alerts list filter indexes
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-16 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_alerts_status_created "
+        "ON alerts (tenant_id, status, created_at DESC)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_alerts_priority_status "
+        "ON alerts (tenant_id, priority, status)"
+    )
+    # Both were left prefixes of the indexes above
+    op.execute("DROP INDEX IF EXISTS idx_alerts_status")
+    op.execute("DROP INDEX IF EXISTS idx_alerts_priority")
+
+
+def downgrade() -> None:
+    op.execute("CREATE INDEX IF NOT EXISTS idx_alerts_priority ON alerts (tenant_id, priority)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_alerts_status ON alerts (tenant_id, status)")
+    op.execute("DROP INDEX IF EXISTS idx_alerts_priority_status")
+    op.execute("DROP INDEX IF EXISTS idx_alerts_status_created")
@@ -0,0 +1,105 @@
+"""tenant_alert_stats counters maintained by a trigger on alerts
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-16 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS tenant_alert_stats (
+            tenant_id UUID PRIMARY KEY REFERENCES tenants(id) ON DELETE CASCADE,
+            unread INTEGER NOT NULL DEFAULT 0,
+            critical_open INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION apply_alert_stats()
+        RETURNS TRIGGER AS $$
+        DECLARE
+            tenant UUID;
+            unread_delta INTEGER := 0;
+            critical_delta INTEGER := 0;
+        BEGIN
+            IF TG_OP <> 'DELETE' THEN
+                tenant := NEW.tenant_id;
+                IF NEW.status = 'unread' THEN
+                    unread_delta := unread_delta + 1;
+                END IF;
+                IF NEW.priority = 'critical' AND NEW.status IN ('unread', 'read') THEN
+                    critical_delta := critical_delta + 1;
+                END IF;
+            END IF;
+            IF TG_OP <> 'INSERT' THEN
+                tenant := OLD.tenant_id;
+                IF OLD.status = 'unread' THEN
+                    unread_delta := unread_delta - 1;
+                END IF;
+                IF OLD.priority = 'critical' AND OLD.status IN ('unread', 'read') THEN
+                    critical_delta := critical_delta - 1;
+                END IF;
+            END IF;
+
+            IF unread_delta = 0 AND critical_delta = 0 THEN
+                RETURN NULL;
+            END IF;
+            IF TG_OP = 'DELETE' THEN
+                -- No upsert: during a tenant cascade delete the tenant row is gone
+                UPDATE tenant_alert_stats
+                SET unread = unread + unread_delta,
+                    critical_open = critical_open + critical_delta
+                WHERE tenant_id = tenant;
+            ELSE
+                INSERT INTO tenant_alert_stats AS s (tenant_id, unread, critical_open)
+                VALUES (tenant, unread_delta, critical_delta)
+                ON CONFLICT (tenant_id) DO UPDATE
+                SET unread = s.unread + EXCLUDED.unread,
+                    critical_open = s.critical_open + EXCLUDED.critical_open;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("DROP TRIGGER IF EXISTS alerts_stats ON alerts")
+    op.execute(
+        "CREATE TRIGGER alerts_stats AFTER INSERT OR DELETE ON alerts "
+        "FOR EACH ROW EXECUTE FUNCTION apply_alert_stats()"
+    )
+    op.execute("DROP TRIGGER IF EXISTS alerts_stats_update ON alerts")
+    op.execute(
+        "CREATE TRIGGER alerts_stats_update AFTER UPDATE OF status, priority ON alerts "
+        "FOR EACH ROW WHEN (OLD.status IS DISTINCT FROM NEW.status "
+        "OR OLD.priority IS DISTINCT FROM NEW.priority) "
+        "EXECUTE FUNCTION apply_alert_stats()"
+    )
+    # Backfill from the existing alerts
+    op.execute("""
+        INSERT INTO tenant_alert_stats (tenant_id, unread, critical_open)
+        SELECT tenant_id,
+               count(*) FILTER (WHERE status = 'unread'),
+               count(*) FILTER (WHERE priority = 'critical' AND status IN ('unread', 'read'))
+        FROM alerts
+        GROUP BY tenant_id
+        ON CONFLICT (tenant_id) DO UPDATE
+        SET unread = EXCLUDED.unread, critical_open = EXCLUDED.critical_open
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS alerts_stats_update ON alerts")
+    op.execute("DROP TRIGGER IF EXISTS alerts_stats ON alerts")
+    op.execute("DROP FUNCTION IF EXISTS apply_alert_stats()")
+    op.execute("DROP TABLE IF EXISTS tenant_alert_stats")
@@ -0,0 +1,32 @@
+"""password reset token lookup index
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-16 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_reset_tokens_email_pending "
+        "ON password_reset_tokens (email, is_used, created_at DESC)"
+    )
+    # Left prefix of the index above
+    op.execute("DROP INDEX IF EXISTS idx_reset_tokens_email")
+
+
+def downgrade() -> None:
+    op.execute("CREATE INDEX IF NOT EXISTS idx_reset_tokens_email ON password_reset_tokens (email)")
+    op.execute("DROP INDEX IF EXISTS idx_reset_tokens_email_pending")
@@ -0,0 +1,37 @@
+"""beds active board and status indexes
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-16 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_beds_active_number "
+        "ON beds (tenant_id, is_active, bed_number)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_beds_status_active "
+        "ON beds (tenant_id, status, is_active)"
+    )
+    # Left prefix of idx_beds_status_active
+    op.execute("DROP INDEX IF EXISTS idx_beds_status")
+
+
+def downgrade() -> None:
+    op.execute("CREATE INDEX IF NOT EXISTS idx_beds_status ON beds (tenant_id, status)")
+    op.execute("DROP INDEX IF EXISTS idx_beds_status_active")
+    op.execute("DROP INDEX IF EXISTS idx_beds_active_number")
@@ -0,0 +1,38 @@
+"""latest vitals and triage result per patient indexes
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-16 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0010"
+down_revision: Union[str, None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_vitals_recorded "
+        "ON patient_vitals (patient_id, recorded_at DESC)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_triage_patient_applied "
+        "ON ai_triage_results (patient_id, applied_at DESC NULLS LAST)"
+    )
+    # Left prefixes of the two indexes above
+    op.execute("DROP INDEX IF EXISTS idx_vitals_patient")
+    op.execute("DROP INDEX IF EXISTS idx_triage_patient")
+
+
+def downgrade() -> None:
+    op.execute("CREATE INDEX IF NOT EXISTS idx_triage_patient ON ai_triage_results (patient_id)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_vitals_patient ON patient_vitals (patient_id)")
+    op.execute("DROP INDEX IF EXISTS idx_triage_patient_applied")
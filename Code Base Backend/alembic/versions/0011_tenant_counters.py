@@ -0,0 +1,46 @@
+"""tenant_counters for race-free patient numbers
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-16 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0011"
+down_revision: Union[str, None] = "0010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS tenant_counters (
+            tenant_id UUID PRIMARY KEY REFERENCES tenants(id) ON DELETE CASCADE,
+            last_patient_number INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    # Continue after both the old count-based numbering and the highest
+    # P-number already issued, whichever is further along
+    op.execute("""
+        INSERT INTO tenant_counters (tenant_id, last_patient_number)
+        SELECT tenant_id,
+               GREATEST(
+                   count(*),
+                   COALESCE(max(substring(patient_id FROM 2)::int)
+                            FILTER (WHERE patient_id ~ '^P[0-9]{1,9}$'), 0)
+               )
+        FROM patients
+        GROUP BY tenant_id
+        ON CONFLICT (tenant_id) DO UPDATE
+        SET last_patient_number = EXCLUDED.last_patient_number
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS tenant_counters")
@@ -0,0 +1,32 @@
+"""patients list status + admission order index
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-16 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0012"
+down_revision: Union[str, None] = "0011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_patients_status_admitted "
+        "ON patients (tenant_id, status, admitted_at DESC)"
+    )
+    # Left prefix of idx_patients_status_admitted
+    op.execute("DROP INDEX IF EXISTS idx_patients_status")
+
+
+def downgrade() -> None:
+    op.execute("CREATE INDEX IF NOT EXISTS idx_patients_status ON patients (tenant_id, status)")
+    op.execute("DROP INDEX IF EXISTS idx_patients_status_admitted")
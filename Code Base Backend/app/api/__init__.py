@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from .routes import auth, users, patients, vitals, triage, notes, prescriptions, beds, alerts, police_cases, dashboard, admin, departments, platform, billing
+from .routes import auth, users, patients, vitals, triage, notes, prescriptions, beds, alerts, police_cases, dashboard, admin, departments, platform, billing, uploads
 
 api_router = APIRouter()
 
@@ -19,5 +19,6 @@ api_router.include_router(admin.router, prefix="/admin", tags=["Admin"])
 api_router.include_router(departments.router, prefix="/departments", tags=["Departments"])
 api_router.include_router(platform.router, prefix="/platform", tags=["Platform"])
 api_router.include_router(billing.router, prefix="/billing", tags=["Billing"])
+api_router.include_router(uploads.router, prefix="/uploads", tags=["Uploads"])
 
 __all__ = ["api_router"]
@@ -1,10 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, func, insert, update, exists, literal
 from uuid import UUID
 import uuid as uuid_mod
 import random
+import secrets
+import orjson
 from datetime import datetime, date, timedelta
 from typing import Optional
 
@@ -20,13 +22,24 @@ from app.schemas.user import UserCreate, UserUpdate, UserResponse
 from app.schemas.bed_pricing import BedPricingCreate, BedPricingUpdate
 from app.schemas.common import SuccessResponse
 from app.core.dependencies import require_admin
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash_async
+from app.core.cache import (
+    cache_get, cache_set, cache_get_raw, cache_set_raw, cache_key, cache_invalidate,
+    cache_smembers, cache_sadd, tenant_prefix,
+)
 from app.services.plan_limits import check_user_limit, check_bed_limit
 from app.services.usage_tracker import get_current_usage
 from app.services.audit import log_action
 
 router = APIRouter()
 
+# Staff data only changes through the mutations below, which invalidate it
+STAFF_LIST_CACHE_TTL = 20
+STAFF_COUNTS_CACHE_TTL = 60
+# Departments and beds are never deleted, so "these codes exist" / "these
+# departments have beds" only ever grow and stay true once recorded
+SETUP_CACHE_TTL = 24 * 60 * 60
+
 
 @router.get("/staff", response_model=dict)
 async def get_all_staff(
@@ -37,9 +50,39 @@ async def get_all_staff(
     current_user: User = Depends(require_admin),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get all staff members."""
-    query = select(User).options(
-        selectinload(User.department)
+    """Get all staff members.
+
+    When Redis is configured the encoded response is cached per filter set
+    and served back as-is, and the tenant-wide role counts are cached on
+    their own so searches with different parameters still share them. Staff
+    mutations invalidate both.
+    """
+    prefix = tenant_prefix("staff", current_user.tenant_id)
+    list_key = cache_key(
+        f"{prefix}list",
+        role=role, department=department, status=status_filter, search=search,
+    )
+    counts_key = f"{prefix}counts"
+
+    cached = await cache_get_raw(list_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    # Project only the response columns: no ORM identity-map work and the
+    # department name comes from the same statement instead of a selectin.
+    query = select(
+        User.id.label("id"),
+        User.name.label("name"),
+        User.email.label("email"),
+        User.role.label("role"),
+        Department.name.label("department"),
+        User.phone.label("phone"),
+        User.avatar_url.label("avatar"),
+        User.status.label("status"),
+        User.joined_at.label("joinedAt"),
+        User.last_active_at.label("lastActive"),
+    ).outerjoin(
+        Department, User.department_id == Department.id
     ).where(
         User.tenant_id == current_user.tenant_id,
         User.deleted_at.is_(None)
@@ -49,71 +92,52 @@ async def get_all_staff(
         query = query.where(User.role == role)
 
     if department:
-        query = query.join(Department).where(Department.name == department)
+        query = query.where(Department.name == department)
 
     if status_filter and status_filter != "all":
         query = query.where(User.status == status_filter)
 
     if search:
+        term = search.lower()
+        # Terms of 3+ characters are served by the users_name_email_trgm GIN
+        # index (pg_trgm); shorter ones have no trigrams, so Postgres scans
+        # the tenant's staff rows instead
         query = query.where(
-            User.name.ilike(f"%{search}%") | User.email.ilike(f"%{search}%")
+            func.lower(User.name).like(f"%{term}%")
+            | func.lower(User.email).like(f"%{term}%")
         )
 
     query = query.order_by(User.name)
 
     result = await db.execute(query)
-    staff = result.scalars().all()
-
-    # Get counts
-    doctors_count = await db.execute(
-        select(func.count(User.id)).where(
-            User.tenant_id == current_user.tenant_id,
-            User.role == "doctor",
-            User.deleted_at.is_(None)
+    staff_data = [dict(row) for row in result.mappings()]
+
+    role_counts = await cache_get(counts_key)
+    if role_counts is None:
+        # Get per-role counts in a single grouped query
+        counts_result = await db.execute(
+            select(User.role, func.count(User.id)).where(
+                User.tenant_id == current_user.tenant_id,
+                User.deleted_at.is_(None)
+            ).group_by(User.role)
         )
-    )
-    nurses_count = await db.execute(
-        select(func.count(User.id)).where(
-            User.tenant_id == current_user.tenant_id,
-            User.role == "nurse",
-            User.deleted_at.is_(None)
-        )
-    )
-    admins_count = await db.execute(
-        select(func.count(User.id)).where(
-            User.tenant_id == current_user.tenant_id,
-            User.role == "admin",
-            User.deleted_at.is_(None)
-        )
-    )
+        role_counts = dict(counts_result.all())
+        await cache_set(counts_key, role_counts, STAFF_COUNTS_CACHE_TTL)
 
-    staff_data = []
-    for s in staff:
-        staff_data.append({
-            "id": str(s.id),
-            "name": s.name,
-            "email": s.email,
-            "role": s.role,
-            "department": s.department.name if s.department else None,
-            "phone": s.phone,
-            "avatar": s.avatar_url,
-            "status": s.status,
-            "joinedAt": s.joined_at.isoformat() if s.joined_at else None,
-            "lastActive": s.last_active_at
-        })
-
-    return {
+    payload = orjson.dumps({
         "success": True,
         "data": {
             "staff": staff_data,
             "counts": {
                 "total": len(staff_data),
-                "doctors": doctors_count.scalar() or 0,
-                "nurses": nurses_count.scalar() or 0,
-                "admins": admins_count.scalar() or 0
+                "doctors": role_counts.get("doctor", 0),
+                "nurses": role_counts.get("nurse", 0),
+                "admins": role_counts.get("admin", 0)
             }
         }
-    }
+    })
+    await cache_set_raw(list_key, payload, STAFF_LIST_CACHE_TTL)
+    return Response(content=payload, media_type="application/json")
 
 
 @router.post("/staff", response_model=dict, status_code=status.HTTP_201_CREATED)
@@ -131,70 +155,89 @@ async def create_staff(
             detail=f"User limit reached ({limit['current']}/{limit['max']}). Contact platform admin to upgrade your plan."
         )
 
-    # Check if email already exists
-    existing = await db.execute(
-        select(User).where(
-            User.tenant_id == current_user.tenant_id,
-            User.email == request.email
+    user_values = {
+        "id": uuid_mod.uuid4(),
+        "tenant_id": current_user.tenant_id,
+        "name": request.name,
+        "email": request.email,
+        "password_hash": await get_password_hash_async(request.password),
+        "role": request.role,
+        "department_id": request.department_id,
+        "phone": request.phone,
+        "specialization": request.specialization,
+        "avatar_url": request.avatar_url,
+        "status": "active",
+        "joined_at": datetime.utcnow().date(),
+    }
+    user_columns = User.__table__.c
+
+    # One statement: insert the user unless the email is already registered
+    # for this tenant, then its default settings row (column defaults are
+    # filled in by from_select), returning the department name for the
+    # response instead of re-fetching the user.
+    new_user = (
+        insert(User)
+        .from_select(
+            list(user_values),
+            select(
+                *(literal(value, user_columns[name].type) for name, value in user_values.items())
+            ).where(
+                ~exists().where(
+                    User.tenant_id == current_user.tenant_id,
+                    User.email == request.email
+                )
+            )
+        )
+        .returning(User.id)
+        .cte("new_user")
+    )
+    result = await db.execute(
+        insert(UserSettings)
+        .from_select(
+            ["id", "user_id"],
+            select(literal(uuid_mod.uuid4(), UserSettings.__table__.c.id.type), new_user.c.id)
         )
+        .returning(
+            select(Department.name)
+            .where(Department.id == request.department_id)
+            .scalar_subquery()
+            .label("department")
+        )
+        .add_cte(new_user, nest_here=True)
     )
-    if existing.scalar_one_or_none():
+    created = result.first()
+
+    if created is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
 
-    # Create user
-    user = User(
-        tenant_id=current_user.tenant_id,
-        name=request.name,
-        email=request.email,
-        password_hash=get_password_hash(request.password),
-        role=request.role,
-        department_id=request.department_id,
-        phone=request.phone,
-        specialization=request.specialization,
-        avatar_url=request.avatar_url,
-        status="active",
-        joined_at=datetime.utcnow().date()
-    )
-    db.add(user)
-    await db.flush()
-
-    # Create default settings
-    settings = UserSettings(user_id=user.id)
-    db.add(settings)
-
     await log_action(
         db, current_user,
         action="create",
         entity_type="user",
-        entity_id=user.id,
-        new_values={"name": user.name, "email": user.email, "role": user.role},
+        entity_id=user_values["id"],
+        new_values={"name": request.name, "email": request.email, "role": request.role},
     )
 
     await db.commit()
-
-    # Re-fetch with department eagerly loaded
-    result = await db.execute(
-        select(User).options(selectinload(User.department)).where(User.id == user.id)
-    )
-    user = result.scalar_one()
+    await cache_invalidate(tenant_prefix("staff", current_user.tenant_id))
 
     # TODO: Send welcome email with temporary password via SQS
 
     return {
         "success": True,
         "data": {
-            "id": str(user.id),
-            "name": user.name,
-            "email": user.email,
-            "role": user.role,
-            "department": user.department.name if user.department else None,
-            "avatar": user.avatar_url,
-            "phone": user.phone,
-            "status": user.status,
-            "joinedAt": user.joined_at.isoformat() if user.joined_at else None
+            "id": user_values["id"],
+            "name": request.name,
+            "email": request.email,
+            "role": request.role,
+            "department": created.department,
+            "avatar": request.avatar_url,
+            "phone": request.phone,
+            "status": user_values["status"],
+            "joinedAt": user_values["joined_at"]
         },
         "message": "Staff member created successfully."
     }
@@ -208,14 +251,36 @@ async def update_staff(
     db: AsyncSession = Depends(get_db)
 ):
     """Update staff member."""
+    # Update only explicitly allowed fields to prevent privilege escalation
+    UPDATABLE_STAFF_FIELDS = {"name", "phone", "department_id", "specialization", "status", "avatar_url"}
+    update_data = request.model_dump(exclude_unset=True)
+    values = {k: v for k, v in update_data.items() if k in UPDATABLE_STAFF_FIELDS}
+    applied = {k: str(v) if v is not None else None for k, v in values.items()}
+
+    # One UPDATE ... RETURNING instead of load, mutate, commit and re-fetch.
+    # updated_at is always set so an empty patch is still a valid statement.
     result = await db.execute(
-        select(User).options(selectinload(User.department)).where(
+        update(User)
+        .where(
             User.id == staff_id,
             User.tenant_id == current_user.tenant_id,
             User.deleted_at.is_(None)
         )
+        .values(**values, updated_at=func.now())
+        .returning(
+            User.id,
+            User.name,
+            User.email,
+            User.role,
+            User.status,
+            select(Department.name)
+            .where(Department.id == User.department_id)
+            .scalar_subquery()
+            .label("department"),
+        )
+        .execution_options(synchronize_session=False)
     )
-    user = result.scalar_one_or_none()
+    user = result.first()
 
     if not user:
         raise HTTPException(
@@ -223,15 +288,6 @@ async def update_staff(
             detail="Staff member not found"
         )
 
-    # Update only explicitly allowed fields to prevent privilege escalation
-    UPDATABLE_STAFF_FIELDS = {"name", "phone", "department_id", "specialization", "status", "avatar_url"}
-    update_data = request.model_dump(exclude_unset=True)
-    applied = {}
-    for field, value in update_data.items():
-        if field in UPDATABLE_STAFF_FIELDS:
-            setattr(user, field, value)
-            applied[field] = str(value) if value is not None else None
-
     await log_action(
         db, current_user,
         action="update",
@@ -241,21 +297,16 @@ async def update_staff(
     )
 
     await db.commit()
-
-    # Re-fetch with department eagerly loaded
-    result = await db.execute(
-        select(User).options(selectinload(User.department)).where(User.id == user.id)
-    )
-    user = result.scalar_one()
+    await cache_invalidate(tenant_prefix("staff", current_user.tenant_id))
 
     return {
         "success": True,
         "data": {
-            "id": str(user.id),
+            "id": user.id,
             "name": user.name,
             "email": user.email,
             "role": user.role,
-            "department": user.department.name if user.department else None,
+            "department": user.department,
             "status": user.status
         }
     }
@@ -268,14 +319,26 @@ async def delete_staff(
     db: AsyncSession = Depends(get_db)
 ):
     """Delete/deactivate staff member."""
+    # Don't allow deleting yourself
+    if staff_id == current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot delete your own account"
+        )
+
+    # Soft delete
     result = await db.execute(
-        select(User).where(
+        update(User)
+        .where(
             User.id == staff_id,
             User.tenant_id == current_user.tenant_id,
             User.deleted_at.is_(None)
         )
+        .values(status="inactive", deleted_at=func.now())
+        .returning(User.id, User.name, User.email, User.role)
+        .execution_options(synchronize_session=False)
     )
-    user = result.scalar_one_or_none()
+    user = result.first()
 
     if not user:
         raise HTTPException(
@@ -283,17 +346,6 @@ async def delete_staff(
             detail="Staff member not found"
         )
 
-    # Don't allow deleting yourself
-    if user.id == current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Cannot delete your own account"
-        )
-
-    # Soft delete
-    user.status = "inactive"
-    user.deleted_at = datetime.utcnow()
-
     await log_action(
         db, current_user,
         action="delete",
@@ -303,6 +355,7 @@ async def delete_staff(
     )
 
     await db.commit()
+    await cache_invalidate(tenant_prefix("staff", current_user.tenant_id))
 
     return {"success": True, "message": "Staff member deactivated"}
 
@@ -330,9 +383,8 @@ async def reset_staff_password(
         )
 
     # Generate temporary password
-    import secrets
     temp_password = secrets.token_urlsafe(12)
-    user.password_hash = get_password_hash(temp_password)
+    user.password_hash = await get_password_hash_async(temp_password)
 
     await log_action(
         db, current_user,
@@ -358,41 +410,52 @@ async def get_audit_logs(
     db: AsyncSession = Depends(get_db)
 ):
     """Get system audit logs for the current tenant."""
-    query = (
-        select(AuditLog, User.name.label("user_name"), User.role.label("user_role"))
-        .outerjoin(User, AuditLog.user_id == User.id)
-        .where(AuditLog.tenant_id == current_user.tenant_id)
-    )
-
+    filters = [AuditLog.tenant_id == current_user.tenant_id]
     if action:
-        query = query.where(AuditLog.action.ilike(f"%{action}%"))
+        filters.append(AuditLog.action.ilike(f"%{action}%"))
     if entity_type:
-        query = query.where(AuditLog.entity_type == entity_type)
+        filters.append(AuditLog.entity_type == entity_type)
 
-    total_result = await db.execute(
-        select(func.count()).select_from(
-            select(AuditLog).where(AuditLog.tenant_id == current_user.tenant_id).subquery()
+    # The total is computed by a window function on the page query itself, so
+    # the page and its total come back in a single round-trip.
+    query = (
+        select(
+            AuditLog,
+            User.name.label("user_name"),
+            User.role.label("user_role"),
+            func.count().over().label("total"),
         )
+        .outerjoin(User, AuditLog.user_id == User.id)
+        .where(*filters)
+        .order_by(AuditLog.created_at.desc())
+        .limit(limit)
+        .offset(offset)
     )
-    total = total_result.scalar() or 0
-
-    query = query.order_by(AuditLog.created_at.desc()).limit(limit).offset(offset)
     result = await db.execute(query)
     rows = result.all()
 
-    logs = []
-    for row in rows:
-        log = row[0]
-        logs.append({
-            "id": str(log.id),
+    if rows:
+        total = rows[0].total
+    elif offset:
+        # Paged past the end: no rows carry the window total, count separately
+        total_result = await db.execute(select(func.count(AuditLog.id)).where(*filters))
+        total = total_result.scalar() or 0
+    else:
+        total = 0
+
+    logs = [
+        {
+            "id": log.id,
             "action": log.action,
             "entityType": log.entity_type,
-            "entityId": str(log.entity_id) if log.entity_id else None,
-            "userName": row[1] or "System",
-            "userRole": row[2] or "system",
+            "entityId": log.entity_id,
+            "userName": user_name or "System",
+            "userRole": user_role or "system",
             "ipAddress": str(log.ip_address) if log.ip_address else None,
             "createdAt": log.created_at,
-        })
+        }
+        for log, user_name, user_role, _total in rows
+    ]
 
     return {
         "success": True,
@@ -423,30 +486,41 @@ async def initialize_departments(
         {"name": "Cardiology", "code": "CARD", "floor": "5th Floor", "capacity": 20},
     ]
 
-    # Get existing department codes for this tenant
-    result = await db.execute(
-        select(Department.code).where(Department.tenant_id == current_user.tenant_id)
-    )
-    existing_codes = {row[0] for row in result.all()}
-
-    created = 0
-    for dept_data in DEPARTMENTS:
-        if dept_data["code"] in existing_codes:
-            continue
-        dept = Department(
-            id=uuid_mod.uuid4(),
-            tenant_id=current_user.tenant_id,
-            name=dept_data["name"],
-            code=dept_data["code"],
-            description=f"{dept_data['name']} - Providing specialized care",
-            floor=dept_data["floor"],
-            capacity=dept_data["capacity"],
-            is_active=True
+    # Only a completed run fills this set, so a hit already covers every
+    # standard code and the DB lookup can be skipped
+    codes_key = f"{tenant_prefix('departments', current_user.tenant_id)}codes"
+    existing_codes = await cache_smembers(codes_key)
+    if not existing_codes:
+        result = await db.execute(
+            select(Department.code).where(Department.tenant_id == current_user.tenant_id)
         )
-        db.add(dept)
-        created += 1
+        existing_codes = {row[0] for row in result.all()}
+
+    new_rows = [
+        {
+            "id": uuid_mod.uuid4(),
+            "tenant_id": current_user.tenant_id,
+            "name": dept_data["name"],
+            "code": dept_data["code"],
+            "description": f"{dept_data['name']} - Providing specialized care",
+            "floor": dept_data["floor"],
+            "capacity": dept_data["capacity"],
+            "is_active": True,
+        }
+        for dept_data in DEPARTMENTS
+        if dept_data["code"] not in existing_codes
+    ]
+    created = len(new_rows)
 
+    # One multi-row INSERT instead of a flush per ORM object
+    if new_rows:
+        await db.execute(insert(Department), new_rows)
     await db.commit()
+    await cache_sadd(
+        codes_key, *existing_codes, *(row["code"] for row in new_rows), ttl=SETUP_CACHE_TTL
+    )
+    if new_rows:
+        await cache_invalidate(f"{tenant_prefix('departments', current_user.tenant_id)}list")
 
     return {
         "success": True,
@@ -492,37 +566,47 @@ async def initialize_beds(
     if not departments:
         raise HTTPException(status_code=400, detail="No departments found. Create departments first.")
 
-    created = 0
+    beds_key = f"{tenant_prefix('beds', current_user.tenant_id)}departments"
+    departments_with_beds = await cache_smembers(beds_key)
+    if not all(str(dept.id) in departments_with_beds for dept in departments):
+        # One grouped query for every department that already has beds
+        result = await db.execute(
+            select(Bed.department_id)
+            .where(Bed.tenant_id == current_user.tenant_id)
+            .group_by(Bed.department_id)
+        )
+        departments_with_beds = {str(row[0]) for row in result.all()}
+
+    bed_rows: list[dict] = []
     skipped = 0
     for dept in departments:
-        # Check if department already has beds
-        bed_count = await db.execute(
-            select(func.count(Bed.id)).where(
-                Bed.department_id == dept.id,
-                Bed.tenant_id == current_user.tenant_id
-            )
-        )
-        if bed_count.scalar() > 0:
+        if str(dept.id) in departments_with_beds:
             skipped += 1
             continue
 
         config = BED_CONFIGS.get(dept.code, DEFAULT_CONFIG)
-        for i in range(config["count"]):
-            bed = Bed(
-                id=uuid_mod.uuid4(),
-                tenant_id=current_user.tenant_id,
-                bed_number=f"{dept.code}-{i+1:03d}",
-                department_id=dept.id,
-                bed_type=config["types"][i % len(config["types"])],
-                floor=dept.floor,
-                wing="A" if i < config["count"] // 2 else "B",
-                status="available",
-                is_active=True
-            )
-            db.add(bed)
-            created += 1
+        bed_rows.extend(
+            {
+                "id": uuid_mod.uuid4(),
+                "tenant_id": current_user.tenant_id,
+                "bed_number": f"{dept.code}-{i+1:03d}",
+                "department_id": dept.id,
+                "bed_type": config["types"][i % len(config["types"])],
+                "floor": dept.floor,
+                "wing": "A" if i < config["count"] // 2 else "B",
+                "status": "available",
+                "is_active": True,
+            }
+            for i in range(config["count"])
+        )
 
+    # Insert every new bed in one multi-row statement
+    created = len(bed_rows)
+    if bed_rows:
+        await db.execute(insert(Bed), bed_rows)
     await db.commit()
+    # Every department now has beds
+    await cache_sadd(beds_key, *(dept.id for dept in departments), ttl=SETUP_CACHE_TTL)
 
     return {
         "success": True,
@@ -936,6 +1020,7 @@ async def split_emergency_department(
             moved_patients += 1
 
     await db.commit()
+    await cache_invalidate(f"{tenant_prefix('departments', current_user.tenant_id)}list")
 
     return {
         "success": True,
@@ -980,22 +1065,19 @@ async def get_bed_pricing(
 
     # If the tenant has zero rows, seed defaults (idempotent: only triggers when empty)
     if not pricing:
-        for bed_type, cost in DEFAULT_BED_PRICING_INR.items():
-            db.add(BedTypePricing(
+        pricing = [
+            BedTypePricing(
                 tenant_id=current_user.tenant_id,
                 bed_type=bed_type,
                 cost_per_day=cost,
                 currency="INR",
                 is_active=True,
-            ))
+            )
+            for bed_type, cost in DEFAULT_BED_PRICING_INR.items()
+        ]
+        db.add_all(pricing)
+        # The seeded objects carry everything the response needs; no re-read
         await db.commit()
-        # Re-read after seeding
-        result = await db.execute(
-            select(BedTypePricing).where(
-                BedTypePricing.tenant_id == current_user.tenant_id
-            ).order_by(BedTypePricing.bed_type)
-        )
-        pricing = result.scalars().all()
 
     # Build a map of configured types
     configured = {p.bed_type: p for p in pricing}
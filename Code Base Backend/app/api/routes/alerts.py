@@ -1,17 +1,22 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, func, or_, true, insert, update, case, literal, bindparam, Integer, exists
+from sqlalchemy.orm import selectinload, joinedload, raiseload
 from uuid import UUID
 from datetime import datetime
 from typing import Optional, List
+from collections import defaultdict
+from functools import lru_cache
 import logging
+import uuid
+import orjson
 
 logger = logging.getLogger(__name__)
 
 from app.db.database import get_db
 from app.models.user import User
-from app.models.alert import Alert, AlertHistory
+from app.models.alert import Alert, AlertHistory, TenantAlertStats
 from app.models.patient import Patient, PatientVitals
 from app.models.department import Department
 from app.models.triage import AITriageResult
@@ -22,77 +27,195 @@ from app.schemas.alert import (
 )
 from app.schemas.common import SuccessResponse
 from app.core.dependencies import get_current_user
+from app.core.cache import cache_get, cache_set
+from app.services.alert_counts import (
+    ALERT_COUNTS_CACHE_TTL, alert_counts_key, invalidate_alert_counts,
+)
 
 router = APIRouter()
 
 
+def _alert_patient(patient: Optional[Patient], with_bed: bool = False) -> Optional[dict]:
+    """Patient summary embedded in an alert list entry."""
+    if patient is None:
+        return None
+    data = {
+        "id": patient.id,
+        "patientId": patient.patient_id,
+        "name": patient.name,
+        "uhi": patient.uhi,
+        "euhi": patient.euhi,
+        "department": patient.department.name if patient.department else None,
+    }
+    if with_bed:
+        data["bed"] = patient.bed.bed_number if patient.bed else None
+    return data
+
+
+def _patient_detail(patient: Patient) -> str:
+    """Message prefix naming a patient in seeded alerts, e.g. "Asha [ED] (B-4) UHI: 12."."""
+    ids = []
+    if patient.uhi:
+        ids.append(f"UHI: {patient.uhi}")
+    if patient.euhi:
+        ids.append(f"EUHI: {patient.euhi}")
+    tail = f" {' | '.join(ids)}." if ids else "."
+    return (
+        f"{patient.name} [{patient.department.name if patient.department else 'Unassigned'}]"
+        f" ({patient.bed.bed_number if patient.bed else 'No Bed'}){tail}"
+    )
+
+
+# Hot read statements in the route modules are built once (at import, or per
+# combination of optional filters through lru_cache) and executed with bound
+# parameters, so a request neither rebuilds the statement nor recomputes its
+# compiled-cache key. The ones below take tenant_id, and for the recipient
+# filter roles=[role] and user_ids=[user id].
+
+def _visible_to_user():
+    """Alerts addressed to the user's role, to the user, or to everyone."""
+    return or_(
+        Alert.for_roles.contains(bindparam("roles", type_=Alert.for_roles.type)),
+        Alert.for_user_ids.contains(bindparam("user_ids", type_=Alert.for_user_ids.type)),
+        Alert.for_roles.is_(None)
+    )
+
+
+_ACTIVE_ALERTS_STMT = (
+    select(Alert)
+    .options(
+        # Same as the mapper defaults; spelled out because the raiseload
+        # wildcard would otherwise override them
+        joinedload(Alert.patient).joinedload(Patient.department),
+        raiseload("*"),
+    )
+    .where(
+        Alert.tenant_id == bindparam("tenant_id"),
+        Alert.status.in_(["unread", "read"]),
+        _visible_to_user()
+    )
+    .order_by(Alert.created_at.desc())
+    .limit(10)
+)
+
+_ACTIVE_UNREAD_COUNT_STMT = select(func.count()).select_from(Alert).where(
+    Alert.tenant_id == bindparam("tenant_id"),
+    Alert.status == "unread",
+    _visible_to_user()
+)
+
+_ALERT_DETAIL_STMT = (
+    select(Alert)
+    .options(joinedload(Alert.patient).joinedload(Patient.bed))
+    .where(Alert.id == bindparam("alert_id"), Alert.tenant_id == bindparam("tenant_id"))
+)
+
+_ALERT_HISTORY_STMT = (
+    select(AlertHistory)
+    .where(AlertHistory.alert_id == bindparam("alert_id"))
+    .order_by(AlertHistory.performed_at.desc())
+)
+
+
+@lru_cache(maxsize=None)
+def _alert_list_statements(by_priority: bool, by_status: bool, by_category: bool):
+    """Statements for the alerts list, one set per combination of optional filters.
+
+    Returns (page, counts, page_with_counts). The optional filters take the
+    priority/status/category parameters, the page offset/limit.
+    """
+    filters = [_visible_to_user()]
+    if by_priority:
+        filters.append(Alert.priority == bindparam("priority"))
+    if by_status:
+        filters.append(Alert.status == bindparam("status"))
+    if by_category:
+        filters.append(Alert.category == bindparam("category"))
+
+    page = (
+        select(Alert)
+        .options(
+            joinedload(Alert.patient).joinedload(Patient.bed),
+            joinedload(Alert.patient).joinedload(Patient.department),
+            raiseload("*"),
+        )
+        .where(Alert.tenant_id == bindparam("tenant_id"), *filters)
+        .order_by(Alert.created_at.desc())
+        .offset(bindparam("offset", type_=Integer))
+        .limit(bindparam("limit", type_=Integer))
+    )
+
+    # Filtered total over the matching index range; the tenant-wide unread
+    # and open-critical counts are primary-key lookups of the trigger-kept
+    # tenant_alert_stats row (absent until the tenant's first open alert)
+    def tenant_stat(column):
+        return func.coalesce(
+            select(column)
+            .where(TenantAlertStats.tenant_id == bindparam("tenant_id"))
+            .scalar_subquery(),
+            0,
+        )
+
+    counts = select(
+        select(func.count(Alert.id))
+        .where(Alert.tenant_id == bindparam("tenant_id"), *filters)
+        .scalar_subquery()
+        .label("total"),
+        tenant_stat(TenantAlertStats.unread).label("unread"),
+        tenant_stat(TenantAlertStats.critical_open).label("critical"),
+    )
+    counts_row = counts.subquery("alert_counts")
+
+    # The single counts row is cross-joined onto the page and the patient,
+    # bed and department are joined in, so the whole response is one query
+    page_with_counts = (
+        page.add_columns(counts_row.c.total, counts_row.c.unread, counts_row.c.critical)
+        .join(counts_row, true())
+    )
+    return page, counts, page_with_counts
+
+
 @router.get("/active", response_model=dict)
 async def get_active_alerts(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Get active (unread/unacknowledged) alerts for current user."""
-    result = await db.execute(
-        select(Alert).options(
-            selectinload(Alert.patient).selectinload(Patient.department)
-        ).where(
-            Alert.tenant_id == current_user.tenant_id,
-            Alert.status.in_(["unread", "read"]),
-            or_(
-                Alert.for_roles.contains([current_user.role]),
-                Alert.for_user_ids.contains([current_user.id]),
-                Alert.for_roles.is_(None)
-            )
-        ).order_by(Alert.created_at.desc()).limit(10)
-    )
+    params = {
+        "tenant_id": current_user.tenant_id,
+        "roles": [current_user.role],
+        "user_ids": [current_user.id],
+    }
+    result = await db.execute(_ACTIVE_ALERTS_STMT, params)
     alerts = result.scalars().all()
 
-    alerts_data = []
-    for alert in alerts:
-        patient_data = None
-        if alert.patient:
-            patient_data = {
-                "id": str(alert.patient.id),
-                "patientId": alert.patient.patient_id,
-                "name": alert.patient.name,
-                "uhi": alert.patient.uhi,
-                "euhi": alert.patient.euhi,
-                "department": alert.patient.department.name if alert.patient.department else None,
-            }
-
-        alerts_data.append({
-            "id": str(alert.id),
+    alerts_data = [
+        {
+            "id": alert.id,
             "title": alert.title,
             "message": alert.message,
             "priority": alert.priority,
             "status": alert.status,
             "category": alert.category,
             "triggeredBy": alert.triggered_by,
-            "patient": patient_data,
-            "createdAt": alert.created_at.isoformat() if alert.created_at else None
-        })
+            "patient": _alert_patient(alert.patient),
+            "createdAt": alert.created_at
+        }
+        for alert in alerts
+    ]
 
     # Count all unread (not just the 10 returned)
-    unread_count_result = await db.execute(
-        select(func.count()).select_from(Alert).where(
-            Alert.tenant_id == current_user.tenant_id,
-            Alert.status == "unread",
-            or_(
-                Alert.for_roles.contains([current_user.role]),
-                Alert.for_user_ids.contains([current_user.id]),
-                Alert.for_roles.is_(None)
-            )
-        )
-    )
+    unread_count_result = await db.execute(_ACTIVE_UNREAD_COUNT_STMT, params)
     unread_count = unread_count_result.scalar() or 0
 
-    return {
+    payload = orjson.dumps({
         "success": True,
         "data": {
             "alerts": alerts_data,
             "unreadCount": unread_count
         }
-    }
+    })
+    return Response(content=payload, media_type="application/json")
 
 
 @router.get("", response_model=dict)
@@ -100,81 +223,61 @@ async def get_alerts(
     priority: Optional[str] = Query("all"),
     status_filter: Optional[str] = Query("all", alias="status"),
     category: Optional[str] = None,
-    page: int = 1,
-    limit: int = 20,
+    page: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=200),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Get alerts for current user based on role."""
-    query = select(Alert).options(
-        selectinload(Alert.patient).selectinload(Patient.bed),
-        selectinload(Alert.patient).selectinload(Patient.department)
-    ).where(
-        Alert.tenant_id == current_user.tenant_id,
-        or_(
-            Alert.for_roles.contains([current_user.role]),
-            Alert.for_user_ids.contains([current_user.id]),
-            Alert.for_roles.is_(None)
-        )
+    by_priority = bool(priority and priority != "all")
+    by_status = bool(status_filter and status_filter != "all")
+    by_category = bool(category)
+    query, counts_query, query_with_counts = _alert_list_statements(
+        by_priority, by_status, by_category
     )
+    params = {
+        "tenant_id": current_user.tenant_id,
+        "roles": [current_user.role],
+        "user_ids": [current_user.id],
+        "priority": priority,
+        "status": status_filter,
+        "category": category,
+        "offset": (page - 1) * limit,
+        "limit": limit,
+    }
 
-    # Apply filters
-    if priority and priority != "all":
-        query = query.where(Alert.priority == priority)
-
-    if status_filter and status_filter != "all":
-        query = query.where(Alert.status == status_filter)
-
-    if category:
-        query = query.where(Alert.category == category)
-
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    count_result = await db.execute(count_query)
-    total = count_result.scalar() or 0
-
-    # Get counts by status
-    unread_result = await db.execute(
-        select(func.count(Alert.id)).where(
-            Alert.tenant_id == current_user.tenant_id,
-            Alert.status == "unread"
-        )
+    counts_key = alert_counts_key(
+        current_user.tenant_id,
+        role=current_user.role, user=current_user.id,
+        priority=priority, status=status_filter, category=category,
     )
-    unread_count = unread_result.scalar() or 0
-
-    critical_result = await db.execute(
-        select(func.count(Alert.id)).where(
-            Alert.tenant_id == current_user.tenant_id,
-            Alert.priority == "critical",
-            Alert.status.in_(["unread", "read"])
+    cached_counts = await cache_get(counts_key)
+
+    if cached_counts is not None:
+        result = await db.execute(query, params)
+        alerts = result.scalars().all()
+        total, unread_count, critical_count = cached_counts
+    else:
+        result = await db.execute(query_with_counts, params)
+        rows = result.all()
+        alerts = [row[0] for row in rows]
+
+        if rows:
+            _, total, unread_count, critical_count = rows[0]
+        else:
+            # Empty page: no row carries the counts, fetch them on their own
+            counts_result = await db.execute(counts_query, params)
+            total, unread_count, critical_count = counts_result.one()
+        await cache_set(
+            counts_key, [total, unread_count, critical_count], ALERT_COUNTS_CACHE_TTL
         )
-    )
-    critical_count = critical_result.scalar() or 0
-
-    # Apply pagination
-    offset = (page - 1) * limit
-    query = query.offset(offset).limit(limit).order_by(Alert.created_at.desc())
-
-    result = await db.execute(query)
-    alerts = result.scalars().all()
 
-    # Format response
-    alerts_data = []
-    for alert in alerts:
-        patient_data = None
-        if alert.patient:
-            patient_data = {
-                "id": str(alert.patient.id),
-                "patientId": alert.patient.patient_id,
-                "name": alert.patient.name,
-                "uhi": alert.patient.uhi,
-                "euhi": alert.patient.euhi,
-                "department": alert.patient.department.name if alert.patient.department else None,
-                "bed": alert.patient.bed.bed_number if alert.patient.bed else None
-            }
-
-        alerts_data.append({
-            "id": str(alert.id),
+    # Encoded straight to JSON bytes: orjson handles the UUIDs and datetimes,
+    # so neither the per-field isoformat/str calls nor FastAPI's response
+    # validation and jsonable_encoder pass over the page are needed
+    alerts_data = [
+        {
+            "id": alert.id,
             "title": alert.title,
             "message": alert.message,
             "priority": alert.priority,
@@ -182,14 +285,16 @@ async def get_alerts(
             "category": alert.category,
             "triggeredBy": alert.triggered_by,
             "forRoles": alert.for_roles,
-            "patient": patient_data,
-            "createdAt": alert.created_at.isoformat() if alert.created_at else None,
+            "patient": _alert_patient(alert.patient, with_bed=True),
+            "createdAt": alert.created_at,
             "readAt": alert.read_at,
             "acknowledgedAt": alert.acknowledged_at,
             "resolvedAt": alert.resolved_at
-        })
+        }
+        for alert in alerts
+    ]
 
-    return {
+    payload = orjson.dumps({
         "success": True,
         "data": {
             "alerts": alerts_data,
@@ -204,7 +309,8 @@ async def get_alerts(
                 "limit": limit
             }
         }
-    }
+    })
+    return Response(content=payload, media_type="application/json")
 
 
 @router.get("/{alert_id}", response_model=dict)
@@ -215,12 +321,7 @@ async def get_alert(
 ):
     """Get single alert details."""
     result = await db.execute(
-        select(Alert).options(
-            selectinload(Alert.patient).selectinload(Patient.bed)
-        ).where(
-            Alert.id == alert_id,
-            Alert.tenant_id == current_user.tenant_id
-        )
+        _ALERT_DETAIL_STMT, {"alert_id": alert_id, "tenant_id": current_user.tenant_id}
     )
     alert = result.scalar_one_or_none()
 
@@ -231,11 +332,7 @@ async def get_alert(
         )
 
     # Get history
-    history_result = await db.execute(
-        select(AlertHistory)
-        .where(AlertHistory.alert_id == alert_id)
-        .order_by(AlertHistory.performed_at.desc())
-    )
+    history_result = await db.execute(_ALERT_HISTORY_STMT, {"alert_id": alert_id})
     history = history_result.scalars().all()
 
     history_data = [
@@ -273,53 +370,81 @@ async def get_alert(
     }
 
 
-@router.put("/{alert_id}/read", response_model=dict)
-async def mark_alert_read(
+async def _transition_alert(
+    db: AsyncSession,
     alert_id: UUID,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
-):
-    """Mark alert as read."""
+    current_user: User,
+    action: str,
+    new_status: str,
+    notes: Optional[str] = None,
+    **values,
+) -> None:
+    """Move an alert to `new_status` and record the change in its history.
+
+    One statement: the alert row is locked to capture its previous status,
+    updated, and the history row is inserted from the UPDATE's RETURNING.
+    Raises 404 when the alert does not exist in the user's tenant.
+    """
+    previous = (
+        select(Alert.id, Alert.status)
+        .where(Alert.id == alert_id, Alert.tenant_id == current_user.tenant_id)
+        .with_for_update()
+        .cte("previous")
+    )
+    updated = (
+        update(Alert)
+        .where(Alert.id == previous.c.id)
+        .values(status=new_status, **values)
+        .returning(Alert.id, previous.c.status)
+        .cte("updated")
+    )
+    history_columns = AlertHistory.__table__.c
     result = await db.execute(
-        select(Alert).where(
-            Alert.id == alert_id,
-            Alert.tenant_id == current_user.tenant_id
+        insert(AlertHistory)
+        .from_select(
+            ["id", "alert_id", "action", "old_status", "new_status", "notes", "performed_by"],
+            select(
+                literal(uuid.uuid4(), history_columns.id.type),
+                updated.c.id,
+                literal(action, history_columns.action.type),
+                updated.c.status,
+                literal(new_status, history_columns.new_status.type),
+                literal(notes, history_columns.notes.type),
+                literal(current_user.id, history_columns.performed_by.type),
+            )
         )
+        .returning(AlertHistory.alert_id)
+        .add_cte(previous, nest_here=True)
+        .add_cte(updated, nest_here=True)
     )
-    alert = result.scalar_one_or_none()
-
-    if not alert:
+    if result.first() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Alert not found"
         )
 
-    old_status = alert.status
-    alert.status = "read"
-    alert.read_at = datetime.utcnow()
-    alert.read_by = current_user.id
-
-    # Add history (non-blocking - don't let history failure prevent status update)
-    try:
-        history = AlertHistory(
-            alert_id=alert.id,
-            action="read",
-            old_status=old_status,
-            new_status="read",
-            performed_by=current_user.id
-        )
-        db.add(history)
-    except Exception as e:
-        logger.warning(f"Failed to create alert history: {e}")
 
+@router.put("/{alert_id}/read", response_model=dict)
+async def mark_alert_read(
+    alert_id: UUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Mark alert as read."""
+    read_at = datetime.utcnow()
+    await _transition_alert(
+        db, alert_id, current_user, action="read", new_status="read",
+        read_at=read_at, read_by=current_user.id,
+    )
     await db.commit()
+    await invalidate_alert_counts(current_user.tenant_id)
 
     return {
         "success": True,
         "data": {
-            "id": str(alert.id),
+            "id": str(alert_id),
             "status": "read",
-            "readAt": alert.read_at,
+            "readAt": read_at,
             "readBy": current_user.name
         }
     }
@@ -332,46 +457,20 @@ async def acknowledge_alert(
     db: AsyncSession = Depends(get_db)
 ):
     """Acknowledge alert."""
-    result = await db.execute(
-        select(Alert).where(
-            Alert.id == alert_id,
-            Alert.tenant_id == current_user.tenant_id
-        )
+    acknowledged_at = datetime.utcnow()
+    await _transition_alert(
+        db, alert_id, current_user, action="acknowledged", new_status="acknowledged",
+        acknowledged_at=acknowledged_at, acknowledged_by=current_user.id,
     )
-    alert = result.scalar_one_or_none()
-
-    if not alert:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Alert not found"
-        )
-
-    old_status = alert.status
-    alert.status = "acknowledged"
-    alert.acknowledged_at = datetime.utcnow()
-    alert.acknowledged_by = current_user.id
-
-    # Add history (non-blocking - don't let history failure prevent status update)
-    try:
-        history = AlertHistory(
-            alert_id=alert.id,
-            action="acknowledged",
-            old_status=old_status,
-            new_status="acknowledged",
-            performed_by=current_user.id
-        )
-        db.add(history)
-    except Exception as e:
-        logger.warning(f"Failed to create alert history: {e}")
-
     await db.commit()
+    await invalidate_alert_counts(current_user.tenant_id)
 
     return {
         "success": True,
         "data": {
-            "id": str(alert.id),
+            "id": str(alert_id),
             "status": "acknowledged",
-            "acknowledgedAt": alert.acknowledged_at,
+            "acknowledgedAt": acknowledged_at,
             "acknowledgedBy": current_user.name
         }
     }
@@ -385,50 +484,23 @@ async def resolve_alert(
     db: AsyncSession = Depends(get_db)
 ):
     """Resolve alert."""
-    result = await db.execute(
-        select(Alert).where(
-            Alert.id == alert_id,
-            Alert.tenant_id == current_user.tenant_id
-        )
+    resolved_at = datetime.utcnow()
+    await _transition_alert(
+        db, alert_id, current_user, action="resolved", new_status="resolved",
+        notes=request.resolution,
+        resolved_at=resolved_at, resolved_by=current_user.id, resolution=request.resolution,
     )
-    alert = result.scalar_one_or_none()
-
-    if not alert:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Alert not found"
-        )
-
-    old_status = alert.status
-    alert.status = "resolved"
-    alert.resolved_at = datetime.utcnow()
-    alert.resolved_by = current_user.id
-    alert.resolution = request.resolution
-
-    # Add history (non-blocking - don't let history failure prevent status update)
-    try:
-        history = AlertHistory(
-            alert_id=alert.id,
-            action="resolved",
-            old_status=old_status,
-            new_status="resolved",
-            notes=request.resolution,
-            performed_by=current_user.id
-        )
-        db.add(history)
-    except Exception as e:
-        logger.warning(f"Failed to create alert history: {e}")
-
     await db.commit()
+    await invalidate_alert_counts(current_user.tenant_id)
 
     return {
         "success": True,
         "data": {
-            "id": str(alert.id),
+            "id": str(alert_id),
             "status": "resolved",
-            "resolvedAt": alert.resolved_at,
+            "resolvedAt": resolved_at,
             "resolvedBy": current_user.name,
-            "resolution": alert.resolution
+            "resolution": request.resolution
         }
     }
 
@@ -441,22 +513,19 @@ async def dismiss_alert(
 ):
     """Dismiss/delete alert."""
     result = await db.execute(
-        select(Alert).where(
-            Alert.id == alert_id,
-            Alert.tenant_id == current_user.tenant_id
-        )
+        update(Alert)
+        .where(Alert.id == alert_id, Alert.tenant_id == current_user.tenant_id)
+        .values(status="dismissed")
+        .returning(Alert.id)
     )
-    alert = result.scalar_one_or_none()
-
-    if not alert:
+    if result.first() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Alert not found"
         )
 
-    alert.status = "dismissed"
-
     await db.commit()
+    await invalidate_alert_counts(current_user.tenant_id)
 
     return {"success": True, "message": "Alert dismissed"}
 
@@ -469,39 +538,44 @@ async def forward_alert(
     db: AsyncSession = Depends(get_db)
 ):
     """Forward/reassign alert to another role."""
+    forwarded_at = datetime.utcnow()
     result = await db.execute(
-        select(Alert).where(
-            Alert.id == alert_id,
-            Alert.tenant_id == current_user.tenant_id
+        update(Alert)
+        .where(Alert.id == alert_id, Alert.tenant_id == current_user.tenant_id)
+        .values(
+            # Add new role to for_roles (array_cat treats NULL as empty)
+            for_roles=case(
+                (Alert.for_roles.contains([request.to_role]), Alert.for_roles),
+                else_=func.array_cat(
+                    Alert.for_roles,
+                    literal([request.to_role], Alert.for_roles.type),
+                    type_=Alert.for_roles.type,
+                ),
+            ),
+            forwarded_to_roles=[request.to_role],
+            forwarded_at=forwarded_at,
+            forwarded_by=current_user.id,
+            forward_notes=request.notes,
         )
+        .returning(Alert.for_roles)
     )
-    alert = result.scalar_one_or_none()
+    for_roles = result.scalar_one_or_none()
 
-    if not alert:
+    if for_roles is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Alert not found"
         )
 
-    # Add new role to for_roles
-    current_roles = alert.for_roles or []
-    if request.to_role not in current_roles:
-        current_roles.append(request.to_role)
-        alert.for_roles = current_roles
-
-    alert.forwarded_to_roles = [request.to_role]
-    alert.forwarded_at = datetime.utcnow()
-    alert.forwarded_by = current_user.id
-    alert.forward_notes = request.notes
-
     await db.commit()
+    await invalidate_alert_counts(current_user.tenant_id)
 
     return {
         "success": True,
         "data": {
-            "id": str(alert.id),
-            "forRoles": alert.for_roles,
-            "forwardedAt": alert.forwarded_at,
+            "id": str(alert_id),
+            "forRoles": for_roles,
+            "forwardedAt": forwarded_at,
             "forwardedBy": current_user.name
         }
     }
@@ -514,17 +588,37 @@ async def seed_alerts_from_existing_data(
 ):
     """Generate alerts from existing patient data so the alerts panel is not empty."""
     tenant_id = current_user.tenant_id
-    created = 0
+    alert_rows: list[dict] = []
+
+    # Only one seed per tenant at a time: a concurrent call would pass the
+    # guard below before the first one commits and seed every alert twice.
+    # The transaction-scoped lock is released by the commit/rollback.
+    lock_result = await db.execute(
+        select(func.pg_try_advisory_xact_lock(
+            func.hashtextextended(f"alerts-seed:{tenant_id}", 0)
+        ))
+    )
+    if not lock_result.scalar():
+        return {
+            "success": True,
+            "data": {
+                "alertsCreated": 0,
+                "patientsScanned": 0,
+                "message": "Alert seeding already in progress"
+            }
+        }
 
     # Guard: skip if alerts already exist (avoid duplicate seeding)
-    existing_count_result = await db.execute(
-        select(func.count()).select_from(Alert).where(
-            Alert.tenant_id == tenant_id,
-            Alert.status.in_(["unread", "read"])
+    # EXISTS stops at the first matching row instead of counting them all
+    existing_result = await db.execute(
+        select(
+            exists().where(
+                Alert.tenant_id == tenant_id,
+                Alert.status.in_(["unread", "read"])
+            )
         )
     )
-    existing_count = existing_count_result.scalar() or 0
-    if existing_count > 0:
+    if existing_result.scalar():
         return {
             "success": True,
             "data": {
@@ -538,27 +632,54 @@ async def seed_alerts_from_existing_data(
     patients_result = await db.execute(
         select(Patient).options(
             selectinload(Patient.bed),
-            selectinload(Patient.department)
+            selectinload(Patient.department),
+            raiseload("*"),
         ).where(
             Patient.tenant_id == tenant_id,
             Patient.status.notin_(["discharged", "transferred"])
         )
     )
     patients = patients_result.scalars().all()
+    patient_ids = [p.id for p in patients]
+
+    # 2. Bulk-load the per-patient data the loop needs, keyed by patient,
+    #    instead of querying vitals/prescriptions/triage once per patient
+    latest_vitals_result = await db.execute(
+        select(PatientVitals)
+        .where(PatientVitals.patient_id.in_(patient_ids))
+        .order_by(PatientVitals.patient_id, PatientVitals.recorded_at.desc())
+        .distinct(PatientVitals.patient_id)
+    )
+    latest_vitals_by_patient = {v.patient_id: v for v in latest_vitals_result.scalars()}
+
+    rx_result = await db.execute(
+        select(Prescription).where(
+            Prescription.patient_id.in_(patient_ids),
+            Prescription.status == "active"
+        )
+    )
+    prescriptions_by_patient = defaultdict(list)
+    for rx in rx_result.scalars():
+        prescriptions_by_patient[rx.patient_id].append(rx)
+
+    triage_result = await db.execute(
+        select(AITriageResult)
+        .where(
+            AITriageResult.patient_id.in_(patient_ids),
+            AITriageResult.is_applied == True
+        )
+        .order_by(AITriageResult.patient_id, AITriageResult.applied_at.desc())
+        .distinct(AITriageResult.patient_id)
+    )
+    latest_triage_by_patient = {t.patient_id: t for t in triage_result.scalars()}
 
     for patient in patients:
-        bed_label = patient.bed.bed_number if patient.bed else "No Bed"
-        dept_name = patient.department.name if patient.department else "Unassigned"
-        uhi_label = f"UHI: {patient.uhi}" if patient.uhi else ""
-        euhi_label = f"EUHI: {patient.euhi}" if patient.euhi else ""
-        id_info = " | ".join(filter(None, [uhi_label, euhi_label]))
-        patient_info = f"{patient.name} [{dept_name}] ({bed_label})"
-        patient_detail = f"{patient_info} {id_info}." if id_info else f"{patient_info}."
+        patient_detail = _patient_detail(patient)
 
         # --- Alert based on triage priority ---
         if patient.priority and patient.priority <= 2:
             level = "Critical" if patient.priority == 1 else "High"
-            alert = Alert(
+            alert_rows.append(dict(
                 tenant_id=tenant_id,
                 title=f"{level} Priority - {patient.name}",
                 message=f"{patient_detail} Triaged as {level} (L{patient.priority}). Complaint: {patient.complaint or 'N/A'}. Requires immediate attention.",
@@ -567,20 +688,13 @@ async def seed_alerts_from_existing_data(
                 for_roles=["nurse", "doctor", "admin"],
                 patient_id=patient.id,
                 triggered_by="seed_existing_data"
-            )
-            db.add(alert)
-            created += 1
+            ))
 
         # --- Alert for patients waiting without vitals recorded ---
-        vitals_result = await db.execute(
-            select(func.count()).select_from(PatientVitals).where(
-                PatientVitals.patient_id == patient.id
-            )
-        )
-        vitals_count = vitals_result.scalar() or 0
+        latest_vitals = latest_vitals_by_patient.get(patient.id)
 
-        if vitals_count == 0:
-            alert = Alert(
+        if latest_vitals is None:
+            alert_rows.append(dict(
                 tenant_id=tenant_id,
                 title=f"Vitals Pending - {patient.name}",
                 message=f"{patient_detail} No vitals recorded yet. Please check and record vitals.",
@@ -589,54 +703,37 @@ async def seed_alerts_from_existing_data(
                 for_roles=["nurse"],
                 patient_id=patient.id,
                 triggered_by="seed_existing_data"
-            )
-            db.add(alert)
-            created += 1
+            ))
         else:
             # Check if latest vitals are critical
-            latest_vitals_result = await db.execute(
-                select(PatientVitals).where(
-                    PatientVitals.patient_id == patient.id
-                ).order_by(PatientVitals.recorded_at.desc()).limit(1)
-            )
-            latest_vitals = latest_vitals_result.scalar_one_or_none()
-            if latest_vitals:
-                critical_items = []
-                if latest_vitals.heart_rate and (latest_vitals.heart_rate < 50 or latest_vitals.heart_rate > 150):
-                    critical_items.append(f"HR {latest_vitals.heart_rate} bpm")
-                if latest_vitals.spo2 and float(latest_vitals.spo2) < 90:
-                    critical_items.append(f"SpO2 {latest_vitals.spo2}%")
-                if latest_vitals.temperature and (float(latest_vitals.temperature) < 95 or float(latest_vitals.temperature) > 104):
-                    critical_items.append(f"Temp {latest_vitals.temperature}°F")
-                if latest_vitals.blood_pressure_systolic and (latest_vitals.blood_pressure_systolic < 90 or latest_vitals.blood_pressure_systolic > 180):
-                    critical_items.append(f"BP {latest_vitals.blood_pressure or ''}")
-
-                if critical_items:
-                    alert = Alert(
-                        tenant_id=tenant_id,
-                        title=f"Critical Vitals - {patient.name}",
-                        message=f"{patient_detail} Critical vitals: {', '.join(critical_items)}. Immediate review needed.",
-                        priority="critical",
-                        category="Vitals",
-                        for_roles=["nurse", "doctor"],
-                        patient_id=patient.id,
-                        triggered_by="seed_existing_data"
-                    )
-                    db.add(alert)
-                    created += 1
+            critical_items = []
+            if latest_vitals.heart_rate and (latest_vitals.heart_rate < 50 or latest_vitals.heart_rate > 150):
+                critical_items.append(f"HR {latest_vitals.heart_rate} bpm")
+            if latest_vitals.spo2 and float(latest_vitals.spo2) < 90:
+                critical_items.append(f"SpO2 {latest_vitals.spo2}%")
+            if latest_vitals.temperature and (float(latest_vitals.temperature) < 95 or float(latest_vitals.temperature) > 104):
+                critical_items.append(f"Temp {latest_vitals.temperature}°F")
+            if latest_vitals.blood_pressure_systolic and (latest_vitals.blood_pressure_systolic < 90 or latest_vitals.blood_pressure_systolic > 180):
+                critical_items.append(f"BP {latest_vitals.blood_pressure or ''}")
+
+            if critical_items:
+                alert_rows.append(dict(
+                    tenant_id=tenant_id,
+                    title=f"Critical Vitals - {patient.name}",
+                    message=f"{patient_detail} Critical vitals: {', '.join(critical_items)}. Immediate review needed.",
+                    priority="critical",
+                    category="Vitals",
+                    for_roles=["nurse", "doctor"],
+                    patient_id=patient.id,
+                    triggered_by="seed_existing_data"
+                ))
 
         # --- Alert for active prescriptions needing nurse administration ---
-        rx_result = await db.execute(
-            select(Prescription).where(
-                Prescription.patient_id == patient.id,
-                Prescription.status == "active"
-            )
-        )
-        prescriptions = rx_result.scalars().all()
+        prescriptions = prescriptions_by_patient.get(patient.id, [])
         if prescriptions:
             med_names = [rx.medication_name for rx in prescriptions[:3]]
             more = f" (+{len(prescriptions) - 3} more)" if len(prescriptions) > 3 else ""
-            alert = Alert(
+            alert_rows.append(dict(
                 tenant_id=tenant_id,
                 title=f"Active Medications - {patient.name}",
                 message=f"{patient_detail} {len(prescriptions)} active prescription(s): {', '.join(med_names)}{more}. Ensure timely administration.",
@@ -645,13 +742,11 @@ async def seed_alerts_from_existing_data(
                 for_roles=["nurse"],
                 patient_id=patient.id,
                 triggered_by="seed_existing_data"
-            )
-            db.add(alert)
-            created += 1
+            ))
 
         # --- Alert for police case patients ---
         if patient.is_police_case:
-            alert = Alert(
+            alert_rows.append(dict(
                 tenant_id=tenant_id,
                 title=f"Police Case - {patient.name}",
                 message=f"{patient_detail} Flagged as a police case ({patient.police_case_type or 'unspecified'}). Follow medico-legal protocol.",
@@ -660,20 +755,12 @@ async def seed_alerts_from_existing_data(
                 for_roles=["doctor", "admin"],
                 patient_id=patient.id,
                 triggered_by="seed_existing_data"
-            )
-            db.add(alert)
-            created += 1
+            ))
 
         # --- Alert for patients with recent triage escalation ---
-        triage_result = await db.execute(
-            select(AITriageResult).where(
-                AITriageResult.patient_id == patient.id,
-                AITriageResult.is_applied == True
-            ).order_by(AITriageResult.applied_at.desc()).limit(1)
-        )
-        latest_triage = triage_result.scalar_one_or_none()
+        latest_triage = latest_triage_by_patient.get(patient.id)
         if latest_triage and latest_triage.reasoning:
-            alert = Alert(
+            alert_rows.append(dict(
                 tenant_id=tenant_id,
                 title=f"AI Triage - {patient.name}",
                 message=f"{patient_detail} Triaged L{latest_triage.priority} ({latest_triage.priority_label}): {latest_triage.reasoning}",
@@ -682,11 +769,15 @@ async def seed_alerts_from_existing_data(
                 for_roles=["nurse", "doctor"],
                 patient_id=patient.id,
                 triggered_by="seed_existing_data"
-            )
-            db.add(alert)
-            created += 1
+            ))
 
+    # One multi-row INSERT instead of a flush per ORM object
+    created = len(alert_rows)
+    if alert_rows:
+        await db.execute(insert(Alert), alert_rows)
     await db.commit()
+    # Core INSERT: not seen by the ORM flush hook that invalidates the counts
+    await invalidate_alert_counts(tenant_id)
 
     return {
         "success": True,
@@ -727,7 +818,6 @@ async def create_alert(
     db.add(history)
 
     await db.commit()
-    await db.refresh(alert)
 
     return {
         "success": True,
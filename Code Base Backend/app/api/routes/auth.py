@@ -1,9 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update, delete, func, exists
 from sqlalchemy.orm import selectinload
-from datetime import datetime, timedelta, date
-import traceback
+from datetime import datetime, timedelta, date, timezone
+import asyncio
+import hmac
+import logging
 import uuid
 
 from app.db.database import get_db
@@ -17,7 +19,7 @@ from app.schemas.auth import (
 )
 from app.schemas.common import SuccessResponse
 from app.core.security import (
-    verify_password, get_password_hash,
+    verify_password_async, get_password_hash_async,
     create_access_token, create_refresh_token,
     decode_token, hash_token, generate_otp, generate_reset_token
 )
@@ -25,6 +27,8 @@ from app.core.dependencies import get_current_user
 from app.core.rate_limit import rate_limit_login, rate_limit_forgot_password, rate_limit_verify_otp
 from app.services.email import email_service
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 
@@ -54,7 +58,7 @@ async def login(
                 detail="Invalid email or password"
             )
 
-        if not verify_password(request.password, user.password_hash):
+        if not await verify_password_async(request.password, user.password_hash):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password"
@@ -116,7 +120,8 @@ async def login(
 
     except HTTPException:
         raise
-    except Exception as e:
+    except Exception:
+        logger.exception("login failed")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An unexpected error occurred. Please try again."
@@ -130,20 +135,21 @@ async def logout(
 ):
     """Logout and invalidate token."""
     try:
-        result = await db.execute(
-            select(UserSession).where(
+        # One UPDATE for all of the user's sessions; nothing is loaded, so
+        # there is no identity map to keep in sync
+        await db.execute(
+            update(UserSession)
+            .where(
                 UserSession.user_id == current_user.id,
                 UserSession.is_active == True
             )
+            .values(is_active=False)
+            .execution_options(synchronize_session=False)
         )
-        sessions = result.scalars().all()
-
-        for session in sessions:
-            session.is_active = False
-
         await db.commit()
         return {"success": True, "message": "Logged out successfully"}
     except Exception:
+        logger.exception("logout failed")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An unexpected error occurred. Please try again."
@@ -177,11 +183,16 @@ async def forgot_password(
         otp = generate_otp()
         otp_expiry = datetime.utcnow() + timedelta(minutes=10)
 
+        # A new OTP replaces any pending one, so the table holds at most one
+        # reset per user instead of a row for every request
+        await db.execute(
+            delete(PasswordResetToken).where(PasswordResetToken.user_id == user.id)
+        )
         reset_token = PasswordResetToken(
             user_id=user.id,
             email=user.email,
             otp_hash=hash_token(otp),
-            otp_expires_at=otp_expiry.isoformat()
+            otp_expires_at=otp_expiry.replace(tzinfo=timezone.utc)
         )
         db.add(reset_token)
         await db.commit()
@@ -201,6 +212,7 @@ async def forgot_password(
             "otpExpiry": otp_expiry.isoformat()
         }
     except Exception:
+        logger.exception("forgot_password failed")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An unexpected error occurred. Please try again."
@@ -216,37 +228,30 @@ async def verify_otp(
     """Verify OTP for password reset."""
     rate_limit_verify_otp(http_request)
     try:
+        # The OTP is matched by its hash in the lookup itself (forgot-password
+        # keeps one pending row per user), so a wrong, used or expired OTP
+        # all come back as no row and get the same response. The hash is
+        # compared again in constant time as defense in depth.
+        otp_hash = hash_token(request.otp)
         result = await db.execute(
             select(PasswordResetToken).where(
                 PasswordResetToken.email == request.email,
-                PasswordResetToken.is_used == False
-            ).order_by(PasswordResetToken.created_at.desc())
+                PasswordResetToken.otp_hash == otp_hash,
+                PasswordResetToken.is_used == False,
+                PasswordResetToken.otp_expires_at > func.now()
+            ).limit(1)
         )
         reset_token = result.scalar_one_or_none()
 
-        if not reset_token:
+        if not reset_token or not hmac.compare_digest(reset_token.otp_hash or "", otp_hash):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid or expired OTP"
             )
 
-        if reset_token.otp_hash != hash_token(request.otp):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid OTP"
-            )
-
-        if reset_token.otp_expires_at:
-            expiry = datetime.fromisoformat(reset_token.otp_expires_at.replace('Z', '+00:00').replace('+00:00', ''))
-            if datetime.utcnow() > expiry:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="OTP has expired"
-                )
-
         new_reset_token = generate_reset_token()
         reset_token.reset_token_hash = hash_token(new_reset_token)
-        reset_token.token_expires_at = (datetime.utcnow() + timedelta(minutes=15)).isoformat()
+        reset_token.token_expires_at = datetime.now(timezone.utc) + timedelta(minutes=15)
 
         await db.commit()
 
@@ -257,6 +262,7 @@ async def verify_otp(
     except HTTPException:
         raise
     except Exception:
+        logger.exception("verify_otp failed")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An unexpected error occurred. Please try again."
@@ -273,7 +279,8 @@ async def reset_password(
         result = await db.execute(
             select(PasswordResetToken).where(
                 PasswordResetToken.reset_token_hash == hash_token(request.reset_token),
-                PasswordResetToken.is_used == False
+                PasswordResetToken.is_used == False,
+                PasswordResetToken.token_expires_at > func.now()
             )
         )
         reset_token = result.scalar_one_or_none()
@@ -284,21 +291,13 @@ async def reset_password(
                 detail="Invalid or expired reset token"
             )
 
-        if reset_token.token_expires_at:
-            expiry = datetime.fromisoformat(reset_token.token_expires_at.replace('Z', '+00:00').replace('+00:00', ''))
-            if datetime.utcnow() > expiry:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Reset token has expired"
-                )
-
         user_result = await db.execute(
             select(User).where(User.id == reset_token.user_id)
         )
         user = user_result.scalar_one_or_none()
 
         if user:
-            user.password_hash = get_password_hash(request.new_password)
+            user.password_hash = await get_password_hash_async(request.new_password)
             # Delete the used token instead of just marking it
             await db.delete(reset_token)
             await db.commit()
@@ -307,6 +306,7 @@ async def reset_password(
     except HTTPException:
         raise
     except Exception:
+        logger.exception("reset_password failed")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An unexpected error occurred. Please try again."
@@ -321,19 +321,20 @@ async def change_password(
 ):
     """Change password for logged-in user."""
     try:
-        if not verify_password(request.current_password, current_user.password_hash):
+        if not await verify_password_async(request.current_password, current_user.password_hash):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Current password is incorrect"
             )
 
-        current_user.password_hash = get_password_hash(request.new_password)
+        current_user.password_hash = await get_password_hash_async(request.new_password)
         await db.commit()
 
         return {"success": True, "message": "Password changed successfully"}
     except HTTPException:
         raise
     except Exception:
+        logger.exception("change_password failed")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An unexpected error occurred. Please try again."
@@ -418,6 +419,7 @@ async def refresh_token(
     except HTTPException:
         raise
     except Exception:
+        logger.exception("refresh_token failed")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An unexpected error occurred. Please try again."
@@ -426,39 +428,22 @@ async def refresh_token(
 
 @router.get("/me")
 async def get_current_user_info(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user)
 ):
     """Get current user information."""
-    try:
-        result = await db.execute(
-            select(User)
-            .options(selectinload(User.department))
-            .where(User.id == current_user.id)
-        )
-        user = result.scalar_one_or_none()
-
-        department_name = None
-        if user and user.department:
-            department_name = user.department.name
-
-        return {
-            "success": True,
-            "data": {
-                "id": str(current_user.id),
-                "name": current_user.name,
-                "email": current_user.email,
-                "role": current_user.role,
-                "department": department_name,
-                "avatar": current_user.avatar_url,
-                "phone": current_user.phone
-            }
+    department = current_user.department
+    return {
+        "success": True,
+        "data": {
+            "id": str(current_user.id),
+            "name": current_user.name,
+            "email": current_user.email,
+            "role": current_user.role,
+            "department": department.name if department else None,
+            "avatar": current_user.avatar_url,
+            "phone": current_user.phone
         }
-    except Exception:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="An unexpected error occurred. Please try again."
-        )
+    }
 
 
 @router.get("/seed-database")
@@ -471,8 +456,7 @@ async def seed_database(db: AsyncSession = Depends(get_db)):
 
     try:
         # Refuse to run if users already exist
-        result = await db.execute(select(User).limit(1))
-        if result.scalar_one_or_none():
+        if await db.scalar(select(exists(select(User.id)))):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Database already seeded. This endpoint only works on an empty database."
@@ -507,22 +491,23 @@ async def seed_database(db: AsyncSession = Depends(get_db)):
         )
         db.add(dept)
 
-        # Flush so dept.id is available
-        await db.flush()
-
         demo_users = [
             {"name": "Priya Sharma", "email": "priya@hospital.com", "password": "nurse123", "role": "nurse", "emp": "DEMO1", "phone": "+91-9876543210"},
             {"name": "Dr. Ananya Patel", "email": "ananya@hospital.com", "password": "doctor123", "role": "doctor", "emp": "DEMO2", "phone": "+91-9876543211", "spec": "Emergency Medicine"},
             {"name": "Rajesh Kumar", "email": "rajesh@hospital.com", "password": "admin123", "role": "admin", "emp": "DEMO3", "phone": "+91-9876543212"},
         ]
 
-        for u in demo_users:
-            user = User(
+        # Hash the demo passwords in parallel on the bcrypt pool
+        password_hashes = await asyncio.gather(
+            *(get_password_hash_async(u["password"]) for u in demo_users)
+        )
+        db.add_all(
+            User(
                 id=uuid.uuid4(),
                 tenant_id=tenant_id,
                 employee_id=u["emp"],
                 email=u["email"],
-                password_hash=get_password_hash(u["password"]),
+                password_hash=password_hash,
                 name=u["name"],
                 role=u["role"],
                 department_id=dept.id,
@@ -531,8 +516,11 @@ async def seed_database(db: AsyncSession = Depends(get_db)):
                 status="active",
                 joined_at=date.today() - timedelta(days=365)
             )
-            db.add(user)
+            for u, password_hash in zip(demo_users, password_hashes)
+        )
 
+        # Tenant, department and users go out in the commit's single flush;
+        # the ids are assigned client-side, so nothing needs flushing earlier
         await db.commit()
 
         return {
@@ -543,6 +531,7 @@ async def seed_database(db: AsyncSession = Depends(get_db)):
     except HTTPException:
         raise
     except Exception:
+        logger.exception("seed_database failed")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An unexpected error occurred. Please try again."
@@ -1,15 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, update, func, bindparam
+from sqlalchemy.orm import selectinload, joinedload
 from uuid import UUID
 from datetime import datetime
 from typing import Optional
+from functools import lru_cache
+import orjson
 
 from app.db.database import get_db
 from app.models.user import User
 from app.models.bed import Bed, BedAssignment
 from app.models.patient import Patient
+from app.models.department import Department
 from app.schemas.bed import BedResponse, BedAssignRequest, BedStatusUpdate
 from app.schemas.common import SuccessResponse
 from app.core.dependencies import get_current_user
@@ -18,58 +22,90 @@ from app.services.audit import log_action
 router = APIRouter()
 
 
-@router.get("", response_model=dict)
-async def get_beds(
-    department: Optional[str] = None,
-    status_filter: Optional[str] = Query(None, alias="status"),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
-):
-    """Get all beds with status."""
-    query = select(Bed).options(
-        selectinload(Bed.department),
-        selectinload(Bed.current_patient)
+# Prebuilt read statements (see alerts.py); bound parameters: tenant_id, and
+# bed_id / the optional list filters.
+
+@lru_cache(maxsize=None)
+def _bed_list_statement(by_department: bool, by_status: bool):
+    """Bed board projection, one statement per combination of optional filters.
+
+    The department and current patient are joined in, so the response needs
+    no ORM objects. The optional filters take the department/status parameters.
+    """
+    stmt = select(
+        Bed.id,
+        Bed.bed_number,
+        Department.name.label("department"),
+        Bed.bed_type,
+        Bed.floor,
+        Bed.wing,
+        Bed.status,
+        Bed.features,
+        Patient.id.label("patient_id"),
+        Patient.name.label("patient_name"),
+    ).join(
+        Department, Bed.department_id == Department.id
+    ).outerjoin(
+        Patient, Bed.current_patient_id == Patient.id
     ).where(
-        Bed.tenant_id == current_user.tenant_id,
+        Bed.tenant_id == bindparam("tenant_id"),
         Bed.is_active == True
     )
+    if by_department:
+        stmt = stmt.where(Department.name == bindparam("department"))
+    if by_status:
+        stmt = stmt.where(Bed.status == bindparam("status"))
+    return stmt.order_by(Bed.bed_number)
 
-    if department:
-        query = query.join(Bed.department).filter_by(name=department)
-
-    if status_filter:
-        query = query.where(Bed.status == status_filter)
 
-    query = query.order_by(Bed.bed_number)
+_BED_DETAIL_STMT = (
+    select(Bed)
+    .options(joinedload(Bed.department), joinedload(Bed.current_patient))
+    .where(Bed.id == bindparam("bed_id"), Bed.tenant_id == bindparam("tenant_id"))
+)
 
-    result = await db.execute(query)
-    beds = result.scalars().all()
 
-    beds_data = []
-    for bed in beds:
-        patient_data = None
-        if bed.current_patient:
-            patient_data = {
-                "id": str(bed.current_patient.id),
-                "name": bed.current_patient.name
-            }
+@router.get("", response_model=dict)
+async def get_beds(
+    department: Optional[str] = None,
+    status_filter: Optional[str] = Query(None, alias="status"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get all beds with status.
 
-        beds_data.append({
-            "id": str(bed.id),
+    Encoded with orjson (UUIDs natively, no str() per field).
+    """
+    result = await db.execute(
+        _bed_list_statement(bool(department), bool(status_filter)),
+        {
+            "tenant_id": current_user.tenant_id,
+            "department": department,
+            "status": status_filter,
+        }
+    )
+    beds_data = [
+        {
+            "id": bed.id,
             "bedNumber": bed.bed_number,
-            "department": bed.department.name if bed.department else None,
+            "department": bed.department,
             "bedType": bed.bed_type,
             "floor": bed.floor,
             "wing": bed.wing,
             "status": bed.status,
             "features": bed.features,
-            "patient": patient_data
-        })
+            "patient": (
+                {"id": bed.patient_id, "name": bed.patient_name}
+                if bed.patient_id else None
+            )
+        }
+        for bed in result
+    ]
 
-    return {
-        "success": True,
-        "data": beds_data
-    }
+    return Response(
+        content=orjson.dumps({"success": True, "data": beds_data}),
+        media_type="application/json"
+    )
 
 
 @router.get("/{bed_id}", response_model=dict)
@@ -80,13 +116,8 @@ async def get_bed(
 ):
     """Get specific bed by ID."""
     result = await db.execute(
-        select(Bed).options(
-            selectinload(Bed.department),
-            selectinload(Bed.current_patient)
-        ).where(
-            Bed.id == bed_id,
-            Bed.tenant_id == current_user.tenant_id
-        )
+        _BED_DETAIL_STMT,
+        {"bed_id": bed_id, "tenant_id": current_user.tenant_id}
     )
     bed = result.scalar_one_or_none()
 
@@ -99,25 +130,28 @@ async def get_bed(
     patient_data = None
     if bed.current_patient:
         patient_data = {
-            "id": str(bed.current_patient.id),
+            "id": bed.current_patient.id,
             "name": bed.current_patient.name
         }
 
-    return {
-        "success": True,
-        "data": {
-            "id": str(bed.id),
-            "bedNumber": bed.bed_number,
-            "department": bed.department.name if bed.department else None,
-            "bedType": bed.bed_type,
-            "floor": bed.floor,
-            "wing": bed.wing,
-            "status": bed.status,
-            "features": bed.features,
-            "patient": patient_data,
-            "assignedAt": bed.assigned_at
-        }
-    }
+    return Response(
+        content=orjson.dumps({
+            "success": True,
+            "data": {
+                "id": bed.id,
+                "bedNumber": bed.bed_number,
+                "department": bed.department.name if bed.department else None,
+                "bedType": bed.bed_type,
+                "floor": bed.floor,
+                "wing": bed.wing,
+                "status": bed.status,
+                "features": bed.features,
+                "patient": patient_data,
+                "assignedAt": bed.assigned_at
+            }
+        }),
+        media_type="application/json"
+    )
 
 
 @router.patch("/{bed_id}/status", response_model=dict)
@@ -165,65 +199,82 @@ async def update_bed_status(
     }
 
 
-@router.post("/{bed_id}/assign", response_model=dict)
-async def assign_bed(
-    bed_id: UUID,
-    request: BedAssignRequest,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
-):
-    """Assign bed to a patient."""
-    # Get bed with row-level lock to prevent concurrent assignment
-    bed_result = await db.execute(
-        select(Bed).where(
-            Bed.id == bed_id,
-            Bed.tenant_id == current_user.tenant_id
-        ).with_for_update()
-    )
-    bed = bed_result.scalar_one_or_none()
-
-    if not bed:
+async def _check_bed_available(db: AsyncSession, bed_id: UUID, tenant_id: UUID) -> None:
+    """Raise 404 for a missing bed and 400 for an occupied one."""
+    bed_row = (await db.execute(
+        select(Bed.status).where(Bed.id == bed_id, Bed.tenant_id == tenant_id)
+    )).first()
+    if bed_row is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Bed not found"
         )
-
-    if bed.status == "occupied":
+    if bed_row.status == "occupied":
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Bed is already occupied"
         )
 
-    # Get patient
+
+@router.post("/{bed_id}/assign", response_model=dict)
+async def assign_bed(
+    bed_id: UUID,
+    request: BedAssignRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Assign bed to a patient.
+
+    The target bed is claimed with one conditional UPDATE ... RETURNING, so
+    two concurrent assignments cannot both take it; the bed is only read
+    again on the failure path, to tell "not found" from "occupied". The
+    patient row is locked first, so concurrent assignments of the same
+    patient run one after the other and each releases the bed the previous
+    one claimed.
+    """
+    # Get patient, locked until commit since its bed_id is read and switched
+    # below (OF patients: the eager-joined department is outer-joined)
     patient_result = await db.execute(
         select(Patient).where(
             Patient.id == request.patient_id,
             Patient.tenant_id == current_user.tenant_id
-        )
+        ).with_for_update(of=Patient)
     )
     patient = patient_result.scalar_one_or_none()
 
     if not patient:
+        await _check_bed_available(db, bed_id, current_user.tenant_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Patient not found"
         )
 
+    claimed = await db.execute(
+        update(Bed)
+        .where(
+            Bed.id == bed_id,
+            Bed.tenant_id == current_user.tenant_id,
+            Bed.status.is_distinct_from("occupied")
+        )
+        .values(status="occupied", current_patient_id=patient.id, assigned_at=func.now())
+        .returning(Bed.id, Bed.bed_number, Bed.department_id, Bed.assigned_at)
+    )
+    bed = claimed.one_or_none()
+    if bed is None:
+        await _check_bed_available(db, bed_id, current_user.tenant_id)
+        # Freed again since the UPDATE ran: still report the lost race
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Bed is already occupied"
+        )
+
     # Release patient's previous bed if any
     if patient.bed_id:
-        old_bed_result = await db.execute(
-            select(Bed).where(Bed.id == patient.bed_id)
+        await db.execute(
+            update(Bed)
+            .where(Bed.id == patient.bed_id, Bed.tenant_id == current_user.tenant_id)
+            .values(status="available", current_patient_id=None, assigned_at=None)
         )
-        old_bed = old_bed_result.scalar_one_or_none()
-        if old_bed:
-            old_bed.status = "available"
-            old_bed.current_patient_id = None
-            old_bed.assigned_at = None
-
-    # Assign bed
-    bed.status = "occupied"
-    bed.current_patient_id = patient.id
-    bed.assigned_at = datetime.utcnow()
 
     patient.bed_id = bed.id
 
@@ -1,31 +1,95 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, bindparam
 from typing import Optional
+from functools import lru_cache
+import hashlib
+import orjson
 
 from app.db.database import get_db
 from app.models.user import User
 from app.models.department import Department
 from app.models.bed import Bed
 from app.core.dependencies import get_current_user
+from app.core.cache import cache_get_raw, cache_set_raw, tenant_prefix
 
 router = APIRouter()
 
+# Departments change only through the admin setup routes and doctors only
+# through staff mutations, which invalidate these (the doctors lists live
+# under the staff prefix for that); the TTLs bound anything missed
+DEPARTMENT_LIST_CACHE_TTL = 60
+DEPARTMENT_DOCTORS_CACHE_TTL = 60
+
+
+def _etag_response(request: Request, payload: bytes) -> Response:
+    """Serve `payload` with an ETag, or a bodyless 304 if the client already has it.
+
+    The responses are per-tenant and can change at any time, so clients must
+    revalidate on every use ("private, no-cache"); an unchanged list then
+    costs a 304 instead of the body.
+    """
+    etag = f'"{hashlib.blake2b(payload, digest_size=16).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return Response(content=payload, media_type="application/json", headers=headers)
+
+
+# Prebuilt statements (see alerts.py); bound parameters: tenant_id, and
+# department_id for the doctors statement
+_DEPARTMENTS_STMT = select(
+    Department.id, Department.name, Department.code, Department.floor, Department.capacity
+).where(
+    Department.tenant_id == bindparam("tenant_id"),
+    Department.is_active == True
+).order_by(Department.name)
+
+_DEPARTMENT_DOCTORS_STMT = select(
+    User.id, User.name, User.specialization
+).where(
+    User.tenant_id == bindparam("tenant_id"),
+    User.department_id == bindparam("department_id"),
+    User.role == "doctor",
+    User.status == "active",
+    User.deleted_at.is_(None)
+).order_by(User.name)
+
+
+@lru_cache(maxsize=None)
+def _department_beds_statement(by_status: bool):
+    """Department bed list, with or without the status filter."""
+    stmt = select(
+        Bed.id, Bed.bed_number, Bed.bed_type, Bed.floor, Bed.wing, Bed.status, Bed.features
+    ).where(
+        Bed.tenant_id == bindparam("tenant_id"),
+        Bed.department_id == bindparam("department_id"),
+        Bed.is_active == True
+    )
+    if by_status:
+        stmt = stmt.where(Bed.status == bindparam("status"))
+    return stmt.order_by(Bed.bed_number)
+
 
 @router.get("", response_model=dict)
 async def get_departments(
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get all active departments."""
-    query = select(Department).where(
-        Department.tenant_id == current_user.tenant_id,
-        Department.is_active == True
-    ).order_by(Department.name)
+    """Get all active departments.
 
-    result = await db.execute(query)
-    departments = result.scalars().all()
+    Polled by every dashboard render; with Redis configured the encoded
+    response is cached per tenant.
+    """
+    list_key = f"{tenant_prefix('departments', current_user.tenant_id)}list"
+    cached = await cache_get_raw(list_key)
+    if cached is not None:
+        return _etag_response(request, cached)
+
+    result = await db.execute(_DEPARTMENTS_STMT, {"tenant_id": current_user.tenant_id})
+    departments = result.all()
 
     departments_data = []
     for dept in departments:
@@ -37,12 +101,14 @@ async def get_departments(
             "capacity": dept.capacity
         })
 
-    return {
+    payload = orjson.dumps({
         "success": True,
         "data": {
             "departments": departments_data
         }
-    }
+    })
+    await cache_set_raw(list_key, payload, DEPARTMENT_LIST_CACHE_TTL)
+    return _etag_response(request, payload)
 
 
 @router.get("/{department_id}/doctors", response_model=dict)
@@ -51,17 +117,17 @@ async def get_department_doctors(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get all active doctors in a department."""
-    query = select(User).where(
-        User.tenant_id == current_user.tenant_id,
-        User.department_id == department_id,
-        User.role == "doctor",
-        User.status == "active",
-        User.deleted_at.is_(None)
-    ).order_by(User.name)
-
-    result = await db.execute(query)
-    doctors = result.scalars().all()
+    """Get all active doctors in a department (cached like the staff list)."""
+    doctors_key = f"{tenant_prefix('staff', current_user.tenant_id)}department-doctors:{department_id}"
+    cached = await cache_get_raw(doctors_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    result = await db.execute(
+        _DEPARTMENT_DOCTORS_STMT,
+        {"tenant_id": current_user.tenant_id, "department_id": department_id}
+    )
+    doctors = result.all()
 
     doctors_data = []
     for doctor in doctors:
@@ -71,35 +137,34 @@ async def get_department_doctors(
             "specialization": doctor.specialization
         })
 
-    return {
+    payload = orjson.dumps({
         "success": True,
         "data": {
             "doctors": doctors_data
         }
-    }
+    })
+    await cache_set_raw(doctors_key, payload, DEPARTMENT_DOCTORS_CACHE_TTL)
+    return Response(content=payload, media_type="application/json")
 
 
 @router.get("/{department_id}/beds", response_model=dict)
 async def get_department_beds(
     department_id: str,
+    request: Request,
     status: Optional[str] = Query("available", description="Filter by bed status"),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get beds in a department, optionally filtered by status."""
-    query = select(Bed).where(
-        Bed.tenant_id == current_user.tenant_id,
-        Bed.department_id == department_id,
-        Bed.is_active == True
+    """Get beds in a department, optionally filtered by status.
+
+    Not cached server-side (bed status changes constantly), but an unchanged
+    list still comes back as a 304.
+    """
+    result = await db.execute(
+        _department_beds_statement(bool(status and status != "all")),
+        {"tenant_id": current_user.tenant_id, "department_id": department_id, "status": status}
     )
-
-    if status and status != "all":
-        query = query.where(Bed.status == status)
-
-    query = query.order_by(Bed.bed_number)
-
-    result = await db.execute(query)
-    beds = result.scalars().all()
+    beds = result.all()
 
     beds_data = []
     for bed in beds:
@@ -113,9 +178,10 @@ async def get_department_beds(
             "features": bed.features
         })
 
-    return {
+    payload = orjson.dumps({
         "success": True,
         "data": {
             "beds": beds_data
         }
-    }
+    })
+    return _etag_response(request, payload)
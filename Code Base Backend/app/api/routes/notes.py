@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, or_
 from uuid import UUID
 from typing import Optional
 
@@ -37,15 +37,24 @@ async def get_patient_notes(
             detail="Patient not found"
         )
 
-    # Build query
-    query = select(PatientNote).where(
+    # Build query; the creator comes from the same statement
+    query = select(
+        PatientNote.id,
+        PatientNote.note_type,
+        PatientNote.content,
+        PatientNote.created_at,
+        User.id.label("creator_id"),
+        User.name.label("creator_name"),
+        User.role.label("creator_role")
+    ).outerjoin(
+        User, User.id == PatientNote.created_by
+    ).where(
         PatientNote.patient_id == patient_id,
         PatientNote.deleted_at.is_(None)
     )
 
     # Filter confidential notes — only visible to the note creator or doctors
     if current_user.role != "doctor":
-        from sqlalchemy import or_
         query = query.where(
             or_(
                 PatientNote.is_confidential == False,
@@ -59,30 +68,19 @@ async def get_patient_notes(
     query = query.order_by(PatientNote.created_at.desc())
 
     result = await db.execute(query)
-    notes = result.scalars().all()
-
-    # Batch-fetch all note creators in one query (avoids N+1 per note)
-    creator_ids = {note.created_by for note in notes if note.created_by}
-    creators_by_id: dict = {}
-    if creator_ids:
-        creators_result = await db.execute(
-            select(User).where(User.id.in_(creator_ids))
-        )
-        creators_by_id = {u.id: u for u in creators_result.scalars().all()}
 
     notes_data = []
-    for note in notes:
-        creator = creators_by_id.get(note.created_by) if note.created_by else None
+    for note in result:
         notes_data.append({
             "id": str(note.id),
             "type": note.note_type,
             "content": note.content,
             "createdAt": note.created_at.isoformat() if note.created_at else None,
             "createdBy": {
-                "id": str(creator.id),
-                "name": creator.name,
-                "role": creator.role
-            } if creator else None
+                "id": str(note.creator_id),
+                "name": note.creator_name,
+                "role": note.creator_role
+            } if note.creator_id else None
         })
 
     return {
@@ -159,7 +157,6 @@ async def create_patient_note(
         db.add(alert)
 
     await db.commit()
-    await db.refresh(note)
 
     return {
         "success": True,
@@ -1,13 +1,20 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
+from fastapi.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_, desc
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, insert, update, func, and_, or_, desc, bindparam
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import selectinload, joinedload, aliased
 from typing import Optional, List
 from uuid import UUID
 from datetime import datetime
-import base64
+from functools import lru_cache
+import asyncio
+import logging
+import orjson
 
+from app.core.config import settings
 from app.db.database import get_db
+from app.models.tenant import TenantCounters
 from app.models.user import User
 from app.models.patient import Patient, PatientVitals, PatientAllergy, PatientNote
 from app.models.department import Department
@@ -21,12 +28,24 @@ from app.schemas.patient import (
 )
 from app.schemas.common import SuccessResponse
 from app.core.dependencies import get_current_user, require_doctor, require_doctor_or_admin, require_any_staff, PaginationParams
-from app.services.triage import TriageService
+from app.services.triage import TriageService, get_triage_service
 from app.services.audit import log_action
+from app.services.storage import store_upload, upload_url
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
+async def _release_bed(db: AsyncSession, bed_id) -> None:
+    """Mark a bed available again in one UPDATE (no SELECT of the bed first)."""
+    await db.execute(
+        update(Bed)
+        .where(Bed.id == bed_id)
+        .values(status="available", current_patient_id=None, assigned_at=None)
+    )
+
+
 def _create_alert(db: AsyncSession, tenant_id, title: str, message: str, priority: str,
                   category: str, for_roles: list, patient_id=None, triggered_by="system", metadata=None):
     """Create an in-app alert for the given roles."""
@@ -65,68 +84,153 @@ def _to_iso(value) -> str | None:
     return s
 
 
-def _parse_ts(value) -> datetime:
-    """Parse a stored timestamp string (any format) into a naive-UTC datetime for comparison.
+# Takes the tenant's next patient number. The upsert locks the counter row
+# until commit, so concurrent admissions never share a number; callers take
+# it as late as possible and never across a network call (e.g. the LLM).
+_NEXT_PATIENT_NUMBER_STMT = (
+    pg_insert(TenantCounters)
+    .values(tenant_id=bindparam("tenant_id"), last_patient_number=1)
+    .on_conflict_do_update(
+        index_elements=[TenantCounters.tenant_id],
+        set_={"last_patient_number": TenantCounters.last_patient_number + 1},
+    )
+    .returning(TenantCounters.last_patient_number)
+)
 
-    Handles both Python ISO format ('2026-02-14T10:30:00Z') and
-    PostgreSQL text format ('2026-02-14 10:30:00+05:30').
-    Properly converts timezone offsets to UTC before returning.
-    Returns datetime.min if parsing fails so callers can safely use max()/sorted().
-    """
-    if value is None:
-        return datetime.min
-    if isinstance(value, datetime):
-        if value.tzinfo:
-            from datetime import timezone
-            return value.astimezone(timezone.utc).replace(tzinfo=None)
-        return value
-    s = str(value).strip()
-    if not s:
-        return datetime.min
-    # Normalise: replace space separator with T
-    if ' ' in s and 'T' not in s:
-        s = s.replace(' ', 'T', 1)
 
-    # Extract timezone offset and convert to UTC
-    tz_offset_hours = 0
-    tz_offset_minutes = 0
-
-    if s.endswith('Z'):
-        s = s[:-1]  # UTC, no offset needed
-    elif '+' in s[10:]:
-        # e.g. 2026-02-14T14:30:00.123456+05:30
-        plus_pos = s.rfind('+')
-        tz_part = s[plus_pos + 1:]
-        s = s[:plus_pos]
-        parts = tz_part.split(':')
-        tz_offset_hours = int(parts[0]) if parts[0] else 0
-        tz_offset_minutes = int(parts[1]) if len(parts) > 1 else 0
-    elif s.count('-') == 3:
-        # e.g. 2026-02-14T10:30:00-05:00 (negative offset)
-        minus_pos = s.rfind('-')
-        tz_part = s[minus_pos + 1:]
-        s = s[:minus_pos]
-        parts = tz_part.split(':')
-        tz_offset_hours = -(int(parts[0]) if parts[0] else 0)
-        tz_offset_minutes = -(int(parts[1]) if len(parts) > 1 else 0)
+async def generate_patient_id(db: AsyncSession, tenant_id: UUID) -> str:
+    """Generate a unique patient ID."""
+    number = await db.scalar(_NEXT_PATIENT_NUMBER_STMT, {"tenant_id": tenant_id})
+    return f"P{str(number).zfill(5)}"
+
+
+# Latest vitals / triage result of each patient in :patient_ids, one row per
+# patient (DISTINCT ON walks the (patient_id, timestamp DESC) order); only
+# the columns the patient list and triage inputs use
+_LATEST_VITALS_STMT = (
+    select(
+        PatientVitals.patient_id,
+        PatientVitals.heart_rate,
+        PatientVitals.blood_pressure,
+        PatientVitals.spo2,
+        PatientVitals.temperature,
+        PatientVitals.respiratory_rate,
+        PatientVitals.source,
+        PatientVitals.recorded_by,
+        PatientVitals.recorded_at,
+    )
+    .where(PatientVitals.patient_id.in_(bindparam("patient_ids", expanding=True)))
+    .order_by(PatientVitals.patient_id, PatientVitals.recorded_at.desc())
+    .distinct(PatientVitals.patient_id)
+)
 
-    try:
-        from datetime import timedelta
-        dt = datetime.fromisoformat(s)
-        # Subtract the offset to convert to UTC
-        dt = dt - timedelta(hours=tz_offset_hours, minutes=tz_offset_minutes)
-        return dt
-    except (ValueError, TypeError):
-        return datetime.min
+# Latest vitals of a single patient
+_PATIENT_LATEST_VITALS_STMT = (
+    select(PatientVitals)
+    .where(PatientVitals.patient_id == bindparam("patient_id"))
+    .order_by(PatientVitals.recorded_at.desc())
+    .limit(1)
+)
 
+_LATEST_TRIAGE_STMT = (
+    select(
+        AITriageResult.patient_id,
+        AITriageResult.reasoning,
+        AITriageResult.recommendations,
+        AITriageResult.confidence,
+        AITriageResult.estimated_wait_time,
+    )
+    .where(AITriageResult.patient_id.in_(bindparam("patient_ids", expanding=True)))
+    .order_by(AITriageResult.patient_id, AITriageResult.applied_at.desc().nulls_last())
+    .distinct(AITriageResult.patient_id)
+)
 
-async def generate_patient_id(db: AsyncSession, tenant_id: UUID) -> str:
-    """Generate a unique patient ID."""
-    result = await db.execute(
-        select(func.count(Patient.id)).where(Patient.tenant_id == tenant_id)
+
+_Doctor = aliased(User)
+_Nurse = aliased(User)
+
+# Columns of one patient list entry; related names come from outer joins
+_PATIENT_LIST_COLUMNS = (
+    Patient.id,
+    Patient.patient_id,
+    Patient.name,
+    Patient.age,
+    Patient.gender,
+    Patient.complaint,
+    Patient.phone,
+    Patient.blood_group,
+    Patient.priority,
+    Patient.priority_label,
+    Patient.priority_color,
+    Patient.status,
+    Patient.admitted_at,
+    Patient.admitted_by,
+    Patient.photo_url,
+    Patient.is_police_case,
+    Bed.id.label("bed_id"),
+    Bed.bed_number,
+    Department.name.label("department_name"),
+    _Doctor.name.label("doctor_name"),
+    _Nurse.name.label("nurse_name"),
+)
+
+
+_USERS_BY_ID_STMT = select(User.id, User.name, User.role).where(
+    User.id.in_(bindparam("user_ids", expanding=True))
+)
+
+
+# Prebuilt per combination of optional filters (see alerts.py); bound
+# parameters: tenant_id, status, department, priority, search, offset, limit.
+
+@lru_cache(maxsize=None)
+def _patient_list_statements(by_status: bool, by_department: bool, by_priority: bool, by_search: bool):
+    """Patient list page statement and its matching count statement.
+
+    The page projects only the listed columns, with the related names
+    outer-joined in, and carries the filtered total as a window count over
+    the rows before LIMIT/OFFSET, so page and total are one round trip. The
+    count statement is only needed past the last page, where no row
+    carries that total.
+    """
+    filters = [
+        Patient.tenant_id == bindparam("tenant_id"),
+        Patient.deleted_at.is_(None)
+    ]
+    if by_status:
+        filters.append(Patient.status == bindparam("status"))
+    if by_department:
+        # Support filtering by department name or code (departments is
+        # outer-joined by both statements)
+        filters.append(or_(
+            Department.name == bindparam("department"),
+            Department.code == bindparam("department")
+        ))
+    if by_priority:
+        filters.append(Patient.priority == bindparam("priority"))
+    if by_search:
+        filters.append(or_(
+            Patient.name.ilike(bindparam("search")),
+            Patient.patient_id.ilike(bindparam("search"))
+        ))
+
+    page_stmt = (
+        select(*_PATIENT_LIST_COLUMNS, func.count().over().label("total_count"))
+        .outerjoin(Department, Department.id == Patient.department_id)
+        .outerjoin(Bed, Bed.id == Patient.bed_id)
+        .outerjoin(_Doctor, _Doctor.id == Patient.assigned_doctor_id)
+        .outerjoin(_Nurse, _Nurse.id == Patient.assigned_nurse_id)
+        .where(*filters)
+        .order_by(Patient.admitted_at.desc())
+        .offset(bindparam("offset"))
+        .limit(bindparam("limit"))
+    )
+    count_stmt = (
+        select(func.count(Patient.id))
+        .outerjoin(Department, Department.id == Patient.department_id)
+        .where(*filters)
     )
-    count = result.scalar() or 0
-    return f"P{str(count + 1).zfill(5)}"
+    return page_stmt, count_stmt
 
 
 @router.get("", response_model=PatientListResponse)
@@ -135,85 +239,58 @@ async def get_patients(
     department: Optional[str] = None,
     priority: Optional[int] = None,
     search: Optional[str] = None,
-    page: int = 1,
-    limit: int = 100,
+    page: int = Query(1, ge=1),
+    # Bounded so one request cannot pull (and encode) a whole tenant's history
+    limit: int = Query(100, ge=1, le=500),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Get all patients with filters."""
-    query = select(Patient).options(
-        selectinload(Patient.department),
-        selectinload(Patient.bed),
-        selectinload(Patient.assigned_doctor),
-        selectinload(Patient.assigned_nurse)
-    ).where(
-        Patient.tenant_id == current_user.tenant_id,
-        Patient.deleted_at.is_(None)
-    )
-
-    # Apply filters
-    if status and status != "all":
-        query = query.where(Patient.status == status)
-
-    if department:
-        # Support filtering by department name or code
-        query = query.join(Department).where(
-            or_(Department.name == department, Department.code == department)
-        )
-
-    if priority:
-        query = query.where(Patient.priority == priority)
-
-    if search:
-        query = query.where(
-            or_(
-                Patient.name.ilike(f"%{search}%"),
-                Patient.patient_id.ilike(f"%{search}%")
-            )
-        )
-
-    # Get total count using a clean separate query (avoids ORM subquery issues)
-    count_query = select(func.count(Patient.id)).where(
-        Patient.tenant_id == current_user.tenant_id,
-        Patient.deleted_at.is_(None)
+    page_stmt, count_stmt = _patient_list_statements(
+        bool(status and status != "all"), bool(department), bool(priority), bool(search)
     )
-    if status and status != "all":
-        count_query = count_query.where(Patient.status == status)
-    if department:
-        count_query = count_query.join(Department).where(
-            or_(Department.name == department, Department.code == department)
-        )
-    if priority:
-        count_query = count_query.where(Patient.priority == priority)
-    if search:
-        count_query = count_query.where(
-            or_(
-                Patient.name.ilike(f"%{search}%"),
-                Patient.patient_id.ilike(f"%{search}%")
-            )
-        )
-    count_result = await db.execute(count_query)
-    total = count_result.scalar() or 0
+    params = {
+        "tenant_id": current_user.tenant_id,
+        "status": status,
+        "department": department,
+        "priority": priority,
+        "search": f"%{search}%" if search else None,
+    }
 
-    # Apply pagination
     offset = (page - 1) * limit
-    query = query.offset(offset).limit(limit).order_by(Patient.admitted_at.desc())
-
-    result = await db.execute(query)
-    patients = result.scalars().all()
+    result = await db.execute(page_stmt, {**params, "offset": offset, "limit": limit})
+    patients = result.all()
+
+    if patients:
+        total = patients[0].total_count
+    elif offset:
+        # Past the last page: no row to carry the window count
+        total = await db.scalar(count_stmt, params) or 0
+    else:
+        total = 0
+
+    # Latest vitals and triage result of the whole page, one query each, then
+    # every user the page mentions (vitals recorders, admitting staff) in one more
+    latest_vitals_by_patient = {}
+    latest_triage_by_patient = {}
+    users_by_id = {}
+    if patients:
+        page_ids = {"patient_ids": [p.id for p in patients]}
+        vitals_result = await db.execute(_LATEST_VITALS_STMT, page_ids)
+        latest_vitals_by_patient = {v.patient_id: v for v in vitals_result}
+        triage_result = await db.execute(_LATEST_TRIAGE_STMT, page_ids)
+        latest_triage_by_patient = {t.patient_id: t for t in triage_result}
+
+        user_ids = {v.recorded_by for v in latest_vitals_by_patient.values() if v.recorded_by}
+        user_ids.update(p.admitted_by for p in patients if p.admitted_by)
+        if user_ids:
+            users_result = await db.execute(_USERS_BY_ID_STMT, {"user_ids": list(user_ids)})
+            users_by_id = {u.id: u for u in users_result}
 
     # Format response
     patients_data = []
     for patient in patients:
-        # Get ALL vitals for this patient and pick the latest in Python.
-        # This avoids SQL text-ordering bugs (the recorded_at column is String,
-        # not DateTime, so different formats sort incorrectly in SQL).
-        vitals_result = await db.execute(
-            select(PatientVitals)
-            .where(PatientVitals.patient_id == patient.id)
-        )
-        all_vitals = vitals_result.scalars().all()
-        latest_vitals = max(all_vitals, key=lambda v: _parse_ts(v.recorded_at)) if all_vitals else None
+        latest_vitals = latest_vitals_by_patient.get(patient.id)
 
         vitals_data = None
         last_updated_by = None
@@ -227,31 +304,18 @@ async def get_patients(
                 "recordedAt": _to_iso(latest_vitals.recorded_at),
                 "source": latest_vitals.source
             }
-            # Get the user who recorded vitals
-            if latest_vitals.recorded_by:
-                recorder_result = await db.execute(
-                    select(User).where(User.id == latest_vitals.recorded_by)
-                )
-                recorder = recorder_result.scalar_one_or_none()
-                if recorder:
-                    last_updated_by = {
-                        "id": str(recorder.id),
-                        "name": recorder.name,
-                        "role": recorder.role,
-                        "time": _to_iso(latest_vitals.recorded_at)
-                    }
-
-        # Get latest triage result for reasoning
-        # Sort by applied_at (always set explicitly in Python UTC ISO format)
-        # instead of created_at (server_default with unreliable timezone)
-        triage_result = await db.execute(
-            select(AITriageResult)
-            .where(AITriageResult.patient_id == patient.id)
-        )
-        all_triage_for_patient = triage_result.scalars().all()
-        latest_triage = None
-        if all_triage_for_patient:
-            latest_triage = max(all_triage_for_patient, key=lambda t: t.applied_at or '')
+            # The user who recorded vitals
+            recorder = users_by_id.get(latest_vitals.recorded_by)
+            if recorder:
+                last_updated_by = {
+                    "id": recorder.id,
+                    "name": recorder.name,
+                    "role": recorder.role,
+                    "time": _to_iso(latest_vitals.recorded_at)
+                }
+
+        # Latest triage result for reasoning
+        latest_triage = latest_triage_by_patient.get(patient.id)
 
         triage_data = None
         if latest_triage:
@@ -263,21 +327,18 @@ async def get_patients(
             }
 
         # Fallback to admitted_by if no vitals recorded
-        if not last_updated_by and patient.admitted_by:
-            admitted_by_result = await db.execute(
-                select(User).where(User.id == patient.admitted_by)
-            )
-            admitted_by_user = admitted_by_result.scalar_one_or_none()
+        if not last_updated_by:
+            admitted_by_user = users_by_id.get(patient.admitted_by)
             if admitted_by_user:
                 last_updated_by = {
-                    "id": str(admitted_by_user.id),
+                    "id": admitted_by_user.id,
                     "name": admitted_by_user.name,
                     "role": admitted_by_user.role,
                     "time": _to_iso(patient.admitted_at)
                 }
 
         patients_data.append({
-            "id": str(patient.id),
+            "id": patient.id,
             "patientId": patient.patient_id,
             "name": patient.name,
             "age": patient.age,
@@ -289,20 +350,22 @@ async def get_patients(
             "priorityLabel": patient.priority_label,
             "priorityColor": patient.priority_color,
             "status": patient.status,
-            "bed": patient.bed.bed_number if patient.bed else None,
-            "bedId": str(patient.bed.id) if patient.bed else None,
-            "department": patient.department.name if patient.department else None,
+            "bed": patient.bed_number,
+            "bedId": patient.bed_id,
+            "department": patient.department_name,
             "admittedAt": _to_iso(patient.admitted_at),
-            "assignedDoctor": patient.assigned_doctor.name if patient.assigned_doctor else None,
-            "assignedNurse": patient.assigned_nurse.name if patient.assigned_nurse else None,
+            "assignedDoctor": patient.doctor_name,
+            "assignedNurse": patient.nurse_name,
             "lastUpdatedBy": last_updated_by,
-            "photo": patient.photo_url,
+            "photo": upload_url(patient.photo_url),
             "vitals": vitals_data,
             "triage": triage_data,
             "isPoliceCase": patient.is_police_case
         })
 
-    return {
+    # Encoded here rather than by the response model: orjson writes the UUIDs
+    # directly and the response skips FastAPI's jsonable_encoder pass
+    return Response(content=orjson.dumps({
         "success": True,
         "data": {
             "patients": patients_data,
@@ -313,7 +376,31 @@ async def get_patients(
                 "totalPages": (total + limit - 1) // limit
             }
         }
-    }
+    }), media_type="application/json")
+
+
+# Patient with its many-to-one relations joined and allergens aggregated
+# into an array, so the detail view is a single round trip
+_PATIENT_DETAIL_STMT = (
+    select(
+        Patient,
+        select(func.array_agg(PatientAllergy.allergen))
+        .where(PatientAllergy.patient_id == Patient.id)
+        .scalar_subquery()
+        .label("allergens")
+    )
+    .options(
+        joinedload(Patient.department),
+        joinedload(Patient.assigned_doctor),
+        joinedload(Patient.assigned_nurse),
+        joinedload(Patient.bed)
+    )
+    .where(
+        Patient.id == bindparam("patient_id"),
+        Patient.tenant_id == bindparam("tenant_id"),
+        Patient.deleted_at.is_(None)
+    )
+)
 
 
 @router.get("/{patient_id}", response_model=dict)
@@ -323,38 +410,21 @@ async def get_patient(
     db: AsyncSession = Depends(get_db)
 ):
     """Get single patient details."""
-    result = await db.execute(
-        select(Patient)
-        .options(
-            selectinload(Patient.department),
-            selectinload(Patient.assigned_doctor),
-            selectinload(Patient.assigned_nurse),
-            selectinload(Patient.bed)
-        )
-        .where(
-            Patient.id == patient_id,
-            Patient.tenant_id == current_user.tenant_id,
-            Patient.deleted_at.is_(None)
-        )
-    )
-    patient = result.scalar_one_or_none()
+    result = await db.execute(_PATIENT_DETAIL_STMT, {"patient_id": patient_id, "tenant_id": current_user.tenant_id})
+    row = result.one_or_none()
 
-    if not patient:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Patient not found"
         )
+    patient = row.Patient
+    allergies = row.allergens or []
 
-    # Get allergies
-    allergies_result = await db.execute(
-        select(PatientAllergy).where(PatientAllergy.patient_id == patient.id)
-    )
-    allergies = [a.allergen for a in allergies_result.scalars().all()]
-
-    return {
+    return Response(content=orjson.dumps({
         "success": True,
         "data": {
-            "id": str(patient.id),
+            "id": patient.id,
             "patientId": patient.patient_id,
             "name": patient.name,
             "age": patient.age,
@@ -372,46 +442,53 @@ async def get_patient(
             "department": patient.department.name if patient.department else None,
             "admittedAt": _to_iso(patient.admitted_at),
             "assignedDoctor": {
-                "id": str(patient.assigned_doctor.id),
+                "id": patient.assigned_doctor.id,
                 "name": patient.assigned_doctor.name
             } if patient.assigned_doctor else None,
             "assignedNurse": {
-                "id": str(patient.assigned_nurse.id),
+                "id": patient.assigned_nurse.id,
                 "name": patient.assigned_nurse.name
             } if patient.assigned_nurse else None,
-            "photo": patient.photo_url,
+            "photo": upload_url(patient.photo_url),
             "isPoliceCase": patient.is_police_case,
             "policeCaseType": patient.police_case_type
         }
-    }
+    }), media_type="application/json")
 
 
 @router.post("", response_model=dict, status_code=status.HTTP_201_CREATED)
 async def create_patient(
     request: PatientCreate,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    triage_service: TriageService = Depends(get_triage_service)
 ):
     """Register new patient (New ER Arrival)."""
-    # Generate patient ID
-    patient_id = await generate_patient_id(db, current_user.tenant_id)
-
     # Handle doctor assignment
     assigned_doctor_id = request.assigned_doctor_id
     resolved_department_id = request.department_id or current_user.department_id
 
     # If department is known but no doctor, auto-assign the best-fit doctor
     if resolved_department_id and not assigned_doctor_id:
-        # 1. Find active doctors in the department
-        doctor_query = select(User).where(
-            User.tenant_id == current_user.tenant_id,
-            User.department_id == resolved_department_id,
-            User.role == "doctor",
-            User.status == "active",
-            User.deleted_at.is_(None)
+        # 1. Find active doctors in the department with their open patient load
+        doctor_query = (
+            select(User.id, User.specialization, func.count(Patient.id).label("load"))
+            .outerjoin(Patient, and_(
+                Patient.assigned_doctor_id == User.id,
+                Patient.status.in_(["pending_triage", "admitted", "active"]),
+                Patient.deleted_at.is_(None)
+            ))
+            .where(
+                User.tenant_id == current_user.tenant_id,
+                User.department_id == resolved_department_id,
+                User.role == "doctor",
+                User.status == "active",
+                User.deleted_at.is_(None)
+            )
+            .group_by(User.id)
         )
         doctor_result = await db.execute(doctor_query)
-        dept_doctors = doctor_result.scalars().all()
+        dept_doctors = doctor_result.all()
 
         # If no doctors in this department, skip auto-assignment
         # (do NOT search other departments — patient must stay in their department)
@@ -452,20 +529,12 @@ async def create_patient(
                         return 5  # Moderate match
                 return 0
 
-            # 4. Get workloads and compute composite score (specialization match + low workload)
+            # 4. Compute composite score (specialization match + low workload)
             doctor_scores = []
             for doctor in dept_doctors:
-                count_result = await db.execute(
-                    select(func.count(Patient.id)).where(
-                        Patient.assigned_doctor_id == doctor.id,
-                        Patient.status.in_(["pending_triage", "admitted", "active"]),
-                        Patient.deleted_at.is_(None)
-                    )
-                )
-                patient_count = count_result.scalar() or 0
                 match_score = specialization_score(doctor, complaint_lower)
                 # Composite: prioritize specialization match, then least workload
-                doctor_scores.append((doctor.id, match_score, patient_count))
+                doctor_scores.append((doctor.id, match_score, doctor.load))
 
             # Sort: highest match score first, then lowest workload
             doctor_scores.sort(key=lambda x: (-x[1], x[2]))
@@ -488,6 +557,30 @@ async def create_patient(
                 detail=f"Active patient with this phone number already exists: {existing.name} (ID: {existing.patient_id})"
             )
 
+    # Run AI Triage automatically. It only needs the request data, so it runs
+    # before any write: nothing is locked while waiting on the LLM.
+    vitals_dict = None
+    if request.vitals:
+        vitals_dict = {
+            "hr": request.vitals.hr,
+            "bp": request.vitals.bp,
+            "spo2": request.vitals.spo2,
+            "temp": request.vitals.temp
+        }
+    triage_result = await triage_service.run_triage(
+        complaint=request.complaint,
+        age=request.age,
+        gender=request.gender,
+        vitals=vitals_dict,
+        history=request.history
+    )
+
+    # Generate patient ID (locks the tenant's counter row until commit)
+    patient_id = await generate_patient_id(db, current_user.tenant_id)
+
+    # One timestamp for admission, initial vitals, triage and bed assignment
+    now = datetime.utcnow()
+
     # Create patient
     patient = Patient(
         tenant_id=current_user.tenant_id,
@@ -506,16 +599,14 @@ async def create_patient(
         department_id=resolved_department_id,
         assigned_doctor_id=assigned_doctor_id,
         status="pending_triage",
-        admitted_at=datetime.utcnow(),
+        admitted_at=now,
         admitted_by=current_user.id
     )
     db.add(patient)
     await db.flush()
 
     # Add initial vitals if provided
-    vitals_dict = None
     if request.vitals:
-        initial_vitals_ts = datetime.utcnow()
         vitals = PatientVitals(
             patient_id=patient.id,
             heart_rate=int(request.vitals.hr) if request.vitals.hr else None,
@@ -524,27 +615,11 @@ async def create_patient(
             temperature=float(request.vitals.temp) if request.vitals.temp else None,
             respiratory_rate=int(request.vitals.rr) if hasattr(request.vitals, 'rr') and request.vitals.rr else None,
             recorded_by=current_user.id,
-            recorded_at=initial_vitals_ts,
-            created_at=initial_vitals_ts,
+            recorded_at=now,
+            created_at=now,
             source="manual"
         )
         db.add(vitals)
-        vitals_dict = {
-            "hr": request.vitals.hr,
-            "bp": request.vitals.bp,
-            "spo2": request.vitals.spo2,
-            "temp": request.vitals.temp
-        }
-
-    # Run AI Triage automatically
-    triage_service = TriageService()
-    triage_result = await triage_service.run_triage(
-        complaint=request.complaint,
-        age=request.age,
-        gender=request.gender,
-        vitals=vitals_dict,
-        history=request.history
-    )
 
     # Update patient with triage results (L1-L4 priority)
     patient.priority = triage_result.get("priority")
@@ -577,9 +652,9 @@ async def create_patient(
         processing_time_ms=triage_result.get("processing_time_ms"),
         temperature=triage_result.get("temperature"),
         is_applied=True,
-        applied_at=datetime.utcnow(),
+        applied_at=now,
         applied_by=current_user.id,
-        created_at=datetime.utcnow()
+        created_at=now
     )
     db.add(triage_record)
 
@@ -623,7 +698,7 @@ async def create_patient(
     if assigned_bed:
         assigned_bed.status = "occupied"
         assigned_bed.current_patient_id = patient.id
-        assigned_bed.assigned_at = datetime.utcnow()
+        assigned_bed.assigned_at = now
         patient.bed_id = assigned_bed.id
 
         # If overflow landed the patient in a different department than the
@@ -669,9 +744,9 @@ async def create_patient(
         patient_id=patient.id,
         triggered_by="patient_registration"
     )
-    await db.commit()
+    await db.flush()
 
-    # Reload patient with relationships
+    # Reload patient with relationships, inside the transaction
     result = await db.execute(
         select(Patient).options(
             selectinload(Patient.department),
@@ -680,6 +755,7 @@ async def create_patient(
         ).where(Patient.id == patient.id)
     )
     patient = result.scalar_one()
+    await db.commit()
 
     return {
         "success": True,
@@ -711,7 +787,8 @@ async def update_patient(
     patient_id: UUID,
     request: PatientUpdate,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    triage_service: TriageService = Depends(get_triage_service)
 ):
     """Update patient details."""
     result = await db.execute(
@@ -751,13 +828,10 @@ async def update_patient(
     triage_data = None
     if triage_fields_changed:
         try:
-            # Fetch latest vitals
-            vitals_result = await db.execute(
-                select(PatientVitals).where(
-                    PatientVitals.patient_id == patient_obj_id
-                ).order_by(PatientVitals.created_at.desc()).limit(1)
+            # Latest vitals only (walks the (patient_id, recorded_at DESC) index)
+            latest_vitals = await db.scalar(
+                _PATIENT_LATEST_VITALS_STMT, {"patient_id": patient_obj_id}
             )
-            latest_vitals = vitals_result.scalar_one_or_none()
             vitals_dict = {}
             if latest_vitals:
                 vitals_dict = {
@@ -784,7 +858,6 @@ async def update_patient(
                     parts.append(rx.frequency)
                 treatments.append(" - ".join(parts))
 
-            triage_service = TriageService()
             triage_result = await triage_service.run_triage(
                 complaint=patient.complaint,
                 age=patient.age,
@@ -800,6 +873,7 @@ async def update_patient(
             patient.priority_color = triage_result.get("priority_color")
 
             # Store triage result
+            now = datetime.utcnow()
             triage_record = AITriageResult(
                 tenant_id=tenant_id,
                 patient_id=patient_obj_id,
@@ -824,9 +898,9 @@ async def update_patient(
                 processing_time_ms=triage_result.get("processing_time_ms"),
                 temperature=triage_result.get("temperature"),
                 is_applied=True,
-                applied_at=datetime.utcnow(),
+                applied_at=now,
                 applied_by=current_user.id,
-                created_at=datetime.utcnow()
+                created_at=now
             )
             db.add(triage_record)
             await db.commit()
@@ -836,9 +910,8 @@ async def update_patient(
                 "priorityLabel": triage_result.get("priority_label"),
                 "reasoning": triage_result.get("reasoning"),
             }
-        except Exception as e:
-            import logging
-            logging.getLogger(__name__).warning(f"Auto re-triage after patient edit failed for {patient_id}: {e}")
+        except Exception:
+            logger.warning("Auto re-triage after patient edit failed for %s", patient_id, exc_info=True)
 
     return {
         "success": True,
@@ -852,6 +925,14 @@ async def update_patient(
     }
 
 
+_PHOTO_EXTENSIONS = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/webp": ".webp",
+    "image/gif": ".gif",
+}
+
+
 @router.post("/{patient_id}/photo", response_model=dict)
 async def upload_patient_photo(
     patient_id: UUID,
@@ -874,19 +955,34 @@ async def upload_patient_photo(
             detail="Patient not found"
         )
 
-    # Read file and store as base64 data URL
-    contents = await file.read()
     content_type = file.content_type or "image/jpeg"
-    b64_data = base64.b64encode(contents).decode("utf-8")
-    photo_url = f"data:{content_type};base64,{b64_data}"
-    patient.photo_url = photo_url
+    extension = _PHOTO_EXTENSIONS.get(content_type)
+    if not extension:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Photo must be a JPEG, PNG, WebP or GIF image"
+        )
+
+    # The body is already spooled to a temp file (in memory only up to 1 MB)
+    # and store_upload copies it on in chunks, so only the size needs a bound
+    if file.size is not None and file.size > settings.UPLOAD_MAX_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Photo must be at most {settings.UPLOAD_MAX_BYTES // (1024 * 1024)} MB"
+        )
+
+    # Store the file in private object storage and keep only its key on the
+    # patient; responses hand out short-lived signed URLs via upload_url()
+    key = f"patients/{current_user.tenant_id}/{patient.id}/photo{extension}"
+    await store_upload(key, file.file, content_type)
+    patient.photo_url = key
 
     await db.commit()
 
     return {
         "success": True,
         "data": {
-            "photoUrl": photo_url
+            "photoUrl": upload_url(key)
         }
     }
 
@@ -923,14 +1019,7 @@ async def discharge_patient(
 
     # Release bed if assigned — mark as available immediately
     if patient.bed_id:
-        bed_result = await db.execute(
-            select(Bed).where(Bed.id == patient.bed_id)
-        )
-        bed = bed_result.scalar_one_or_none()
-        if bed:
-            bed.status = "available"
-            bed.current_patient_id = None
-            bed.assigned_at = None
+        await _release_bed(db, patient.bed_id)
         patient.bed_id = None
 
     # Add discharge prescriptions
@@ -1015,14 +1104,7 @@ async def transfer_patient_to_opd(
 
         # Release bed if assigned — make available immediately
         if patient.bed_id:
-            bed_result = await db.execute(
-                select(Bed).where(Bed.id == patient.bed_id)
-            )
-            bed = bed_result.scalar_one_or_none()
-            if bed:
-                bed.status = "available"
-                bed.current_patient_id = None
-                bed.assigned_at = None
+            await _release_bed(db, patient.bed_id)
             patient.bed_id = None
 
         # Update patient department and status
@@ -1069,7 +1151,8 @@ async def transfer_patient_to_opd(
 async def run_patient_triage(
     patient_id: UUID,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    triage_service: TriageService = Depends(get_triage_service)
 ):
     """Run or re-run AI triage on a patient."""
     result = await db.execute(
@@ -1087,13 +1170,8 @@ async def run_patient_triage(
             detail="Patient not found"
         )
 
-    # Get latest vitals — fetch all and pick latest in Python
-    vitals_result = await db.execute(
-        select(PatientVitals)
-        .where(PatientVitals.patient_id == patient.id)
-    )
-    all_vitals = vitals_result.scalars().all()
-    latest_vitals = max(all_vitals, key=lambda v: _parse_ts(v.recorded_at)) if all_vitals else None
+    # Latest vitals only (walks the (patient_id, recorded_at DESC) index)
+    latest_vitals = await db.scalar(_PATIENT_LATEST_VITALS_STMT, {"patient_id": patient.id})
 
     vitals_dict = None
     if latest_vitals:
@@ -1105,7 +1183,6 @@ async def run_patient_triage(
         }
 
     # Run AI Triage
-    triage_service = TriageService()
     triage_result = await triage_service.run_triage(
         complaint=patient.complaint,
         age=patient.age,
@@ -1122,6 +1199,7 @@ async def run_patient_triage(
         patient.status = "active"
 
     # Store triage result
+    now = datetime.utcnow()
     triage_record = AITriageResult(
         tenant_id=current_user.tenant_id,
         patient_id=patient.id,
@@ -1146,9 +1224,9 @@ async def run_patient_triage(
         processing_time_ms=triage_result.get("processing_time_ms"),
         temperature=triage_result.get("temperature"),
         is_applied=True,
-        applied_at=datetime.utcnow(),
+        applied_at=now,
         applied_by=current_user.id,
-        created_at=datetime.utcnow()
+        created_at=now
     )
     db.add(triage_record)
 
@@ -1177,12 +1255,17 @@ async def run_patient_triage(
 @router.post("/batch-triage", response_model=dict)
 async def batch_triage_patients(
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    triage_service: TriageService = Depends(get_triage_service)
 ):
     """Run AI triage on all patients without proper triage (priority is null or not 1-4)."""
-    # Find patients without proper triage
+    # Find patients without proper triage (only the triage inputs; rows are
+    # written back in bulk below, so no ORM instances are needed)
     result = await db.execute(
-        select(Patient).where(
+        select(
+            Patient.id, Patient.complaint, Patient.age, Patient.gender,
+            Patient.history, Patient.status
+        ).where(
             Patient.tenant_id == current_user.tenant_id,
             Patient.deleted_at.is_(None),
             Patient.status != "discharged",
@@ -1193,47 +1276,57 @@ async def batch_triage_patients(
             )
         )
     )
-    patients = result.scalars().all()
-
-    triaged_count = 0
-    triage_service = TriageService()
+    patients = result.all()
 
-    for patient in patients:
-        # Get latest vitals — fetch all and pick latest in Python
+    # Latest vitals of every patient in the batch in one query
+    latest_vitals_by_patient = {}
+    if patients:
         vitals_result = await db.execute(
-            select(PatientVitals)
-            .where(PatientVitals.patient_id == patient.id)
+            _LATEST_VITALS_STMT, {"patient_ids": [p.id for p in patients]}
         )
-        all_vitals = vitals_result.scalars().all()
-        latest_vitals = max(all_vitals, key=lambda v: _parse_ts(v.recorded_at)) if all_vitals else None
+        latest_vitals_by_patient = {v.patient_id: v for v in vitals_result}
 
-        vitals_dict = None
-        if latest_vitals:
-            vitals_dict = {
-                "hr": str(latest_vitals.heart_rate) if latest_vitals.heart_rate else None,
-                "bp": latest_vitals.blood_pressure,
-                "spo2": str(latest_vitals.spo2) if latest_vitals.spo2 else None,
-                "temp": str(latest_vitals.temperature) if latest_vitals.temperature else None
-            }
+    vitals_inputs = {}
+    for patient_id, latest_vitals in latest_vitals_by_patient.items():
+        vitals_inputs[patient_id] = {
+            "hr": str(latest_vitals.heart_rate) if latest_vitals.heart_rate else None,
+            "bp": latest_vitals.blood_pressure,
+            "spo2": str(latest_vitals.spo2) if latest_vitals.spo2 else None,
+            "temp": str(latest_vitals.temperature) if latest_vitals.temperature else None
+        }
 
-        # Run AI Triage
-        triage_result = await triage_service.run_triage(
-            complaint=patient.complaint or "General checkup",
-            age=patient.age,
-            gender=patient.gender,
-            vitals=vitals_dict,
-            history=patient.history
-        )
+    # Run AI Triage concurrently, bounded to stay within the Groq rate limits
+    semaphore = asyncio.Semaphore(settings.GROQ_MAX_CONCURRENCY)
+
+    async def _triage(patient):
+        async with semaphore:
+            return await triage_service.run_triage(
+                complaint=patient.complaint or "General checkup",
+                age=patient.age,
+                gender=patient.gender,
+                vitals=vitals_inputs.get(patient.id),
+                history=patient.history
+            )
+
+    triage_results = await asyncio.gather(*(_triage(p) for p in patients))
+
+    now = datetime.utcnow()
+    patient_updates = []
+    triage_rows = []
+    for patient, triage_result in zip(patients, triage_results):
+        vitals_dict = vitals_inputs.get(patient.id)
 
         # Update patient with triage results
-        patient.priority = triage_result.get("priority")
-        patient.priority_label = triage_result.get("priority_label")
-        patient.priority_color = triage_result.get("priority_color")
-        if patient.status == "pending_triage":
-            patient.status = "active"
+        patient_updates.append({
+            "id": patient.id,
+            "priority": triage_result.get("priority"),
+            "priority_label": triage_result.get("priority_label"),
+            "priority_color": triage_result.get("priority_color"),
+            "status": "active" if patient.status == "pending_triage" else patient.status,
+        })
 
         # Store triage result
-        triage_record = AITriageResult(
+        triage_rows.append(dict(
             tenant_id=current_user.tenant_id,
             patient_id=patient.id,
             input_complaint=patient.complaint,
@@ -1252,14 +1345,17 @@ async def batch_triage_patients(
             groq_model=triage_result.get("groq_model"),
             processing_time_ms=triage_result.get("processing_time_ms"),
             is_applied=True,
-            applied_at=datetime.utcnow(),
+            applied_at=now,
             applied_by=current_user.id,
-            created_at=datetime.utcnow()
-        )
-        db.add(triage_record)
-        triaged_count += 1
+            created_at=now
+        ))
 
+    # One bulk UPDATE by primary key and one multi-row INSERT for the batch
+    if patient_updates:
+        await db.execute(update(Patient), patient_updates)
+        await db.execute(insert(AITriageResult), triage_rows)
     await db.commit()
+    triaged_count = len(triage_rows)
 
     return {
         "success": True,
@@ -1289,32 +1385,26 @@ async def get_patient_vitals_history(
     if not patient:
         raise HTTPException(status_code=404, detail="Patient not found")
 
-    # Get all vitals, sorted in Python to avoid text-column ordering bugs
+    # Newest first; recorded_at is timestamptz, so SQL orders it correctly.
+    # Recorders come in one IN (...) query over the distinct user ids.
     vitals_result = await db.execute(
         select(PatientVitals)
+        .options(selectinload(PatientVitals.recorded_by_user))
         .where(PatientVitals.patient_id == patient_id)
+        .order_by(PatientVitals.recorded_at.desc())
     )
-    vitals_list = sorted(
-        vitals_result.scalars().all(),
-        key=lambda v: _parse_ts(v.recorded_at),
-        reverse=True
-    )
+    vitals_list = vitals_result.scalars().all()
 
     vitals_data = []
     for vitals in vitals_list:
-        # Get recorder info
         recorder = None
-        if vitals.recorded_by:
-            recorder_result = await db.execute(
-                select(User).where(User.id == vitals.recorded_by)
-            )
-            recorder_user = recorder_result.scalar_one_or_none()
-            if recorder_user:
-                recorder = {
-                    "id": str(recorder_user.id),
-                    "name": recorder_user.name,
-                    "role": recorder_user.role
-                }
+        recorder_user = vitals.recorded_by_user
+        if recorder_user:
+            recorder = {
+                "id": str(recorder_user.id),
+                "name": recorder_user.name,
+                "role": recorder_user.role
+            }
 
         vitals_data.append({
             "id": str(vitals.id),
@@ -1341,7 +1431,8 @@ async def add_patient_vitals(
     patient_id: UUID,
     vitals_input: dict,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    triage_service: TriageService = Depends(get_triage_service)
 ):
     """Add new vitals for a patient."""
     # Verify patient exists
@@ -1447,7 +1538,6 @@ async def add_patient_vitals(
         except Exception:
             pass
 
-        triage_service = TriageService()
         triage_result = await triage_service.run_triage(
             complaint=patient_complaint,
             age=patient_age,
@@ -1492,9 +1582,9 @@ async def add_patient_vitals(
             processing_time_ms=triage_result.get("processing_time_ms"),
             temperature=triage_result.get("temperature"),
             is_applied=True,
-            applied_at=now_iso,
+            applied_at=now_ts,
             applied_by=current_user.id,
-            created_at=now_iso
+            created_at=now_ts
         )
         db.add(triage_record)
         await db.commit()
@@ -1507,9 +1597,8 @@ async def add_patient_vitals(
             "confidence": triage_result.get("confidence"),
             "estimatedWaitTime": triage_result.get("estimated_wait_time"),
         }
-    except Exception as e:
-        import logging
-        logging.getLogger(__name__).warning(f"Auto re-triage failed for patient {patient_id}: {e}")
+    except Exception:
+        logger.warning("Auto re-triage failed for patient %s", patient_id, exc_info=True)
 
     # Alert: Vitals recorded and triage updated
     try:
@@ -1553,7 +1642,7 @@ async def add_patient_vitals(
                 "spo2": float(vitals.spo2) if vitals.spo2 else None,
                 "temp": float(vitals.temperature) if vitals.temperature else None,
                 "rr": vitals.respiratory_rate,
-                "recordedAt": now_iso,
+                "recordedAt": _to_iso(now_ts),
                 "source": vitals.source
             },
             "recordedBy": {
@@ -1585,15 +1674,13 @@ async def get_patient_triage_timeline(
     if not patient:
         raise HTTPException(status_code=404, detail="Patient not found")
 
-    # Get all triage results and sort by applied_at (always Python UTC ISO)
+    # Oldest-first so we can compute fromPriority transitions
     triage_result = await db.execute(
         select(AITriageResult)
         .where(AITriageResult.patient_id == patient_id)
+        .order_by(AITriageResult.applied_at.asc().nulls_first())
     )
-    all_triage = triage_result.scalars().all()
-
-    # Sort oldest-first so we can compute fromPriority transitions
-    triage_list = sorted(all_triage, key=lambda t: t.applied_at or '')
+    triage_list = triage_result.scalars().all()
 
     timeline_data = []
     prev_priority = None
@@ -1642,7 +1729,8 @@ async def recommend_triage_shift(
     patient_id: UUID,
     context: dict,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    triage_service: TriageService = Depends(get_triage_service)
 ):
     """Get LLM recommendation for shifting triage level based on current condition."""
     # Get patient with current triage
@@ -1657,13 +1745,8 @@ async def recommend_triage_shift(
     if not patient:
         raise HTTPException(status_code=404, detail="Patient not found")
 
-    # Get latest vitals — fetch all and pick latest in Python
-    vitals_result = await db.execute(
-        select(PatientVitals)
-        .where(PatientVitals.patient_id == patient.id)
-    )
-    all_vitals = vitals_result.scalars().all()
-    latest_vitals = max(all_vitals, key=lambda v: _parse_ts(v.recorded_at)) if all_vitals else None
+    # Latest vitals only (walks the (patient_id, recorded_at DESC) index)
+    latest_vitals = await db.scalar(_PATIENT_LATEST_VITALS_STMT, {"patient_id": patient.id})
 
     vitals_dict = None
     if latest_vitals:
@@ -1674,9 +1757,6 @@ async def recommend_triage_shift(
             "temp": str(latest_vitals.temperature) if latest_vitals.temperature else None
         }
 
-    # Run triage with additional context about condition change
-    triage_service = TriageService()
-
     # Build context for re-evaluation
     additional_context = context.get("notes", "")
     procedure_done = context.get("procedure", "")
@@ -1695,6 +1775,7 @@ Additional Notes: {additional_context or 'None'}
 Please re-evaluate the triage level considering the above updates.
 """
 
+    # Run triage with additional context about condition change
     triage_result = await triage_service.run_triage(
         complaint=patient.complaint,
         age=patient.age,
@@ -1765,6 +1846,7 @@ async def shift_patient_triage(
     patient.priority_color = priority_colors[new_priority]
 
     # Create triage record for this shift
+    now = datetime.utcnow()
     triage_record = AITriageResult(
         tenant_id=current_user.tenant_id,
         patient_id=patient.id,
@@ -1779,9 +1861,9 @@ async def shift_patient_triage(
         confidence=shift_data.get("confidence"),
         estimated_wait_time=shift_data.get("estimatedWaitTime"),
         is_applied=True,
-        applied_at=datetime.utcnow(),
+        applied_at=now,
         applied_by=current_user.id,
-        created_at=datetime.utcnow()
+        created_at=now
     )
     db.add(triage_record)
 
@@ -19,7 +19,7 @@ from app.schemas.subscription import SubscriptionPlanCreate, SubscriptionPlanUpd
 from app.models.billing import Invoice
 from app.models.usage import UsageRecord
 from app.core.dependencies import require_platform_admin
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash_async
 from app.services.onboarding import onboard_hospital
 from app.services.usage_tracker import get_current_usage
 from app.services.billing import generate_invoice
@@ -506,7 +506,7 @@ async def invite_platform_admin(
         id=uuid_mod.uuid4(),
         tenant_id=None,
         email=email,
-        password_hash=get_password_hash(password),
+        password_hash=await get_password_hash_async(password),
         name=name,
         role="platform_admin",
         status="active",
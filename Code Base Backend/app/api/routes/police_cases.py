@@ -88,8 +88,6 @@ async def create_police_case(
     police_case.alert_id = alert.id
 
     await db.commit()
-    await db.refresh(police_case)
-
     return {
         "success": True,
         "data": {
@@ -4,6 +4,7 @@ from sqlalchemy import select
 from uuid import UUID
 from datetime import datetime
 from typing import Optional
+import logging
 
 from app.db.database import get_db
 from app.models.user import User
@@ -17,9 +18,11 @@ from app.schemas.prescription import (
 from app.schemas.common import SuccessResponse
 from app.core.dependencies import get_current_user, require_doctor
 from app.services.mcp import MCPService
-from app.services.triage import TriageService
+from app.services.triage import TriageService, get_triage_service
 from app.models.alert import Alert
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 
@@ -100,7 +103,8 @@ async def create_prescription(
     patient_id: UUID,
     request: PrescriptionCreate,
     current_user: User = Depends(require_doctor),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    triage_service: TriageService = Depends(get_triage_service)
 ):
     """Add prescription (doctor only)."""
     # Verify patient exists
@@ -156,11 +160,11 @@ async def create_prescription(
     # Auto re-triage with updated prescription context
     triage_data = None
     try:
-        # Fetch latest vitals
+        # Latest vitals (walks the (patient_id, recorded_at DESC) index)
         vitals_result = await db.execute(
             select(PatientVitals).where(
                 PatientVitals.patient_id == patient_obj_id
-            ).order_by(PatientVitals.created_at.desc()).limit(1)
+            ).order_by(PatientVitals.recorded_at.desc()).limit(1)
         )
         latest_vitals = vitals_result.scalar_one_or_none()
         vitals_dict = {}
@@ -191,7 +195,6 @@ async def create_prescription(
                 parts.append(f"via {rx.route}")
             treatments.append(" - ".join(parts))
 
-        triage_service = TriageService()
         triage_result = await triage_service.run_triage(
             complaint=patient_complaint,
             age=patient_age,
@@ -250,9 +253,8 @@ async def create_prescription(
             "confidence": triage_result.get("confidence"),
             "estimatedWaitTime": triage_result.get("estimated_wait_time"),
         }
-    except Exception as e:
-        import logging
-        logging.getLogger(__name__).warning(f"Auto re-triage after prescription failed for patient {patient_id}: {e}")
+    except Exception:
+        logger.warning("Auto re-triage after prescription failed for patient %s", patient_id, exc_info=True)
 
     # Alert: New prescription for nurses
     try:
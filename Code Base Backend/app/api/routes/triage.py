@@ -10,7 +10,7 @@ from app.models.patient import Patient
 from app.models.triage import AITriageResult
 from app.schemas.triage import TriageRequest, TriageResponse, QuickTriageRequest
 from app.core.dependencies import get_current_user
-from app.services.triage import TriageService
+from app.services.triage import TriageService, get_triage_service
 
 router = APIRouter()
 
@@ -19,11 +19,10 @@ router = APIRouter()
 async def quick_triage(
     request: QuickTriageRequest,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    triage_service: TriageService = Depends(get_triage_service)
 ):
     """Quick triage without patient registration (for assessment)."""
-    triage_service = TriageService()
-
     # Prepare vitals dict
     vitals_dict = None
     if request.vitals:
@@ -92,7 +91,8 @@ async def run_patient_triage(
     patient_id: UUID,
     request: TriageRequest,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    triage_service: TriageService = Depends(get_triage_service)
 ):
     """Run AI triage on patient."""
     # Get patient
@@ -111,8 +111,6 @@ async def run_patient_triage(
             detail="Patient not found"
         )
 
-    triage_service = TriageService()
-
     # Prepare vitals dict
     vitals_dict = None
     if request.vitals:
@@ -0,0 +1,29 @@
+"""Signed access to locally stored uploads (development storage backend)."""
+
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import FileResponse
+
+from app.core.config import settings
+from app.services.storage import local_upload_path
+
+router = APIRouter()
+
+
+@router.get("/{key:path}")
+async def get_upload(
+    key: str,
+    expires: int = Query(...),
+    signature: str = Query(...)
+):
+    """Serve a locally stored upload through a signed URL from `upload_url`.
+
+    The signature is only handed out in authenticated, tenant-checked
+    responses; S3 uploads use presigned S3 URLs instead of this route.
+    """
+    path = local_upload_path(key, expires, signature) if settings.UPLOAD_STORAGE == "local" else None
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload not found or link expired"
+        )
+    return FileResponse(path, headers={"Cache-Control": "private, max-age=300"})
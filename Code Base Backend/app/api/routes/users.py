@@ -15,7 +15,8 @@ from app.schemas.user import (
 )
 from app.schemas.common import SuccessResponse
 from app.core.dependencies import get_current_user
-from app.core.security import verify_password
+from app.core.security import verify_password_async
+from app.core.cache import cache_invalidate, tenant_prefix
 
 router = APIRouter()
 
@@ -60,8 +61,12 @@ async def update_current_user_profile(
     if request.department_id is not None:
         current_user.department_id = request.department_id
 
+    # Flush first so the department loads for the new department_id, and load
+    # it before the commit so it reuses the transaction's connection
+    await db.flush()
+    await db.refresh(current_user, attribute_names=["department"])
     await db.commit()
-    await db.refresh(current_user)
+    await cache_invalidate(tenant_prefix("staff", current_user.tenant_id))
 
     department_name = None
     if current_user.department:
@@ -93,6 +98,7 @@ async def upload_avatar(
     current_user.avatar_url = avatar_url
 
     await db.commit()
+    await cache_invalidate(tenant_prefix("staff", current_user.tenant_id))
 
     return {
         "success": True,
@@ -110,6 +116,7 @@ async def remove_avatar(
     """Remove profile photo."""
     current_user.avatar_url = None
     await db.commit()
+    await cache_invalidate(tenant_prefix("staff", current_user.tenant_id))
 
     return {"success": True, "message": "Avatar removed"}
 
@@ -129,14 +136,14 @@ async def get_user_settings(
         # Create default settings
         settings = UserSettings(user_id=current_user.id)
         db.add(settings)
-        await db.commit()
-        await db.refresh(settings)
+        await db.flush()
 
     # Check 2FA status
     twofa_result = await db.execute(
         select(UserTwoFactorAuth).where(UserTwoFactorAuth.user_id == current_user.id)
     )
     twofa = twofa_result.scalar_one_or_none()
+    await db.commit()
 
     return {
         "success": True,
@@ -177,7 +184,6 @@ async def update_user_settings(
             setattr(settings, field, value)
 
     await db.commit()
-    await db.refresh(settings)
 
     return {
         "success": True,
@@ -295,7 +301,7 @@ async def disable_2fa(
 ):
     """Disable two-factor authentication."""
     # Verify password
-    if not verify_password(password, current_user.password_hash):
+    if not await verify_password_async(password, current_user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid password"
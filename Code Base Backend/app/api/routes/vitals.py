@@ -5,6 +5,7 @@ from uuid import UUID
 from datetime import datetime
 from typing import Optional
 import base64
+import logging
 
 from app.db.database import get_db
 from app.models.user import User
@@ -14,7 +15,9 @@ from app.models.triage import AITriageResult
 from app.models.prescription import Prescription
 from app.schemas.vitals import VitalsCreate, VitalsResponse
 from app.core.dependencies import get_current_user, require_nurse_or_doctor
-from app.services.triage import TriageService
+from app.services.triage import TriageService, get_triage_service
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -169,7 +172,8 @@ async def record_vitals(
     patient_id: UUID,
     request: VitalsCreate,
     current_user: User = Depends(require_nurse_or_doctor),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    triage_service: TriageService = Depends(get_triage_service)
 ):
     """Record new vitals. Restricted to nurses and doctors."""
     # Verify patient exists
@@ -273,7 +277,6 @@ async def record_vitals(
         except Exception:
             pass  # Treatment fetch failure is non-blocking
 
-        triage_service = TriageService()
         triage_result = await triage_service.run_triage(
             complaint=patient_complaint,
             age=patient_age,
@@ -334,10 +337,8 @@ async def record_vitals(
             "confidence": triage_result.get("confidence"),
             "estimatedWaitTime": triage_result.get("estimated_wait_time"),
         }
-    except Exception as e:
-        import logging, traceback
-        logging.getLogger(__name__).warning(f"Auto re-triage failed for patient {patient_id}: {e}")
-        traceback.print_exc()
+    except Exception:
+        logger.warning("Auto re-triage failed for patient %s", patient_id, exc_info=True)
 
     return {
         "success": True,
@@ -362,7 +363,8 @@ async def record_vitals(
 async def extract_vitals_ocr(
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    triage_service: TriageService = Depends(get_triage_service)
 ):
     """Extract vitals from image using OCR."""
     # Read and encode image
@@ -370,7 +372,6 @@ async def extract_vitals_ocr(
     image_base64 = base64.b64encode(contents).decode()
 
     # Use triage service for OCR
-    triage_service = TriageService()
     result = await triage_service.extract_vitals_from_image(image_base64)
 
     return {
@@ -2,6 +2,8 @@ from .config import settings, get_settings
 from .security import (
     verify_password,
     get_password_hash,
+    verify_password_async,
+    get_password_hash_async,
     create_access_token,
     create_refresh_token,
     decode_token
@@ -12,6 +14,8 @@ __all__ = [
     "get_settings",
     "verify_password",
     "get_password_hash",
+    "verify_password_async",
+    "get_password_hash_async",
     "create_access_token",
     "create_refresh_token",
     "decode_token"
@@ -0,0 +1,147 @@
+"""
+Optional Redis-backed cache for read-mostly endpoints.
+
+Caching is enabled only when REDIS_URL is set and the `redis` package is
+installed. Otherwise every helper is a no-op and callers fall through to the
+database, so local development and tests need no Redis at all.
+
+Redis errors are logged and swallowed — a cache outage must never fail a
+request, it only costs the database round-trips the cache would have saved.
+"""
+
+import hashlib
+import logging
+from typing import Any, Optional
+
+import orjson
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+_client = None
+_client_ready = False
+
+
+def get_redis():
+    """Return the shared Redis client, or None when caching is disabled."""
+    global _client, _client_ready
+    if _client_ready:
+        return _client
+    _client_ready = True
+
+    if not settings.REDIS_URL:
+        return None
+    try:
+        import redis.asyncio as redis
+    except ImportError:
+        logger.warning("REDIS_URL is set but the redis package is not installed; caching disabled")
+        return None
+
+    _client = redis.from_url(settings.REDIS_URL)
+    return _client
+
+
+async def close_cache() -> None:
+    """Close the Redis connection pool (called on app shutdown)."""
+    global _client, _client_ready
+    if _client is not None:
+        await _client.aclose()
+    _client = None
+    _client_ready = False
+
+
+def tenant_prefix(namespace: str, tenant_id: Any) -> str:
+    """Key prefix shared by every cached entry of `namespace` for one tenant."""
+    return f"{namespace}:{tenant_id}:"
+
+
+def cache_key(prefix: str, **params: Any) -> str:
+    """Build a cache key from a namespace prefix and the request parameters."""
+    digest = hashlib.blake2b(
+        orjson.dumps(params, option=orjson.OPT_SORT_KEYS, default=str),
+        digest_size=16,
+    ).hexdigest()
+    return f"{prefix}:{digest}"
+
+
+async def cache_get_raw(key: str) -> Optional[bytes]:
+    """Return the raw bytes stored at `key`, or None on miss/disabled/error."""
+    client = get_redis()
+    if client is None:
+        return None
+    try:
+        return await client.get(key)
+    except Exception as exc:
+        logger.warning("cache get failed for %s: %s", key, exc)
+        return None
+
+
+async def cache_set_raw(key: str, payload: bytes, ttl: int) -> None:
+    """Store already-encoded bytes under `key` for `ttl` seconds."""
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        await client.set(key, payload, ex=ttl)
+    except Exception as exc:
+        logger.warning("cache set failed for %s: %s", key, exc)
+
+
+async def cache_get(key: str) -> Optional[Any]:
+    """Return the cached JSON value for `key`, or None on miss/disabled/error."""
+    raw = await cache_get_raw(key)
+    return orjson.loads(raw) if raw is not None else None
+
+
+async def cache_set(key: str, value: Any, ttl: int) -> None:
+    """Store `value` as JSON under `key` for `ttl` seconds.
+
+    orjson encodes UUIDs and datetimes natively; anything else falls back to str().
+    """
+    if get_redis() is None:
+        return
+    await cache_set_raw(key, orjson.dumps(value, default=str), ttl)
+
+
+async def cache_smembers(key: str) -> set[str]:
+    """Return the members of the Redis set at `key` (empty on miss/disabled/error)."""
+    client = get_redis()
+    if client is None:
+        return set()
+    try:
+        members = await client.smembers(key)
+    except Exception as exc:
+        logger.warning("cache smembers failed for %s: %s", key, exc)
+        return set()
+    return {m.decode() if isinstance(m, bytes) else m for m in members}
+
+
+async def cache_sadd(key: str, *members: Any, ttl: int) -> None:
+    """Add `members` to the Redis set at `key` and (re)set its TTL."""
+    client = get_redis()
+    if client is None or not members:
+        return
+    try:
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.sadd(key, *(str(m) for m in members))
+            pipe.expire(key, ttl)
+            await pipe.execute()
+    except Exception as exc:
+        logger.warning("cache sadd failed for %s: %s", key, exc)
+
+
+async def cache_invalidate(prefix: str) -> None:
+    """Delete every key under `prefix` (e.g. all cached staff lists of a tenant).
+
+    Uses SCAN rather than KEYS so a large keyspace never blocks Redis.
+    """
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        keys = [key async for key in client.scan_iter(match=f"{prefix}*", count=500)]
+        if keys:
+            await client.delete(*keys)
+    except Exception as exc:
+        logger.warning("cache invalidate failed for %s: %s", prefix, exc)
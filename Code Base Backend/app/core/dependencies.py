@@ -2,6 +2,7 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import joinedload
 from typing import Optional
 from uuid import UUID
 
@@ -55,19 +56,35 @@ async def get_current_user(
             detail="Invalid user ID in token"
         )
 
+    # Check that the token has not been EXPLICITLY revoked (logout marks
+    # is_active=False). Tokens with no session row are accepted: session
+    # writes during login / refresh-token are deliberately non-blocking, so
+    # a missing row means "storage hiccup", not "revoked". The token's own
+    # `exp` claim is the authoritative expiry.
+    # The check rides along with the user lookup so every authenticated
+    # request costs a single round-trip; the department is joined in the same
+    # statement so routes can read current_user.department without another.
+    revoked = select(UserSession.id).where(
+        UserSession.user_id == User.id,
+        UserSession.token_hash == hash_token(token),
+        UserSession.is_active == False
+    ).exists()
     result = await db.execute(
-        select(User).where(
+        select(User, revoked.label("revoked"))
+        .options(joinedload(User.department))
+        .where(
             User.id == user_uuid,
             User.deleted_at.is_(None)
         )
     )
-    user = result.scalar_one_or_none()
+    row = result.first()
 
-    if not user:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found"
         )
+    user = row[0]
 
     if user.status != "active":
         raise HTTPException(
@@ -75,20 +92,7 @@ async def get_current_user(
             detail="User account is not active"
         )
 
-    # Check that the token has not been EXPLICITLY revoked (logout marks
-    # is_active=False). Tokens with no session row are accepted: session
-    # writes during login / refresh-token are deliberately non-blocking, so
-    # a missing row means "storage hiccup", not "revoked". The token's own
-    # `exp` claim is the authoritative expiry.
-    token_hash = hash_token(token)
-    revoked_result = await db.execute(
-        select(UserSession.id).where(
-            UserSession.user_id == user_uuid,
-            UserSession.token_hash == token_hash,
-            UserSession.is_active == False
-        )
-    )
-    if revoked_result.scalar_one_or_none():
+    if row.revoked:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Session has been invalidated. Please log in again.",
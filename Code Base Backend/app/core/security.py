@@ -2,8 +2,13 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from jose import jwt, JWTError
 from passlib.context import CryptContext
+import asyncio
 import hashlib
+import os
 import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 from .config import settings
 
@@ -21,6 +26,29 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+# bcrypt is deliberately slow (tens of ms per call); running it inline in an
+# async handler stalls every other request on the event loop meanwhile. It
+# releases the GIL, so one thread per core runs hashes in parallel; a pool of
+# its own keeps a login burst from queueing ahead of other to_thread work.
+_bcrypt_executor = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 1, thread_name_prefix="bcrypt"
+)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the bcrypt worker pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _bcrypt_executor, verify_password, plain_password, hashed_password
+    )
+
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash on the bcrypt worker pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_bcrypt_executor, get_password_hash, password)
+
+
 def create_access_token(
     data: Dict[str, Any],
     expires_delta: Optional[timedelta] = None
@@ -73,19 +101,33 @@ def create_refresh_token(
     return encoded_jwt
 
 
-def decode_token(token: str) -> Optional[Dict[str, Any]]:
-    """Decode and verify a JWT token."""
+# Every authenticated request decodes the same access token again. The
+# signature check is memoized per token string; expiry is time-dependent, so
+# it is verified on each call instead of being cached with the payload.
+@lru_cache(maxsize=4096)
+def _verified_claims(token: str) -> Optional[Dict[str, Any]]:
     try:
-        payload = jwt.decode(
+        return jwt.decode(
             token,
             settings.JWT_SECRET_KEY,
-            algorithms=[settings.JWT_ALGORITHM]
+            algorithms=[settings.JWT_ALGORITHM],
+            options={"verify_exp": False}
         )
-        return payload
     except JWTError:
         return None
 
 
+def decode_token(token: str) -> Optional[Dict[str, Any]]:
+    """Decode and verify a JWT token."""
+    payload = _verified_claims(token)
+    if payload is None:
+        return None
+    exp = payload.get("exp")
+    if exp is not None and time.time() >= exp:
+        return None
+    return dict(payload)
+
+
 def hash_token(token: str) -> str:
     """Create a hash of a token for storage."""
     return hashlib.sha256(token.encode()).hexdigest()
@@ -3,17 +3,37 @@ from sqlalchemy.orm import declarative_base
 from sqlalchemy.pool import NullPool
 from sqlalchemy import text
 from typing import AsyncGenerator
+import asyncio
 
 from app.core.config import settings
 
 # Create async engine
 # statement_cache_size=0 required for Supabase transaction pooler (port 6543)
+connect_args = {"statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+if settings.DB_DISABLE_JIT:
+    connect_args["server_settings"] = {"jit": "off"}
+
+if settings.DB_POOL_SIZE > 0:
+    # Direct connection: keep warm connections (and their prepared statements).
+    # LIFO hands out the most recently used connection, so under light load
+    # the surplus idles out instead of every connection staying half-warm.
+    pool_args = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_pre_ping": True,
+        "pool_use_lifo": True,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+else:
+    # The external pooler owns pooling; a client-side pool would pin its connections
+    pool_args = {"poolclass": NullPool}
+
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,
-    poolclass=NullPool,
     future=True,
-    connect_args={"statement_cache_size": 0},
+    connect_args=connect_args,
+    **pool_args,
 )
 
 # Create async session maker
@@ -28,9 +48,27 @@ async_session_maker = async_sessionmaker(
 # Create base class for models
 Base = declarative_base()
 
+# Async follow-up work that (sync) session event hooks queue for after the
+# transaction commits, as zero-argument coroutine functions. get_db awaits
+# it before the response is sent; detached tasks could finish after the
+# client's next request, or never run once a Lambda invocation returns.
+AFTER_COMMIT_TASKS = "after_commit_tasks"
+
+
+async def run_after_commit_tasks(session: AsyncSession) -> None:
+    """Await the work queued in session.info[AFTER_COMMIT_TASKS]."""
+    for task in session.info.pop(AFTER_COMMIT_TASKS, None) or ():
+        await task()
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency to get database session."""
+    """Dependency to get database session.
+
+    The session holds a single connection from its first statement until the
+    transaction ends. With NullPool every statement issued after a commit
+    opens a fresh connection, so handlers should do their reads (refreshes,
+    reloads for the response) before committing, not after.
+    """
     async with async_session_maker() as session:
         try:
             yield session
@@ -39,7 +77,26 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.rollback()
             raise
         finally:
-            await session.close()
+            # Work committed by the handler (even if it failed afterwards)
+            await run_after_commit_tasks(session)
+
+
+async def warm_pool() -> None:
+    """Open the pool's base connections up front so early requests skip the connect.
+
+    No-op without a client-side pool (NullPool).
+    """
+    if settings.DB_POOL_SIZE <= 0:
+        return
+    # Check them all out at once so each is a distinct connection, then return them
+    results = await asyncio.gather(
+        *(engine.connect().start() for _ in range(settings.DB_POOL_SIZE)),
+        return_exceptions=True,
+    )
+    await asyncio.gather(*(r.close() for r in results if not isinstance(r, BaseException)))
+    for r in results:
+        if isinstance(r, BaseException):
+            raise r
 
 
 async def init_db():
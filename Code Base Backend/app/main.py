@@ -5,15 +5,20 @@ FastAPI application for Healthcare ER Management System
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
+import logging
 import time
 
 from sqlalchemy import text
 
 from app.core.config import settings
 from app.api import api_router
-from app.db.database import init_db, async_session_maker
+from app.db.database import init_db, warm_pool, async_session_maker
+from app.core.cache import close_cache
+
+logger = logging.getLogger(__name__)
 
 
 async def fix_patient_bed_department_mismatch():
@@ -33,7 +38,7 @@ async def fix_patient_bed_department_mismatch():
             else:
                 print("No patient bed/department mismatches found.")
     except Exception as e:
-        print(f"Warning: Could not fix bed/department mismatches: {e}")
+        logger.warning("Could not fix bed/department mismatches: %s", e)
 
 
 @asynccontextmanager
@@ -46,7 +51,7 @@ async def lifespan(app: FastAPI):
         await init_db()
         print("Database tables ready.")
     except Exception as e:
-        print(f"Warning: Could not init DB tables: {e}")
+        logger.warning("Could not init DB tables: %s", e)
     # Fix any patient bed/department mismatches from before the dept split
     await fix_patient_bed_department_mismatch()
     # Fix beds stuck in "cleaning" status — make them available
@@ -61,10 +66,15 @@ async def lifespan(app: FastAPI):
                 await db.commit()
                 print(f"Fixed {result.rowcount} bed(s) stuck in cleaning status.")
     except Exception as e:
-        print(f"Warning: Could not fix cleaning beds: {e}")
+        logger.warning("Could not fix cleaning beds: %s", e)
+    try:
+        await warm_pool()
+    except Exception as e:
+        logger.warning("Could not pre-warm the DB pool: %s", e)
     yield
     # Shutdown
     print(f"Shutting down {settings.APP_NAME}...")
+    await close_cache()
 
 
 # Create FastAPI application
@@ -75,6 +85,7 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -87,6 +98,10 @@ app.add_middleware(
     allow_headers=["Authorization", "Content-Type", "Accept", "X-Requested-With"],
 )
 
+# Compress JSON responses (alert/patient lists repeat the same keys per row);
+# small payloads are sent as-is, where gzip would cost more than it saves
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 
 # Security headers middleware
 @app.middleware("http")
@@ -117,7 +132,7 @@ async def add_process_time_header(request: Request, call_next):
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Global exception handler."""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "success": False,
@@ -1,11 +1,11 @@
-from .tenant import Tenant
+from .tenant import Tenant, TenantCounters
 from .user import User, UserSettings, UserTwoFactorAuth, UserSession, PasswordResetToken
 from .department import Department
 from .patient import Patient, PatientAllergy, PatientVitals, PatientNote
 from .triage import AITriageResult
 from .prescription import Prescription
 from .bed import Bed, BedAssignment
-from .alert import Alert, AlertHistory
+from .alert import Alert, AlertHistory, TenantAlertStats
 from .police_case import PoliceCase
 from .notification import Notification, SQSMessage
 from .file_upload import FileUpload
@@ -19,6 +19,7 @@ from .billing import Invoice, Payment
 __all__ = [
     # Tenant
     "Tenant",
+    "TenantCounters",
     # Subscription & Billing
     "SubscriptionPlan",
     "BedTypePricing",
@@ -48,6 +49,7 @@ __all__ = [
     # Alert
     "Alert",
     "AlertHistory",
+    "TenantAlertStats",
     # Police
     "PoliceCase",
     # Notification
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, ForeignKey, DateTime
+from sqlalchemy import Column, String, Text, ForeignKey, DateTime, Index, Integer, DDL, event, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY
 from sqlalchemy.orm import relationship
 import uuid
@@ -45,9 +45,23 @@ class Alert(Base, TimestampMixin):
     forwarded_by = Column(UUID(as_uuid=True), ForeignKey("users.id"))
     forward_notes = Column(Text)
 
+    __table_args__ = (
+        # Active-alert feed: newest open alerts of a tenant, with the recipient
+        # array-containment filters served by GIN indexes
+        Index(
+            "idx_alerts_active_created", "tenant_id", text("created_at DESC"),
+            postgresql_where=text("status IN ('unread', 'read')"),
+        ),
+        # Filtered alert list: status/priority filters with newest-first paging
+        Index("idx_alerts_status_created", "tenant_id", "status", text("created_at DESC")),
+        Index("idx_alerts_priority_status", "tenant_id", "priority", "status"),
+        Index("idx_alerts_for_roles", "for_roles", postgresql_using="gin"),
+        Index("idx_alerts_for_user_ids", "for_user_ids", postgresql_using="gin"),
+    )
+
     # Relationships
     tenant = relationship("Tenant", back_populates="alerts")
-    patient = relationship("Patient", back_populates="alerts")
+    patient = relationship("Patient", back_populates="alerts", lazy="joined")
     history = relationship("AlertHistory", back_populates="alert", lazy="dynamic", order_by="desc(AlertHistory.performed_at)")
 
     def __repr__(self):
@@ -69,3 +83,79 @@ class AlertHistory(Base):
 
     # Relationships
     alert = relationship("Alert", back_populates="history")
+
+
+class TenantAlertStats(Base):
+    """Per-tenant open-alert counters, maintained by a trigger on alerts."""
+    __tablename__ = "tenant_alert_stats"
+
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id", ondelete="CASCADE"), primary_key=True)
+    unread = Column(Integer, nullable=False, server_default="0")
+    critical_open = Column(Integer, nullable=False, server_default="0")
+
+
+# Row trigger keeping tenant_alert_stats in step with every write to alerts.
+# Updates that change neither status nor priority do not fire it. Mirrored in
+# alembic revision 0006 and scripts/database_schema.sql; installed here for
+# create_all (tests, the init_db fallback).
+ALERT_STATS_FUNCTION = """
+CREATE OR REPLACE FUNCTION apply_alert_stats()
+RETURNS TRIGGER AS $$
+DECLARE
+    tenant UUID;
+    unread_delta INTEGER := 0;
+    critical_delta INTEGER := 0;
+BEGIN
+    IF TG_OP <> 'DELETE' THEN
+        tenant := NEW.tenant_id;
+        IF NEW.status = 'unread' THEN
+            unread_delta := unread_delta + 1;
+        END IF;
+        IF NEW.priority = 'critical' AND NEW.status IN ('unread', 'read') THEN
+            critical_delta := critical_delta + 1;
+        END IF;
+    END IF;
+    IF TG_OP <> 'INSERT' THEN
+        tenant := OLD.tenant_id;
+        IF OLD.status = 'unread' THEN
+            unread_delta := unread_delta - 1;
+        END IF;
+        IF OLD.priority = 'critical' AND OLD.status IN ('unread', 'read') THEN
+            critical_delta := critical_delta - 1;
+        END IF;
+    END IF;
+
+    IF unread_delta = 0 AND critical_delta = 0 THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP = 'DELETE' THEN
+        -- No upsert: during a tenant cascade delete the tenant row is gone
+        UPDATE tenant_alert_stats
+        SET unread = unread + unread_delta,
+            critical_open = critical_open + critical_delta
+        WHERE tenant_id = tenant;
+    ELSE
+        INSERT INTO tenant_alert_stats AS s (tenant_id, unread, critical_open)
+        VALUES (tenant, unread_delta, critical_delta)
+        ON CONFLICT (tenant_id) DO UPDATE
+        SET unread = s.unread + EXCLUDED.unread,
+            critical_open = s.critical_open + EXCLUDED.critical_open;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+ALERT_STATS_TRIGGERS = [
+    "CREATE TRIGGER alerts_stats AFTER INSERT OR DELETE ON alerts "
+    "FOR EACH ROW EXECUTE FUNCTION apply_alert_stats()",
+    "CREATE TRIGGER alerts_stats_update AFTER UPDATE OF status, priority ON alerts "
+    "FOR EACH ROW WHEN (OLD.status IS DISTINCT FROM NEW.status "
+    "OR OLD.priority IS DISTINCT FROM NEW.priority) "
+    "EXECUTE FUNCTION apply_alert_stats()",
+]
+
+for _statement in [ALERT_STATS_FUNCTION, *ALERT_STATS_TRIGGERS]:
+    event.listen(
+        Alert.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql")
+    )
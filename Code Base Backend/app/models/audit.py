@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, ForeignKey, DateTime
+from sqlalchemy import Column, String, Text, ForeignKey, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB, INET
 import uuid
 
@@ -21,3 +21,8 @@ class AuditLog(Base):
     user_agent = Column(Text)
     lambda_request_id = Column(String(100))
     created_at = Column(DateTime(timezone=True), server_default="now()")
+
+    # Backs the tenant's newest-first audit log page
+    __table_args__ = (
+        Index("idx_audit_created", "tenant_id", created_at.desc()),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, ForeignKey, Text, DateTime
+from sqlalchemy import Column, String, Boolean, ForeignKey, Text, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID, ARRAY
 from sqlalchemy.orm import relationship
 import uuid
@@ -24,6 +24,12 @@ class Bed(Base, TimestampMixin):
     assigned_at = Column(DateTime(timezone=True))
     is_active = Column(Boolean, default=True)
 
+    # Bed board (active beds in bed_number order) and the status counts
+    __table_args__ = (
+        Index("idx_beds_active_number", "tenant_id", "is_active", "bed_number"),
+        Index("idx_beds_status_active", "tenant_id", "status", "is_active"),
+    )
+
     # Relationships
     tenant = relationship("Tenant", back_populates="beds")
     department = relationship("Department", back_populates="beds")
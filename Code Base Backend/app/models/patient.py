@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, Integer, Text, ForeignKey, Date, Numeric, DateTime
+from sqlalchemy import Column, String, Boolean, Integer, Text, ForeignKey, Date, Numeric, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 import uuid
@@ -64,9 +64,14 @@ class Patient(Base, TimestampMixin, SoftDeleteMixin):
     fhir_resource_id = Column(String(100))
     external_mrn = Column(String(50))
 
+    # The patient list filters by status and pages newest admission first
+    __table_args__ = (
+        Index("idx_patients_status_admitted", "tenant_id", "status", admitted_at.desc()),
+    )
+
     # Relationships
     tenant = relationship("Tenant", back_populates="patients")
-    department = relationship("Department", back_populates="patients")
+    department = relationship("Department", back_populates="patients", lazy="joined")
     bed = relationship("Bed", foreign_keys=[bed_id], uselist=False, overlaps="current_patient")
     assigned_doctor = relationship("User", foreign_keys=[assigned_doctor_id], back_populates="assigned_patients_as_doctor")
     assigned_nurse = relationship("User", foreign_keys=[assigned_nurse_id], back_populates="assigned_patients_as_nurse")
@@ -132,8 +137,14 @@ class PatientVitals(Base):
     recorded_at = Column(DateTime(timezone=True), server_default="now()")
     created_at = Column(DateTime(timezone=True), server_default="now()")
 
+    # Latest-vitals lookups walk a patient's readings newest-first
+    __table_args__ = (
+        Index("idx_vitals_recorded", "patient_id", recorded_at.desc()),
+    )
+
     # Relationships
     patient = relationship("Patient", back_populates="vitals")
+    recorded_by_user = relationship("User", foreign_keys=[recorded_by], lazy="raise")
 
 
 class PatientNote(Base, TimestampMixin, SoftDeleteMixin):
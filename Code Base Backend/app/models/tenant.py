@@ -44,3 +44,11 @@ class Tenant(Base, TimestampMixin):
 
     def __repr__(self):
         return f"<Tenant {self.name}>"
+
+
+class TenantCounters(Base):
+    """Per-tenant running numbers for human-readable identifiers."""
+    __tablename__ = "tenant_counters"
+
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id", ondelete="CASCADE"), primary_key=True)
+    last_patient_number = Column(Integer, nullable=False, server_default="0")
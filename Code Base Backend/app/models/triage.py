@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, Integer, Text, ForeignKey, Numeric, DateTime
+from sqlalchemy import Column, String, Boolean, Integer, Text, ForeignKey, Numeric, DateTime, Index, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY
 import uuid
 
@@ -48,6 +48,11 @@ class AITriageResult(Base):
 
     created_at = Column(DateTime(timezone=True), server_default="now()")
 
+    # Latest result per patient and the triage timeline, both by applied_at
+    __table_args__ = (
+        Index("idx_triage_patient_applied", "patient_id", text("applied_at DESC NULLS LAST")),
+    )
+
     # Relationships
     from sqlalchemy.orm import relationship
     patient = relationship("Patient", back_populates="triage_results")
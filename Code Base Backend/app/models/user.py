@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, Integer, Text, ForeignKey, Date, DateTime
+from sqlalchemy import Column, String, Boolean, Integer, Text, ForeignKey, Date, DateTime, Index, text
 from sqlalchemy.dialects.postgresql import UUID, ARRAY, JSONB, INET
 from sqlalchemy.orm import relationship
 import uuid
@@ -27,6 +27,14 @@ class User(Base, TimestampMixin, SoftDeleteMixin):
     last_active_at = Column(DateTime(timezone=True))
     joined_at = Column(Date)
 
+    # Staff listing / role counts: live users of a tenant, by role, in name order
+    __table_args__ = (
+        Index(
+            "ix_users_active_role_name", "tenant_id", "role", "name",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+    )
+
     # Relationships
     tenant = relationship("Tenant", back_populates="users")
     department = relationship("Department", back_populates="users")
@@ -120,3 +128,12 @@ class PasswordResetToken(Base):
     token_expires_at = Column(DateTime(timezone=True))
     is_used = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default="now()")
+
+    # verify-otp looks up by email; reset-password by the reset token's hash
+    __table_args__ = (
+        Index("idx_reset_tokens_email_pending", "email", "is_used", created_at.desc()),
+        Index(
+            "idx_reset_tokens_reset_hash", "reset_token_hash",
+            postgresql_where=text("reset_token_hash IS NOT NULL"),
+        ),
+    )
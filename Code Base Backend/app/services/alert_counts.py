@@ -0,0 +1,60 @@
+"""Redis-cached alert counts for the alerts list.
+
+The unread/critical badges and the filtered total are polled constantly by
+the UI but only change when an alert is created or changes state. They are
+cached per tenant (see `alert_counts_key`) and dropped whenever alerts of that
+tenant change.
+
+Alerts are created and updated from many routes, so invalidation is not left
+to each call site: a session `after_flush` hook records the tenants of every
+Alert written through the ORM, and `after_commit` queues their invalidation
+as an after-commit task (see `app.db.database.AFTER_COMMIT_TASKS`), which
+`get_db` awaits before the response goes out. Core statements on the alerts
+table bypass the hook and must call `invalidate_alert_counts` themselves.
+"""
+
+from functools import partial
+from itertools import chain
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.cache import cache_key, cache_invalidate, tenant_prefix
+from app.db.database import AFTER_COMMIT_TASKS
+from app.models.alert import Alert
+
+ALERT_COUNTS_CACHE_TTL = 30
+
+_TOUCHED_TENANTS = "alert_counts_touched_tenants"
+
+
+def alert_counts_key(tenant_id: Any, **params: Any) -> str:
+    """Cache key for one user's filtered alert counts within a tenant."""
+    return cache_key(f"{tenant_prefix('alerts', tenant_id)}counts", **params)
+
+
+async def invalidate_alert_counts(tenant_id: Any) -> None:
+    """Drop every cached alert count of a tenant."""
+    await cache_invalidate(tenant_prefix("alerts", tenant_id))
+
+
+@event.listens_for(Session, "after_flush")
+def _track_alert_changes(session: Session, flush_context) -> None:
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, Alert) and obj.tenant_id is not None:
+            session.info.setdefault(_TOUCHED_TENANTS, set()).add(obj.tenant_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    tenants = session.info.pop(_TOUCHED_TENANTS, None)
+    if tenants:
+        session.info.setdefault(AFTER_COMMIT_TASKS, []).extend(
+            partial(invalidate_alert_counts, tenant_id) for tenant_id in tenants
+        )
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_after_rollback(session: Session) -> None:
+    session.info.pop(_TOUCHED_TENANTS, None)
@@ -2,6 +2,7 @@
 Doctor/Staff Assignment Service
 Handles automatic and manual assignment of medical staff to patients
 """
+import logging
 from typing import Optional, List, Dict, Any
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -12,6 +13,8 @@ from app.models.user import User
 from app.models.patient import Patient
 from app.models.department import Department
 
+logger = logging.getLogger(__name__)
+
 
 # Specialty mapping for triage recommendations
 SPECIALTY_MAPPING = {
@@ -64,7 +67,7 @@ class AssignmentService:
             doctors = result.scalars().all()
 
             if not doctors:
-                print("[ASSIGNMENT] No available doctors found")
+                logger.debug("No available doctors found")
                 return None
 
             # Score each doctor
@@ -80,12 +83,12 @@ class AssignmentService:
 
             # Return the best match
             best_doctor = scored_doctors[0][0]
-            print(f"[ASSIGNMENT] Auto-assigned Dr. {best_doctor.name} (score: {scored_doctors[0][1]})")
+            logger.debug("Auto-assigned Dr. %s (score: %s)", best_doctor.name, scored_doctors[0][1])
 
             return best_doctor
 
         except Exception as e:
-            print(f"[ASSIGNMENT] Error in auto_assign_doctor: {e}")
+            logger.warning("auto_assign_doctor failed: %s", e)
             return None
 
     async def _calculate_doctor_score(
@@ -187,7 +190,7 @@ class AssignmentService:
                 nurses = list(result.scalars().all())
 
             if not nurses:
-                print("[ASSIGNMENT] No available nurses found")
+                logger.debug("No available nurses found")
                 return None
 
             # Score nurses by workload
@@ -210,12 +213,12 @@ class AssignmentService:
             scored_nurses.sort(key=lambda x: x[1], reverse=True)
 
             best_nurse = scored_nurses[0][0]
-            print(f"[ASSIGNMENT] Auto-assigned Nurse {best_nurse.name}")
+            logger.debug("Auto-assigned Nurse %s", best_nurse.name)
 
             return best_nurse
 
         except Exception as e:
-            print(f"[ASSIGNMENT] Error in auto_assign_nurse: {e}")
+            logger.warning("auto_assign_nurse failed: %s", e)
             return None
 
     async def get_available_doctors(
@@ -335,9 +338,9 @@ class AssignmentService:
                 doctor = doctor_result.scalar_one_or_none()
                 if doctor:
                     patient.assigned_doctor_id = new_doctor_id
-                    print(f"[ASSIGNMENT] Reassigned patient to Dr. {doctor.name}")
+                    logger.debug("Reassigned patient to Dr. %s", doctor.name)
                 else:
-                    print(f"[ASSIGNMENT] Doctor {new_doctor_id} not found or not active")
+                    logger.warning("Doctor %s not found or not active", new_doctor_id)
                     return False
 
             if new_nurse_id:
@@ -352,15 +355,15 @@ class AssignmentService:
                 nurse = nurse_result.scalar_one_or_none()
                 if nurse:
                     patient.assigned_nurse_id = new_nurse_id
-                    print(f"[ASSIGNMENT] Reassigned patient to Nurse {nurse.name}")
+                    logger.debug("Reassigned patient to Nurse %s", nurse.name)
                 else:
-                    print(f"[ASSIGNMENT] Nurse {new_nurse_id} not found or not active")
+                    logger.warning("Nurse %s not found or not active", new_nurse_id)
                     return False
 
             return True
 
         except Exception as e:
-            print(f"[ASSIGNMENT] Error in reassign_patient: {e}")
+            logger.warning("reassign_patient failed: %s", e)
             return False
 
 
@@ -22,8 +22,6 @@ from __future__ import annotations
 
 import json
 import logging
-import sys
-import traceback
 from datetime import datetime, timezone
 from typing import Optional, Any
 from uuid import UUID
@@ -111,9 +109,7 @@ async def log_action(
             audit_session.add(AuditLog(**audit_row_kwargs))
             await audit_session.commit()
     except Exception as exc:
-        # Audit failures must not break the user request. Print the traceback
-        # so CloudWatch captures the underlying error (logger.warning alone
-        # is easy to miss in Lambda log groups).
-        print(f"[audit] log_action failed: {exc}", file=sys.stderr)
-        traceback.print_exc(file=sys.stderr)
-        logger.warning("audit log_action failed: %s", exc)
+        # Audit failures must not break the user request. Log at ERROR with
+        # the traceback so CloudWatch captures the underlying error (a bare
+        # warning line is easy to miss in Lambda log groups).
+        logger.exception("audit log_action failed: %s", exc)
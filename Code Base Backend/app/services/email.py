@@ -1,10 +1,13 @@
 """
 Email service using Resend API
 """
+import logging
 import httpx
 from typing import Optional
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 
 class EmailService:
     """Service for sending emails via Resend API."""
@@ -83,7 +86,7 @@ class EmailService:
                         "mode": "production"
                     }
                 else:
-                    print(f"Resend API Error: {response.status_code} - {response.text}")
+                    logger.warning("Resend API Error: %s - %s", response.status_code, response.text)
                     return {
                         "success": False,
                         "error": f"Failed to send email: {response.text}",
@@ -91,7 +94,7 @@ class EmailService:
                     }
 
         except Exception as e:
-            print(f"Email sending error: {str(e)}")
+            logger.warning("Email sending error: %s", e)
             return {
                 "success": False,
                 "error": f"Email sending failed: {str(e)}"
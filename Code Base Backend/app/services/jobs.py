@@ -8,11 +8,14 @@ Handles asynchronous tasks:
 """
 
 from typing import Dict, Any, Optional, List
+import logging
 import httpx
 from datetime import datetime
 
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 
 class TriggerDevService:
     """Trigger.dev background jobs service."""
@@ -44,8 +47,7 @@ class TriggerDevService:
         """
         if not self.api_key:
             # Development mode - log and return mock response
-            print(f"[Trigger.dev Mock] Job: {job_id}")
-            print(f"[Trigger.dev Mock] Payload: {payload}")
+            logger.debug("[Trigger.dev Mock] Job: %s Payload: %s", job_id, payload)
             return {
                 "id": f"mock-{job_id}-{datetime.utcnow().timestamp()}",
                 "status": "queued",
@@ -63,7 +65,7 @@ class TriggerDevService:
             response.raise_for_status()
             return response.json()
         except Exception as e:
-            print(f"Trigger.dev error: {e}")
+            logger.warning("Trigger.dev error: %s", e)
             return {"error": str(e), "status": "failed"}
 
     # ==================== Notification Jobs ====================
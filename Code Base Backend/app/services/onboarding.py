@@ -11,7 +11,7 @@ from app.models.user import User, UserSettings
 from app.models.department import Department
 from app.models.bed import Bed
 from app.models.subscription import SubscriptionPlan
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash_async
 
 
 # Standard departments created for every new hospital
@@ -166,7 +166,7 @@ async def onboard_hospital(
         tenant_id=tenant_id,
         employee_id="ADMIN-001",
         email=admin_email,
-        password_hash=get_password_hash(admin_password),
+        password_hash=await get_password_hash_async(admin_password),
         name=admin_name,
         role="admin",
         phone=admin_phone,
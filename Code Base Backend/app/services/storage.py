@@ -0,0 +1,116 @@
+"""
+Storage for uploaded files (patient photos).
+
+With UPLOAD_STORAGE=s3 files are put in S3_BUCKET_NAME (the `boto3` package
+must be installed); otherwise they are written under UPLOAD_DIR, which is
+only meant for local development. The database keeps the object key, never
+the file itself.
+
+Uploads are health data and are never publicly readable. API responses that
+were already authenticated and tenant-checked hand out short-lived signed
+URLs instead (see `upload_url`): S3 presigned URLs, or for local files an
+HMAC-signed URL served by `GET /api/v1/uploads/{key}`.
+
+boto3 and file I/O are blocking, so both backends run in a worker thread and
+copy the upload in chunks rather than reading it into memory.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import logging
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import BinaryIO, Optional
+from urllib.parse import urlencode
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_CHUNK_SIZE = 1 << 20
+
+_s3_client = None
+
+
+def _get_s3():
+    """Return the shared S3 client (created on first use)."""
+    global _s3_client
+    if _s3_client is None:
+        try:
+            import boto3
+        except ImportError:
+            logger.error("UPLOAD_STORAGE is 's3' but the boto3 package is not installed")
+            raise
+        _s3_client = boto3.client(
+            "s3",
+            region_name=settings.AWS_REGION,
+            # Blank keys fall back to the default chain (e.g. the Lambda role)
+            aws_access_key_id=settings.AWS_ACCESS_KEY_ID or None,
+            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY or None,
+        )
+    return _s3_client
+
+
+def _put_s3(key: str, fileobj: BinaryIO, content_type: str) -> None:
+    _get_s3().upload_fileobj(
+        fileobj, settings.S3_BUCKET_NAME, key, ExtraArgs={"ContentType": content_type}
+    )
+
+
+def _write_local(key: str, fileobj: BinaryIO) -> None:
+    if os.environ.get("AWS_LAMBDA_FUNCTION_NAME"):
+        # Read-only there, and files would not be shared between instances
+        raise RuntimeError("UPLOAD_STORAGE=local is not supported on AWS Lambda; use s3")
+    path = Path(settings.UPLOAD_DIR) / key
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as out:
+        shutil.copyfileobj(fileobj, out, _CHUNK_SIZE)
+
+
+async def store_upload(key: str, fileobj: BinaryIO, content_type: str) -> None:
+    """Store `fileobj` under `key` in the configured backend."""
+    if settings.UPLOAD_STORAGE == "s3":
+        await asyncio.to_thread(_put_s3, key, fileobj, content_type)
+    else:
+        await asyncio.to_thread(_write_local, key, fileobj)
+
+
+def _signature(key: str, expires: int) -> str:
+    return hmac.new(
+        settings.SECRET_KEY.encode(), f"{key}:{expires}".encode(), hashlib.sha256
+    ).hexdigest()
+
+
+def upload_url(stored: Optional[str]) -> Optional[str]:
+    """Short-lived URL for a stored upload key.
+
+    Legacy values (data URLs, absolute URLs) are returned unchanged.
+    """
+    if not stored or stored.startswith("data:") or "://" in stored:
+        return stored
+    if settings.UPLOAD_STORAGE == "s3":
+        return _get_s3().generate_presigned_url(
+            "get_object",
+            Params={"Bucket": settings.S3_BUCKET_NAME, "Key": stored},
+            ExpiresIn=settings.UPLOAD_URL_TTL,
+        )
+    # Expiry rounded to the TTL window so the URL (and the browser's cached
+    # copy) stays stable across polls; it is valid for one to two TTLs
+    ttl = settings.UPLOAD_URL_TTL
+    expires = (int(time.time()) // ttl + 2) * ttl
+    query = urlencode({"expires": expires, "signature": _signature(stored, expires)})
+    return f"{settings.API_PUBLIC_URL.rstrip('/')}/api/v1/uploads/{stored}?{query}"
+
+
+def local_upload_path(key: str, expires: int, signature: str) -> Optional[Path]:
+    """Path of a locally stored upload if the signed URL is valid and unexpired."""
+    if expires < time.time() or not hmac.compare_digest(signature, _signature(key, expires)):
+        return None
+    root = Path(settings.UPLOAD_DIR).resolve()
+    path = (root / key).resolve()
+    if not path.is_relative_to(root) or not path.is_file():
+        return None
+    return path
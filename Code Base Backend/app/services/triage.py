@@ -1,9 +1,17 @@
 import json
+import logging
 import time
+from functools import lru_cache
 from typing import Optional, Dict, Any, List
-from groq import Groq
+from groq import AsyncGroq
+from app.core.cache import cache_get, cache_set, cache_key
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+# Identical prompts (e.g. re-triage with unchanged inputs) reuse the LLM answer
+TRIAGE_CACHE_TTL = 600
+
 
 class TriageService:
     """AI Triage service using Groq LLM."""
@@ -47,7 +55,12 @@ Be conservative - when in doubt, assign a higher priority (lower number). Consid
 
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or settings.GROQ_API_KEY
-        self.client = Groq(api_key=self.api_key) if self.api_key else None
+        # Async client so concurrent triage calls do not block the event loop;
+        # the SDK retries 429/5xx responses with exponential backoff
+        self.client = (
+            AsyncGroq(api_key=self.api_key, max_retries=settings.GROQ_MAX_RETRIES)
+            if self.api_key else None
+        )
         self.model = settings.GROQ_MODEL
         self.temperature = settings.GROQ_TEMPERATURE
         self.max_tokens = settings.GROQ_MAX_TOKENS
@@ -97,11 +110,32 @@ Be conservative - when in doubt, assign a higher priority (lower number). Consid
             treatments=treatments_str
         )
 
+        # The prompt holds every input, so it (plus the model settings) is the key
+        result_key = cache_key(
+            "triage:result", model=self.model, temperature=self.temperature,
+            max_tokens=self.max_tokens, prompt=prompt
+        )
+        cached = await cache_get(result_key)
+        if cached is not None:
+            # Only the model's clinical answer is cached; no request was made
+            # for this call, so it has no request id, token usage or timing
+            return {
+                **cached,
+                "groq_model": self.model,
+                "groq_request_id": None,
+                "prompt_tokens": None,
+                "completion_tokens": None,
+                "total_tokens": None,
+                "processing_time_ms": None,
+                "temperature": self.temperature,
+                "cached": True,
+            }
+
         start_time = time.time()
 
         try:
             # Call Groq API
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[
                     {
@@ -122,9 +156,10 @@ Be conservative - when in doubt, assign a higher priority (lower number). Consid
 
             # Parse response
             content = response.choices[0].message.content
-            result = json.loads(content)
+            answer = json.loads(content)
 
             # Add metadata
+            result = dict(answer)
             result["groq_model"] = self.model
             result["groq_request_id"] = response.id if hasattr(response, 'id') else None
             result["prompt_tokens"] = response.usage.prompt_tokens if response.usage else None
@@ -133,10 +168,12 @@ Be conservative - when in doubt, assign a higher priority (lower number). Consid
             result["processing_time_ms"] = processing_time
             result["temperature"] = self.temperature
 
+            # Cache the clinical answer only; the metadata belongs to this call
+            await cache_set(result_key, answer, TRIAGE_CACHE_TTL)
             return result
 
         except Exception as e:
-            print(f"Groq API error: {e}")
+            logger.warning("Groq API error: %s", e)
             # Return mock triage on error
             return self._mock_triage(complaint, vitals)
 
@@ -204,7 +241,7 @@ Be conservative - when in doubt, assign a higher priority (lower number). Consid
             return self._mock_ocr_result()
 
         try:
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=settings.GROQ_VISION_MODEL,
                 messages=[
                     {
@@ -241,7 +278,7 @@ Be conservative - when in doubt, assign a higher priority (lower number). Consid
             }
 
         except Exception as e:
-            print(f"Groq Vision API error: {e}")
+            logger.warning("Groq Vision API error: %s", e)
             return self._mock_ocr_result()
 
     def _mock_ocr_result(self) -> Dict[str, Any]:
@@ -261,3 +298,9 @@ Be conservative - when in doubt, assign a higher priority (lower number). Consid
             },
             "rawText": "HR: 78 bpm, BP: 120/80 mmHg, SpO2: 98%, Temp: 98.6°F"
         }
+
+
+@lru_cache(maxsize=None)
+def get_triage_service() -> TriageService:
+    """Shared TriageService, so every request reuses one Groq connection pool."""
+    return TriageService()
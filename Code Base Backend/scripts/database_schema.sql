@@ -7,6 +7,7 @@
 -- Enable required extensions
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 CREATE EXTENSION IF NOT EXISTS "pgcrypto";
+CREATE EXTENSION IF NOT EXISTS "pg_trgm";
 
 -- ============================================================
 -- 1. TENANTS (Multi-tenancy support)
@@ -83,6 +84,11 @@ CREATE INDEX idx_users_email ON users(tenant_id, email);
 CREATE INDEX idx_users_role ON users(tenant_id, role);
 CREATE INDEX idx_users_department ON users(department_id);
 CREATE INDEX idx_users_status ON users(tenant_id, status);
+CREATE INDEX ix_users_active_role_name ON users(tenant_id, role, name) WHERE deleted_at IS NULL;
+-- Staff search: substring matches via trigrams, short prefixes via B-tree
+CREATE INDEX users_name_email_trgm ON users USING gin (lower(name) gin_trgm_ops, lower(email) gin_trgm_ops);
+CREATE INDEX idx_users_name_prefix ON users(lower(name) text_pattern_ops);
+CREATE INDEX idx_users_email_prefix ON users(lower(email) text_pattern_ops);
 
 -- ============================================================
 -- 4. USER SETTINGS
@@ -160,7 +166,8 @@ CREATE TABLE password_reset_tokens (
 );
 
 CREATE INDEX idx_reset_tokens_user ON password_reset_tokens(user_id);
-CREATE INDEX idx_reset_tokens_email ON password_reset_tokens(email);
+CREATE INDEX idx_reset_tokens_email_pending ON password_reset_tokens(email, is_used, created_at DESC);
+CREATE INDEX idx_reset_tokens_reset_hash ON password_reset_tokens(reset_token_hash) WHERE reset_token_hash IS NOT NULL;
 
 -- ============================================================
 -- 8. PATIENTS
@@ -230,7 +237,7 @@ CREATE TABLE patients (
 
 CREATE INDEX idx_patients_tenant ON patients(tenant_id);
 CREATE INDEX idx_patients_patient_id ON patients(tenant_id, patient_id);
-CREATE INDEX idx_patients_status ON patients(tenant_id, status);
+CREATE INDEX idx_patients_status_admitted ON patients(tenant_id, status, admitted_at DESC);
 CREATE INDEX idx_patients_priority ON patients(tenant_id, priority);
 CREATE INDEX idx_patients_department ON patients(department_id);
 CREATE INDEX idx_patients_doctor ON patients(assigned_doctor_id);
@@ -238,6 +245,12 @@ CREATE INDEX idx_patients_nurse ON patients(assigned_nurse_id);
 CREATE INDEX idx_patients_admitted ON patients(tenant_id, admitted_at);
 CREATE INDEX idx_patients_police_case ON patients(tenant_id, is_police_case);
 
+-- Last patient number handed out per tenant (P00001, P00002, ...)
+CREATE TABLE tenant_counters (
+    tenant_id UUID PRIMARY KEY REFERENCES tenants(id) ON DELETE CASCADE,
+    last_patient_number INTEGER NOT NULL DEFAULT 0
+);
+
 -- ============================================================
 -- 9. PATIENT ALLERGIES
 -- ============================================================
@@ -287,7 +300,6 @@ CREATE TABLE patient_vitals (
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
-CREATE INDEX idx_vitals_patient ON patient_vitals(patient_id);
 CREATE INDEX idx_vitals_recorded ON patient_vitals(patient_id, recorded_at DESC);
 CREATE INDEX idx_vitals_critical ON patient_vitals(patient_id, is_critical);
 
@@ -336,7 +348,7 @@ CREATE TABLE ai_triage_results (
 );
 
 CREATE INDEX idx_triage_tenant ON ai_triage_results(tenant_id);
-CREATE INDEX idx_triage_patient ON ai_triage_results(patient_id);
+CREATE INDEX idx_triage_patient_applied ON ai_triage_results(patient_id, applied_at DESC NULLS LAST);
 CREATE INDEX idx_triage_created ON ai_triage_results(tenant_id, created_at DESC);
 CREATE INDEX idx_triage_priority ON ai_triage_results(priority);
 
@@ -439,7 +451,8 @@ CREATE TABLE beds (
 
 CREATE INDEX idx_beds_tenant ON beds(tenant_id);
 CREATE INDEX idx_beds_department ON beds(department_id);
-CREATE INDEX idx_beds_status ON beds(tenant_id, status);
+CREATE INDEX idx_beds_active_number ON beds(tenant_id, is_active, bed_number);
+CREATE INDEX idx_beds_status_active ON beds(tenant_id, status, is_active);
 CREATE INDEX idx_beds_type ON beds(tenant_id, bed_type);
 CREATE INDEX idx_beds_patient ON beds(current_patient_id);
 
@@ -511,11 +524,21 @@ CREATE TABLE alerts (
 );
 
 CREATE INDEX idx_alerts_tenant ON alerts(tenant_id);
-CREATE INDEX idx_alerts_status ON alerts(tenant_id, status);
-CREATE INDEX idx_alerts_priority ON alerts(tenant_id, priority);
+CREATE INDEX idx_alerts_status_created ON alerts(tenant_id, status, created_at DESC);
+CREATE INDEX idx_alerts_priority_status ON alerts(tenant_id, priority, status);
 CREATE INDEX idx_alerts_patient ON alerts(patient_id);
 CREATE INDEX idx_alerts_created ON alerts(tenant_id, created_at DESC);
 CREATE INDEX idx_alerts_unread ON alerts(tenant_id, status) WHERE status = 'unread';
+CREATE INDEX idx_alerts_active_created ON alerts(tenant_id, created_at DESC) WHERE status IN ('unread', 'read');
+CREATE INDEX idx_alerts_for_roles ON alerts USING gin (for_roles);
+CREATE INDEX idx_alerts_for_user_ids ON alerts USING gin (for_user_ids);
+
+-- Per-tenant open-alert counters, kept current by the apply_alert_stats trigger
+CREATE TABLE tenant_alert_stats (
+    tenant_id UUID PRIMARY KEY REFERENCES tenants(id) ON DELETE CASCADE,
+    unread INTEGER NOT NULL DEFAULT 0,
+    critical_open INTEGER NOT NULL DEFAULT 0
+);
 
 -- ============================================================
 -- 17. ALERT HISTORY
@@ -816,6 +839,59 @@ CREATE TRIGGER update_police_cases_updated_at BEFORE UPDATE ON police_cases FOR
 CREATE TRIGGER update_groq_config_updated_at BEFORE UPDATE ON groq_configurations FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 CREATE TRIGGER update_mcp_config_updated_at BEFORE UPDATE ON mcp_configurations FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
+-- Maintain tenant_alert_stats (unread / open critical alerts per tenant)
+CREATE OR REPLACE FUNCTION apply_alert_stats()
+RETURNS TRIGGER AS $$
+DECLARE
+    tenant UUID;
+    unread_delta INTEGER := 0;
+    critical_delta INTEGER := 0;
+BEGIN
+    IF TG_OP <> 'DELETE' THEN
+        tenant := NEW.tenant_id;
+        IF NEW.status = 'unread' THEN
+            unread_delta := unread_delta + 1;
+        END IF;
+        IF NEW.priority = 'critical' AND NEW.status IN ('unread', 'read') THEN
+            critical_delta := critical_delta + 1;
+        END IF;
+    END IF;
+    IF TG_OP <> 'INSERT' THEN
+        tenant := OLD.tenant_id;
+        IF OLD.status = 'unread' THEN
+            unread_delta := unread_delta - 1;
+        END IF;
+        IF OLD.priority = 'critical' AND OLD.status IN ('unread', 'read') THEN
+            critical_delta := critical_delta - 1;
+        END IF;
+    END IF;
+
+    IF unread_delta = 0 AND critical_delta = 0 THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP = 'DELETE' THEN
+        -- No upsert: during a tenant cascade delete the tenant row is gone
+        UPDATE tenant_alert_stats
+        SET unread = unread + unread_delta,
+            critical_open = critical_open + critical_delta
+        WHERE tenant_id = tenant;
+    ELSE
+        INSERT INTO tenant_alert_stats AS s (tenant_id, unread, critical_open)
+        VALUES (tenant, unread_delta, critical_delta)
+        ON CONFLICT (tenant_id) DO UPDATE
+        SET unread = s.unread + EXCLUDED.unread,
+            critical_open = s.critical_open + EXCLUDED.critical_open;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER alerts_stats AFTER INSERT OR DELETE ON alerts
+    FOR EACH ROW EXECUTE FUNCTION apply_alert_stats();
+CREATE TRIGGER alerts_stats_update AFTER UPDATE OF status, priority ON alerts
+    FOR EACH ROW WHEN (OLD.status IS DISTINCT FROM NEW.status OR OLD.priority IS DISTINCT FROM NEW.priority)
+    EXECUTE FUNCTION apply_alert_stats();
+
 -- Function to generate patient ID
 CREATE OR REPLACE FUNCTION generate_patient_id(tenant_uuid UUID)
 RETURNS VARCHAR AS $$
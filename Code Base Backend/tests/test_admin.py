@@ -0,0 +1,139 @@
+"""Tests for hospital admin routes."""
+
+import uuid
+from httpx import AsyncClient
+
+
+class TestStaffManagement:
+    """Staff listing and management."""
+
+    async def test_get_staff_role_counts(
+        self, client: AsyncClient, admin_headers, nurse_user, doctor_user
+    ):
+        resp = await client.get("/api/v1/admin/staff", headers=admin_headers)
+        assert resp.status_code == 200
+        counts = resp.json()["data"]["counts"]
+        assert counts["doctors"] == 1
+        assert counts["nurses"] == 1
+        assert counts["admins"] == 1
+        assert counts["total"] == 3
+
+    async def test_role_counts_ignore_list_filters(
+        self, client: AsyncClient, admin_headers, nurse_user, doctor_user
+    ):
+        """Role counts cover the whole tenant, not just the filtered list."""
+        resp = await client.get(
+            "/api/v1/admin/staff?role=nurse", headers=admin_headers
+        )
+        assert resp.status_code == 200
+        data = resp.json()["data"]
+        assert [s["role"] for s in data["staff"]] == ["nurse"]
+        assert data["counts"]["doctors"] == 1
+
+    async def test_search_matches_substring_case_insensitively(
+        self, client: AsyncClient, admin_headers, nurse_user, doctor_user
+    ):
+        resp = await client.get(
+            "/api/v1/admin/staff?search=NURS", headers=admin_headers
+        )
+        assert resp.status_code == 200
+        assert [s["email"] for s in resp.json()["data"]["staff"]] == ["nurse@test.com"]
+
+    async def test_short_search_matches_substring(
+        self, client: AsyncClient, admin_headers, nurse_user, doctor_user
+    ):
+        """Terms shorter than a trigram still match anywhere in name/email."""
+        resp = await client.get(
+            "/api/v1/admin/staff?search=ur", headers=admin_headers
+        )
+        assert resp.status_code == 200
+        assert [s["email"] for s in resp.json()["data"]["staff"]] == ["nurse@test.com"]
+
+    async def test_create_staff(
+        self, client: AsyncClient, admin_headers, test_department
+    ):
+        resp = await client.post(
+            "/api/v1/admin/staff",
+            headers=admin_headers,
+            json={
+                "name": "New Nurse",
+                "email": "new.nurse@test.com",
+                "password": "NewNurse@1",
+                "role": "nurse",
+                "department_id": str(test_department.id),
+            },
+        )
+        assert resp.status_code == 201
+        data = resp.json()["data"]
+        assert data["email"] == "new.nurse@test.com"
+        assert data["department"] == test_department.name
+        assert data["status"] == "active"
+
+    async def test_create_staff_duplicate_email(
+        self, client: AsyncClient, admin_headers, nurse_user
+    ):
+        resp = await client.post(
+            "/api/v1/admin/staff",
+            headers=admin_headers,
+            json={
+                "name": "Another Nurse",
+                "email": "nurse@test.com",
+                "password": "Another@1",
+                "role": "nurse",
+            },
+        )
+        assert resp.status_code == 400
+
+    async def test_update_staff_returns_department(
+        self, client: AsyncClient, admin_headers, nurse_user, test_department
+    ):
+        resp = await client.put(
+            f"/api/v1/admin/staff/{nurse_user.id}",
+            headers=admin_headers,
+            json={"name": "Renamed Nurse", "department_id": str(test_department.id)},
+        )
+        assert resp.status_code == 200
+        data = resp.json()["data"]
+        assert data["name"] == "Renamed Nurse"
+        assert data["department"] == test_department.name
+
+    async def test_update_unknown_staff_404(self, client: AsyncClient, admin_headers):
+        resp = await client.put(
+            f"/api/v1/admin/staff/{uuid.uuid4()}",
+            headers=admin_headers,
+            json={"name": "Nobody"},
+        )
+        assert resp.status_code == 404
+
+    async def test_delete_staff(self, client: AsyncClient, admin_headers, nurse_user):
+        resp = await client.delete(
+            f"/api/v1/admin/staff/{nurse_user.id}", headers=admin_headers
+        )
+        assert resp.status_code == 200
+
+        resp = await client.delete(
+            f"/api/v1/admin/staff/{nurse_user.id}", headers=admin_headers
+        )
+        assert resp.status_code == 404
+
+    async def test_cannot_delete_self(self, client: AsyncClient, admin_headers, admin_user):
+        resp = await client.delete(
+            f"/api/v1/admin/staff/{admin_user.id}", headers=admin_headers
+        )
+        assert resp.status_code == 400
+
+
+class TestInitializeBeds:
+    """Default bed creation."""
+
+    async def test_skips_departments_that_have_beds(
+        self, client: AsyncClient, admin_headers, test_bed, test_department_b
+    ):
+        resp = await client.post("/api/v1/admin/initialize-beds", headers=admin_headers)
+        assert resp.status_code == 200
+        # ED-A already has test_bed; only ED-B gets its 15 default beds
+        assert resp.json()["message"].startswith("Created 15 beds across 1 departments.")
+
+        resp = await client.post("/api/v1/admin/initialize-beds", headers=admin_headers)
+        assert resp.status_code == 200
+        assert resp.json()["message"].startswith("Created 0 beds")
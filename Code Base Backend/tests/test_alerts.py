@@ -36,6 +36,40 @@ class TestAlertOperations:
         alerts = resp.json()["data"]["alerts"]
         assert len(alerts) >= 1
 
+    async def test_get_alerts_counts(
+        self, client: AsyncClient, nurse_headers, db_session, test_tenant
+    ):
+        """Total follows the filters; unread/critical cover the whole tenant."""
+        await self._create_alert(db_session, test_tenant.id)
+        critical = await self._create_alert(db_session, test_tenant.id)
+        critical.priority = "critical"
+        await db_session.flush()
+
+        resp = await client.get("/api/v1/alerts?priority=high", headers=nurse_headers)
+        assert resp.status_code == 200
+        counts = resp.json()["data"]["counts"]
+        assert counts == {"total": 1, "unread": 2, "critical": 1}
+
+    async def test_alert_stats_follow_status_changes(
+        self, client: AsyncClient, doctor_headers, db_session, test_tenant
+    ):
+        """The trigger-kept tenant counters drop when an alert is resolved."""
+        from app.models.alert import TenantAlertStats
+
+        alert = await self._create_alert(db_session, test_tenant.id)
+        alert.priority = "critical"
+        await db_session.flush()
+
+        resp = await client.put(
+            f"/api/v1/alerts/{alert.id}/resolve",
+            headers=doctor_headers,
+            json={"resolution": "Handled"},
+        )
+        assert resp.status_code == 200
+
+        stats = await db_session.get(TenantAlertStats, test_tenant.id, populate_existing=True)
+        assert (stats.unread, stats.critical_open) == (0, 0)
+
     async def test_acknowledge_alert(
         self, client: AsyncClient, nurse_headers, db_session, test_tenant
     ):
@@ -59,3 +93,103 @@ class TestAlertOperations:
         )
         assert resp.status_code == 200
         assert resp.json()["data"]["status"] == "resolved"
+
+    async def test_active_alerts_query_count(
+        self, client: AsyncClient, nurse_headers, db_session, test_tenant,
+        test_patient, count_queries
+    ):
+        """Patient and department are eager-loaded: no per-alert queries."""
+        for _ in range(3):
+            await self._create_alert(db_session, test_tenant.id, test_patient.id)
+
+        with count_queries() as queries:
+            resp = await client.get("/api/v1/alerts/active", headers=nurse_headers)
+        assert resp.status_code == 200
+        alerts = resp.json()["data"]["alerts"]
+        assert len(alerts) == 3
+        assert alerts[0]["patient"]["department"] is not None
+        # auth (user + revocation check) + alerts joined to patient/department + unread count
+        assert len(queries) <= 3
+
+    async def test_get_alerts_rejects_oversized_page(self, client: AsyncClient, nurse_headers):
+        resp = await client.get("/api/v1/alerts?limit=1000", headers=nurse_headers)
+        assert resp.status_code == 422
+
+    async def test_get_alerts_gzip(
+        self, client: AsyncClient, nurse_headers, db_session, test_tenant
+    ):
+        for _ in range(10):
+            await self._create_alert(db_session, test_tenant.id)
+        resp = await client.get(
+            "/api/v1/alerts", headers={**nurse_headers, "Accept-Encoding": "gzip"}
+        )
+        assert resp.status_code == 200
+        assert resp.headers["content-encoding"] == "gzip"
+        assert len(resp.json()["data"]["alerts"]) == 10
+
+    async def test_get_alerts_single_query(
+        self, client: AsyncClient, nurse_headers, db_session, test_tenant,
+        test_patient, count_queries
+    ):
+        """The page, its patients and the counts come back in one statement."""
+        for _ in range(3):
+            await self._create_alert(db_session, test_tenant.id, test_patient.id)
+
+        with count_queries() as queries:
+            resp = await client.get("/api/v1/alerts", headers=nurse_headers)
+        assert resp.status_code == 200
+        data = resp.json()["data"]
+        assert data["counts"]["total"] == 3
+        assert data["alerts"][0]["patient"]["department"] is not None
+        # auth + page
+        assert len(queries) <= 2
+
+    async def test_mark_read_records_history(
+        self, client: AsyncClient, nurse_headers, db_session, test_tenant, count_queries
+    ):
+        """Status update and history row are written by one statement."""
+        from sqlalchemy import select
+        from app.models.alert import AlertHistory
+
+        alert = await self._create_alert(db_session, test_tenant.id)
+        with count_queries() as queries:
+            resp = await client.put(f"/api/v1/alerts/{alert.id}/read", headers=nurse_headers)
+        assert resp.status_code == 200
+        assert resp.json()["data"]["status"] == "read"
+        # auth + update/history
+        assert len(queries) <= 2
+
+        history = (await db_session.execute(
+            select(AlertHistory).where(AlertHistory.alert_id == alert.id)
+        )).scalar_one()
+        assert (history.old_status, history.new_status) == ("unread", "read")
+
+    async def test_mark_read_unknown_alert(self, client: AsyncClient, nurse_headers):
+        resp = await client.put(f"/api/v1/alerts/{uuid.uuid4()}/read", headers=nurse_headers)
+        assert resp.status_code == 404
+
+    async def test_forward_alert_adds_role_once(
+        self, client: AsyncClient, nurse_headers, db_session, test_tenant
+    ):
+        alert = await self._create_alert(db_session, test_tenant.id)
+        for _ in range(2):
+            resp = await client.post(
+                f"/api/v1/alerts/{alert.id}/forward",
+                headers=nurse_headers,
+                json={"to_role": "admin"},
+            )
+            assert resp.status_code == 200
+        assert resp.json()["data"]["forRoles"] == ["nurse", "doctor", "admin"]
+
+    async def test_seed_alerts_from_existing_data(
+        self, client: AsyncClient, nurse_headers, test_patient, count_queries
+    ):
+        """Priority-1 patient without vitals: a triage and a vitals-pending alert."""
+        with count_queries() as queries:
+            resp = await client.post("/api/v1/alerts/seed", headers=nurse_headers)
+        assert resp.status_code == 200
+        data = resp.json()["data"]
+        assert data["patientsScanned"] == 1
+        assert data["alertsCreated"] == 2
+        # Per-patient data is bulk-loaded, not queried inside the loop
+        assert len(queries) <= 10
@@ -66,12 +66,18 @@ class TestLogin:
 class TestAuthenticatedEndpoints:
     """Tests requiring a logged-in user."""
 
-    async def test_get_me(self, client: AsyncClient, nurse_headers, nurse_user):
-        resp = await client.get("/api/v1/auth/me", headers=nurse_headers)
+    async def test_get_me(
+        self, client: AsyncClient, nurse_headers, nurse_user, test_department, count_queries
+    ):
+        with count_queries() as queries:
+            resp = await client.get("/api/v1/auth/me", headers=nurse_headers)
         assert resp.status_code == 200
         data = resp.json()["data"]
         assert data["name"] == "Test Nurse"
         assert data["role"] == "nurse"
+        assert data["department"] == test_department.name
+        # The department comes with the authenticated user lookup
+        assert len(queries) == 1
 
     async def test_logout_invalidates_session(self, client: AsyncClient, nurse_headers):
         # Logout
@@ -98,6 +104,69 @@ class TestAuthenticatedEndpoints:
         assert resp.json()["data"]["token"]
 
 
+class TestPasswordReset:
+    """Forgot-password / verify-OTP flow."""
+
+    async def test_new_otp_replaces_pending_one(
+        self, client: AsyncClient, db_session, nurse_user, monkeypatch
+    ):
+        from sqlalchemy import select
+        from app.api.routes import auth as auth_routes
+        from app.core import rate_limit
+        from app.models.user import PasswordResetToken
+
+        monkeypatch.setattr(rate_limit, "_attempts", rate_limit.defaultdict(list))
+        otps = iter(["111111", "222222"])
+        monkeypatch.setattr(auth_routes, "generate_otp", lambda: next(otps))
+
+        for _ in range(2):
+            resp = await client.post(
+                "/api/v1/auth/forgot-password", json={"email": "nurse@test.com"}
+            )
+            assert resp.status_code == 200
+
+        tokens = (await db_session.execute(
+            select(PasswordResetToken).where(PasswordResetToken.user_id == nurse_user.id)
+        )).scalars().all()
+        assert len(tokens) == 1
+
+        resp = await client.post(
+            "/api/v1/auth/verify-otp", json={"email": "nurse@test.com", "otp": "111111"}
+        )
+        assert resp.status_code == 400
+
+        resp = await client.post(
+            "/api/v1/auth/verify-otp", json={"email": "nurse@test.com", "otp": "222222"}
+        )
+        assert resp.status_code == 200
+        assert resp.json()["resetToken"]
+
+    async def test_expired_otp_rejected(
+        self, client: AsyncClient, db_session, nurse_user, monkeypatch
+    ):
+        from datetime import datetime, timedelta, timezone
+        from sqlalchemy import update
+        from app.api.routes import auth as auth_routes
+        from app.core import rate_limit
+        from app.models.user import PasswordResetToken
+
+        monkeypatch.setattr(rate_limit, "_attempts", rate_limit.defaultdict(list))
+        monkeypatch.setattr(auth_routes, "generate_otp", lambda: "333333")
+
+        await client.post("/api/v1/auth/forgot-password", json={"email": "nurse@test.com"})
+        await db_session.execute(
+            update(PasswordResetToken)
+            .where(PasswordResetToken.user_id == nurse_user.id)
+            .values(otp_expires_at=datetime.now(timezone.utc) - timedelta(minutes=1))
+        )
+        await db_session.flush()
+
+        resp = await client.post(
+            "/api/v1/auth/verify-otp", json={"email": "nurse@test.com", "otp": "333333"}
+        )
+        assert resp.status_code == 400
+
+
 class TestTokenSecurity:
     """Token validation edge cases."""
 
@@ -13,6 +13,19 @@ class TestBedOperations:
         beds = resp.json()["data"]["beds"]
         assert len(beds) >= 1
 
+    async def test_get_beds_includes_current_patient(
+        self, client: AsyncClient, nurse_headers, db_session, test_bed, test_patient
+    ):
+        test_bed.status = "occupied"
+        test_bed.current_patient_id = test_patient.id
+        await db_session.flush()
+
+        resp = await client.get("/api/v1/beds", headers=nurse_headers)
+        assert resp.status_code == 200
+        bed = next(b for b in resp.json()["data"] if b["id"] == str(test_bed.id))
+        assert bed["department"] is not None
+        assert bed["patient"] == {"id": str(test_patient.id), "name": test_patient.name}
+
     async def test_assign_bed(
         self, client: AsyncClient, nurse_headers, test_bed, test_patient
     ):
@@ -25,6 +38,55 @@ class TestBedOperations:
         data = resp.json()["data"]
         assert data["bedNumber"] == test_bed.bed_number
 
+    async def test_assign_bed_locks_patient_row(
+        self, client: AsyncClient, nurse_headers, test_bed, test_patient, count_queries
+    ):
+        """Concurrent assignments of one patient serialise on the patient row."""
+        with count_queries() as queries:
+            resp = await client.post(
+                f"/api/v1/beds/{test_bed.id}/assign",
+                headers=nurse_headers,
+                json={"patient_id": str(test_patient.id)},
+            )
+        assert resp.status_code == 200
+        patient_select = next(q for q in queries if "FROM patients" in q)
+        assert "FOR UPDATE OF patients" in patient_select
+
+    async def test_reassign_releases_previous_bed(
+        self, client: AsyncClient, nurse_headers, db_session, test_bed, test_patient, count_queries
+    ):
+        import uuid
+        from app.models.bed import Bed
+
+        new_bed = Bed(
+            id=uuid.uuid4(),
+            tenant_id=test_bed.tenant_id,
+            department_id=test_bed.department_id,
+            bed_number="ED-A-TEST-002",
+            bed_type="emergency",
+            status="available",
+            is_active=True,
+        )
+        db_session.add(new_bed)
+        test_bed.status = "occupied"
+        test_bed.current_patient_id = test_patient.id
+        test_patient.bed_id = test_bed.id
+        await db_session.flush()
+
+        with count_queries() as queries:
+            resp = await client.post(
+                f"/api/v1/beds/{new_bed.id}/assign",
+                headers=nurse_headers,
+                json={"patient_id": str(test_patient.id)},
+            )
+        assert resp.status_code == 200
+        # The target bed is claimed by a conditional UPDATE, never read first
+        assert not any(q.lstrip().startswith("SELECT beds.") for q in queries)
+
+        await db_session.refresh(test_bed)
+        assert test_bed.status == "available"
+        assert test_bed.current_patient_id is None
+
     async def test_assign_occupied_bed_fails(
         self, client: AsyncClient, nurse_headers, test_bed, test_patient, db_session
     ):
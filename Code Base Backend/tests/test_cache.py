@@ -0,0 +1,64 @@
+"""Unit tests for the optional Redis cache helpers (no Redis required)."""
+
+from app.core.cache import (
+    cache_get, cache_set, cache_invalidate, cache_key, cache_sadd, cache_smembers, tenant_prefix,
+)
+
+
+class TestCacheKeys:
+    """Key construction."""
+
+    def test_cache_key_ignores_param_order(self):
+        assert cache_key("staff:t1:list", role="nurse", search="a") == cache_key(
+            "staff:t1:list", search="a", role="nurse"
+        )
+
+    def test_cache_key_differs_per_params(self):
+        assert cache_key("staff:t1:list", role="nurse") != cache_key("staff:t1:list", role="doctor")
+
+    def test_tenant_prefix_scopes_keys(self):
+        assert cache_key(tenant_prefix("staff", "t1") + "list").startswith("staff:t1:")
+
+
+class TestCacheDisabled:
+    """Without REDIS_URL every helper is a no-op."""
+
+    async def test_get_misses_and_set_is_noop(self):
+        await cache_set("staff:t1:counts", {"doctor": 1}, 60)
+        assert await cache_get("staff:t1:counts") is None
+        await cache_invalidate("staff:t1:")
+
+    async def test_set_helpers_are_noops(self):
+        await cache_sadd("departments:t1:codes", "ED-A", ttl=60)
+        assert await cache_smembers("departments:t1:codes") == set()
+
+
+class TestAlertCountInvalidation:
+    """Alert writes through the ORM invalidate the tenant's cached counts."""
+
+    async def test_commit_invalidates_touched_tenants(self, monkeypatch):
+        import types
+        import uuid
+
+        from app.db.database import run_after_commit_tasks
+        from app.models.alert import Alert
+        from app.services import alert_counts
+
+        invalidated = []
+
+        async def _record(tenant_id):
+            invalidated.append(tenant_id)
+
+        monkeypatch.setattr(alert_counts, "invalidate_alert_counts", _record)
+        tenant_id = uuid.uuid4()
+        session = types.SimpleNamespace(
+            new=[Alert(tenant_id=tenant_id)], dirty=[], deleted=[], info={}
+        )
+
+        alert_counts._track_alert_changes(session, None)
+        alert_counts._invalidate_after_commit(session)
+        assert invalidated == []  # queued, not detached: awaited by get_db
+
+        await run_after_commit_tasks(session)
+        assert invalidated == [tenant_id]
+        assert session.info == {}
@@ -0,0 +1,111 @@
+"""Tests for dashboard routes."""
+
+from httpx import AsyncClient
+
+
+class TestDashboardStats:
+    """Header and overview counters."""
+
+    async def test_stats_in_one_query(
+        self, client: AsyncClient, nurse_headers, test_patient, test_bed, count_queries
+    ):
+        with count_queries() as queries:
+            resp = await client.get("/api/v1/dashboard/stats", headers=nurse_headers)
+        assert resp.status_code == 200
+        # auth (user + revocation check) + stats
+        assert len(queries) <= 3
+
+        data = resp.json()["data"]
+        assert data["patients"]["total"] == 1
+        assert data["patients"]["critical"] == 1
+        assert data["beds"] == {"total": 1, "occupied": 0, "available": 1, "byDepartment": {}}
+        assert data["alerts"] == {"unread": 0, "critical": 0}
+
+
+class TestOccupancy:
+    """Occupancy by bed type."""
+
+    async def test_occupancy_by_bed_type(
+        self, client: AsyncClient, nurse_headers, db_session, test_bed
+    ):
+        test_bed.status = "occupied"
+        await db_session.flush()
+
+        resp = await client.get("/api/v1/dashboard/occupancy", headers=nurse_headers)
+        assert resp.status_code == 200
+        assert resp.json()["data"] == {"icu": 0, "general": 0, "isolation": 0, "emergency": 100.0}
+
+
+class TestPatientFlow:
+    """Analytics chart data."""
+
+    async def test_bed_utilization_by_department(
+        self, client: AsyncClient, nurse_headers, db_session, test_bed, test_department
+    ):
+        test_bed.status = "occupied"
+        await db_session.flush()
+
+        resp = await client.get("/api/v1/dashboard/patient-flow", headers=nurse_headers)
+        assert resp.status_code == 200
+        data = resp.json()["data"]
+        assert data["bed_utilization"] == [
+            {"zone": test_department.code, "utilized": 100, "capacity": 1}
+        ]
+        assert len(data["discharge_admission"]) == 7
+
+    async def test_daily_flow_counts_today(
+        self, client: AsyncClient, nurse_headers, db_session, test_patient
+    ):
+        from datetime import datetime, timezone
+
+        test_patient.admitted_at = datetime.now(timezone.utc)
+        await db_session.flush()
+
+        resp = await client.get("/api/v1/dashboard/patient-flow", headers=nurse_headers)
+        assert resp.status_code == 200
+        flow = resp.json()["data"]["discharge_admission"]
+        assert [d["admitted"] for d in flow] == [0, 0, 0, 0, 0, 0, 1]
+        assert all(d["discharged"] == 0 for d in flow)
+
+
+class TestAlertsSummary:
+    """Header badge counts and recent alerts."""
+
+    async def test_summary_counts_and_recent(
+        self, client: AsyncClient, nurse_headers, db_session, test_tenant
+    ):
+        from app.models.alert import Alert
+
+        db_session.add_all([
+            Alert(tenant_id=test_tenant.id, title="Critical", message="m", priority="critical", status="unread"),
+            Alert(tenant_id=test_tenant.id, title="Routine", message="m", priority="low", status="unread"),
+        ])
+        await db_session.flush()
+
+        resp = await client.get("/api/v1/dashboard/alerts-summary", headers=nurse_headers)
+        assert resp.status_code == 200
+        data = resp.json()["data"]
+        assert data["unreadCount"] == 2
+        assert data["criticalCount"] == 1
+        assert {a["title"] for a in data["recentAlerts"]} == {"Critical", "Routine"}
+
+
+class TestRecentPatients:
+    """Recent admissions and discharges."""
+
+    async def test_discharged_patient_reports_discharge(
+        self, client: AsyncClient, nurse_headers, db_session, test_patient, test_department
+    ):
+        from datetime import datetime, timezone
+
+        test_patient.status = "discharged"
+        test_patient.discharged_at = datetime(2026, 2, 14, 10, 30, tzinfo=timezone.utc)
+        await db_session.flush()
+
+        resp = await client.get("/api/v1/dashboard/recent-patients", headers=nurse_headers)
+        assert resp.status_code == 200
+        [activity] = resp.json()["data"]
+        assert activity["id"] == str(test_patient.id)
+        assert activity["action"] == "discharged"
+        assert activity["timestamp"].startswith("2026-02-14T10:30:00")
+        assert activity["department"] == test_department.name
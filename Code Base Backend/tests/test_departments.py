@@ -0,0 +1,40 @@
+"""Tests for department lookup routes."""
+
+from httpx import AsyncClient
+
+
+class TestDepartmentLookups:
+    """Department and department-bed lists."""
+
+    async def test_get_departments(self, client: AsyncClient, nurse_headers, test_department):
+        resp = await client.get("/api/v1/departments", headers=nurse_headers)
+        assert resp.status_code == 200
+        codes = [d["code"] for d in resp.json()["data"]["departments"]]
+        assert test_department.code in codes
+
+    async def test_department_beds_revalidate_with_etag(
+        self, client: AsyncClient, nurse_headers, test_department, test_bed
+    ):
+        url = f"/api/v1/departments/{test_department.id}/beds?status=all"
+        resp = await client.get(url, headers=nurse_headers)
+        assert resp.status_code == 200
+        assert len(resp.json()["data"]["beds"]) == 1
+        etag = resp.headers["etag"]
+
+        resp = await client.get(url, headers={**nurse_headers, "If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.content == b""
+
+    async def test_department_beds_etag_changes_with_status(
+        self, client: AsyncClient, nurse_headers, db_session, test_department, test_bed
+    ):
+        url = f"/api/v1/departments/{test_department.id}/beds?status=all"
+        resp = await client.get(url, headers=nurse_headers)
+        etag = resp.headers["etag"]
+
+        test_bed.status = "maintenance"
+        await db_session.flush()
+
+        resp = await client.get(url, headers={**nurse_headers, "If-None-Match": etag})
+        assert resp.status_code == 200
+        assert resp.json()["data"]["beds"][0]["status"] == "maintenance"
@@ -0,0 +1,36 @@
+"""Tests for patient note routes."""
+
+from httpx import AsyncClient
+
+
+class TestPatientNotes:
+    """Reading notes with their creators."""
+
+    async def test_notes_include_creator_in_one_query(
+        self, client: AsyncClient, nurse_headers, nurse_user, doctor_user,
+        db_session, test_patient, count_queries
+    ):
+        from app.models.patient import PatientNote
+
+        db_session.add_all([
+            PatientNote(patient_id=test_patient.id, note_type="nurse",
+                        content="Obs stable", created_by=nurse_user.id),
+            PatientNote(patient_id=test_patient.id, note_type="doctor",
+                        content="Start fluids", created_by=doctor_user.id),
+            PatientNote(patient_id=test_patient.id, note_type="doctor",
+                        content="Private", created_by=doctor_user.id, is_confidential=True),
+        ])
+        await db_session.flush()
+
+        with count_queries() as queries:
+            resp = await client.get(
+                f"/api/v1/patients/{test_patient.id}/notes", headers=nurse_headers
+            )
+        assert resp.status_code == 200
+        notes = resp.json()["data"]
+        # The doctor's confidential note is hidden from the nurse
+        assert sorted(n["content"] for n in notes) == ["Obs stable", "Start fluids"]
+        creators = {n["content"]: n["createdBy"]["id"] for n in notes}
+        assert creators["Start fluids"] == str(doctor_user.id)
+        # auth + patient check + notes joined to creators
+        assert len(queries) == 3
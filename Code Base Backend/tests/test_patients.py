@@ -26,6 +26,52 @@ class TestPatientCRUD:
         assert data["name"] == "John Doe"
         assert data["patientId"]  # auto-generated ID
 
+    async def test_patient_ids_are_sequential(
+        self, client: AsyncClient, nurse_headers, test_department
+    ):
+        ids = []
+        for name in ("First Patient", "Second Patient"):
+            resp = await client.post(
+                "/api/v1/patients",
+                headers=nurse_headers,
+                json={
+                    "name": name,
+                    "complaint": "Fever",
+                    "department_id": str(test_department.id),
+                    "auto_assign_bed": False,
+                },
+            )
+            assert resp.status_code == 201
+            ids.append(resp.json()["data"]["patientId"])
+        assert ids == ["P00001", "P00002"]
+
+    async def test_create_patient_triages_before_any_write(
+        self, client: AsyncClient, nurse_headers, test_department, count_queries, monkeypatch
+    ):
+        """The LLM call must not run while the patient counter row is locked."""
+        from app.services.triage import TriageService
+
+        with count_queries() as queries:
+            seen_before_triage = []
+
+            async def _fake_triage(self, **kwargs):
+                seen_before_triage.extend(queries)
+                return {"priority": 3, "priority_label": "L3 - Urgent", "priority_color": "yellow"}
+
+            monkeypatch.setattr(TriageService, "run_triage", _fake_triage)
+            resp = await client.post(
+                "/api/v1/patients",
+                headers=nurse_headers,
+                json={"name": "Lock Check", "complaint": "Fever",
+                      "department_id": str(test_department.id), "auto_assign_bed": False},
+            )
+        assert resp.status_code == 201
+        assert seen_before_triage
+        assert not any(
+            q.lstrip().upper().startswith(("INSERT", "UPDATE")) for q in seen_before_triage
+        )
+        assert any("tenant_counters" in q for q in queries)
+
     async def test_create_patient_auto_assigns_doctor(
         self, client: AsyncClient, nurse_headers, test_department, doctor_user
     ):
@@ -53,6 +99,22 @@ class TestPatientCRUD:
         patients = resp.json()["data"]["patients"]
         assert len(patients) >= 1
 
+    async def test_get_patients_pagination_total(
+        self, client: AsyncClient, nurse_headers, test_patient
+    ):
+        resp = await client.get("/api/v1/patients?status=all&limit=1", headers=nurse_headers)
+        assert resp.json()["data"]["pagination"]["total"] == 1
+
+        # Past the last page the total still comes back
+        resp = await client.get("/api/v1/patients?status=all&limit=1&page=2", headers=nurse_headers)
+        data = resp.json()["data"]
+        assert data["patients"] == []
+        assert data["pagination"]["total"] == 1
+
+    async def test_get_patients_rejects_oversized_page(self, client: AsyncClient, nurse_headers):
+        resp = await client.get("/api/v1/patients?limit=1000", headers=nurse_headers)
+        assert resp.status_code == 422
+
     async def test_get_patients_filtered_by_department(
         self, client: AsyncClient, nurse_headers, test_patient, test_department
     ):
@@ -67,6 +129,41 @@ class TestPatientCRUD:
         for p in patients:
             assert p["department"] == test_department.name
 
+    async def test_get_patients_list_batches_vitals(
+        self, client: AsyncClient, nurse_headers, nurse_user, db_session,
+        test_tenant, test_department, count_queries
+    ):
+        """Latest vitals, triage and recorder load per page, not per patient."""
+        from datetime import datetime, timedelta, timezone
+        from app.models.patient import Patient, PatientVitals
+
+        now = datetime.now(timezone.utc)
+        for i in range(3):
+            patient = Patient(
+                id=uuid.uuid4(), tenant_id=test_tenant.id, patient_id=f"PT-BATCH-{i}",
+                name=f"Batch Patient {i}", department_id=test_department.id,
+                status="active", priority=3,
+            )
+            db_session.add(patient)
+            await db_session.flush()
+            db_session.add_all([
+                PatientVitals(patient_id=patient.id, heart_rate=70, recorded_by=nurse_user.id,
+                              recorded_at=now - timedelta(hours=1)),
+                PatientVitals(patient_id=patient.id, heart_rate=90 + i, recorded_by=nurse_user.id,
+                              recorded_at=now),
+            ])
+        await db_session.flush()
+
+        with count_queries() as queries:
+            resp = await client.get("/api/v1/patients?status=all", headers=nurse_headers)
+        assert resp.status_code == 200
+        patients = {p["patientId"]: p for p in resp.json()["data"]["patients"]}
+        for i in range(3):
+            assert patients[f"PT-BATCH-{i}"]["vitals"]["hr"] == 90 + i
+            assert patients[f"PT-BATCH-{i}"]["lastUpdatedBy"]["id"] == str(nurse_user.id)
+        # auth + page with total + vitals + triage + users
+        assert len(queries) == 5
+
     async def test_get_patient_by_id(self, client: AsyncClient, nurse_headers, test_patient):
         resp = await client.get(
             f"/api/v1/patients/{test_patient.id}",
@@ -75,6 +172,113 @@ class TestPatientCRUD:
         assert resp.status_code == 200
         assert resp.json()["data"]["name"] == "Test Patient"
 
+    async def test_upload_photo_stores_file_not_data_url(
+        self, client: AsyncClient, nurse_headers, test_patient, tmp_path, monkeypatch
+    ):
+        from app.core.config import settings
+
+        monkeypatch.setattr(settings, "UPLOAD_STORAGE", "local")
+        monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+        resp = await client.post(
+            f"/api/v1/patients/{test_patient.id}/photo",
+            headers=nurse_headers,
+            files={"file": ("photo.png", b"\x89PNG fake", "image/png")},
+        )
+        assert resp.status_code == 200
+        key = f"patients/{test_patient.tenant_id}/{test_patient.id}/photo.png"
+        assert test_patient.photo_url == key
+        assert (tmp_path / key).read_bytes() == b"\x89PNG fake"
+
+        # Only the signed, short-lived URL from the response serves the file
+        photo_url = resp.json()["data"]["photoUrl"]
+        assert photo_url.startswith(f"{settings.API_PUBLIC_URL}/api/v1/uploads/{key}?")
+        photo_path = photo_url[len(settings.API_PUBLIC_URL):]
+        resp = await client.get(photo_path)
+        assert resp.status_code == 200
+        assert resp.content == b"\x89PNG fake"
+        resp = await client.get(f"/api/v1/uploads/{key}?expires=9999999999&signature=forged")
+        assert resp.status_code == 404
+
+    async def test_upload_photo_rejects_non_images(
+        self, client: AsyncClient, nurse_headers, test_patient
+    ):
+        resp = await client.post(
+            f"/api/v1/patients/{test_patient.id}/photo",
+            headers=nurse_headers,
+            files={"file": ("page.html", b"<script></script>", "text/html")},
+        )
+        assert resp.status_code == 400
+
+    async def test_upload_photo_rejects_oversized_files(
+        self, client: AsyncClient, nurse_headers, test_patient, monkeypatch
+    ):
+        from app.core.config import settings
+
+        monkeypatch.setattr(settings, "UPLOAD_MAX_BYTES", 4)
+        resp = await client.post(
+            f"/api/v1/patients/{test_patient.id}/photo",
+            headers=nurse_headers,
+            files={"file": ("photo.jpg", b"0123456789", "image/jpeg")},
+        )
+        assert resp.status_code == 413
+
+    async def test_get_patient_single_query(
+        self, client: AsyncClient, nurse_headers, db_session, test_patient, count_queries
+    ):
+        """Relations and allergies come back with the patient row."""
+        from app.models.patient import PatientAllergy
+
+        db_session.add_all([
+            PatientAllergy(patient_id=test_patient.id, allergen="Penicillin"),
+            PatientAllergy(patient_id=test_patient.id, allergen="Latex"),
+        ])
+        await db_session.flush()
+
+        with count_queries() as queries:
+            resp = await client.get(f"/api/v1/patients/{test_patient.id}", headers=nurse_headers)
+        assert resp.status_code == 200
+        data = resp.json()["data"]
+        assert sorted(data["allergies"]) == ["Latex", "Penicillin"]
+        assert data["department"] is not None
+        # auth + patient
+        assert len(queries) == 2
+
+    async def test_add_patient_vitals(self, client: AsyncClient, nurse_headers, test_patient):
+        resp = await client.post(
+            f"/api/v1/patients/{test_patient.id}/vitals",
+            headers=nurse_headers,
+            json={"hr": 88, "bp": "120/80", "spo2": 98, "temp": 37.2},
+        )
+        assert resp.status_code == 200
+        vitals = resp.json()["data"]["vitals"]
+        assert vitals["hr"] == 88
+        assert vitals["recordedAt"].endswith("Z")
+
+    async def test_vitals_history_loads_recorders_once(
+        self, client: AsyncClient, nurse_headers, nurse_user, db_session,
+        test_patient, count_queries
+    ):
+        """Vitals history is newest first and recorders load in one query."""
+        from datetime import datetime, timedelta, timezone
+        from app.models.patient import PatientVitals
+
+        now = datetime.now(timezone.utc)
+        db_session.add_all([
+            PatientVitals(patient_id=test_patient.id, heart_rate=70 + i, recorded_by=nurse_user.id,
+                          recorded_at=now - timedelta(hours=3 - i))
+            for i in range(3)
+        ])
+        await db_session.flush()
+
+        with count_queries() as queries:
+            resp = await client.get(f"/api/v1/patients/{test_patient.id}/vitals", headers=nurse_headers)
+        assert resp.status_code == 200
+        vitals = resp.json()["data"]["vitals"]
+        assert [v["hr"] for v in vitals] == [72, 71, 70]
+        assert all(v["recordedBy"]["id"] == str(nurse_user.id) for v in vitals)
+        # auth + patient + vitals + recorders
+        assert len(queries) == 4
+
 
 class TestPatientTriage:
     """Triage and discharge flows."""
@@ -90,6 +294,71 @@ class TestPatientTriage:
         assert resp.status_code == 200
         assert resp.json()["data"]["status"] == "discharged"
 
+    async def test_discharge_releases_bed(
+        self, client: AsyncClient, doctor_headers, db_session, test_patient, test_bed
+    ):
+        from sqlalchemy import select
+        from app.models.bed import Bed
+
+        test_bed.status = "occupied"
+        test_bed.current_patient_id = test_patient.id
+        test_patient.bed_id = test_bed.id
+        await db_session.flush()
+
+        resp = await client.post(
+            f"/api/v1/patients/{test_patient.id}/discharge",
+            headers=doctor_headers,
+            json={"notes": "Patient recovered"},
+        )
+        assert resp.status_code == 200
+        row = (await db_session.execute(
+            select(Bed.status, Bed.current_patient_id).where(Bed.id == test_bed.id)
+        )).one()
+        assert row == ("available", None)
+
+    async def test_batch_triage_writes_in_bulk(
+        self, client: AsyncClient, doctor_headers, db_session, test_tenant,
+        test_department, count_queries, monkeypatch
+    ):
+        """Triaged patients and their results are written with one statement each."""
+        from sqlalchemy import func, select
+        from app.models.patient import Patient
+        from app.models.triage import AITriageResult
+        from app.services.triage import TriageService
+
+        async def _fake_triage(self, **kwargs):
+            return {"priority": 2, "priority_label": "URGENT", "priority_color": "orange",
+                    "confidence": 0.9, "reasoning": "test"}
+
+        monkeypatch.setattr(TriageService, "run_triage", _fake_triage)
+        patient_ids = []
+        for i in range(3):
+            patient = Patient(
+                id=uuid.uuid4(), tenant_id=test_tenant.id, patient_id=f"PT-BULK-{i}",
+                name=f"Bulk Patient {i}", department_id=test_department.id,
+                status="pending_triage", priority=None,
+            )
+            db_session.add(patient)
+            patient_ids.append(patient.id)
+        await db_session.flush()
+
+        with count_queries() as queries:
+            resp = await client.post("/api/v1/patients/batch-triage", headers=doctor_headers)
+        assert resp.status_code == 200
+        assert resp.json()["data"]["triaged_count"] == 3
+        # auth + patients + vitals + bulk update + bulk insert
+        assert len(queries) == 5
+
+        rows = (await db_session.execute(
+            select(Patient.priority, Patient.status).where(Patient.id.in_(patient_ids))
+        )).all()
+        assert rows == [(2, "active")] * 3
+        results = await db_session.scalar(
+            select(func.count()).select_from(AITriageResult)
+            .where(AITriageResult.patient_id.in_(patient_ids))
+        )
+        assert results == 3
+
 
 class TestTenantIsolation:
     """Multi-tenancy isolation."""
@@ -0,0 +1,47 @@
+"""Unit tests for password hashing and token helpers (no database required)."""
+
+from datetime import timedelta
+
+from app.core import security
+from app.core.security import (
+    create_access_token,
+    decode_token,
+    get_password_hash_async,
+    verify_password,
+    verify_password_async,
+)
+
+
+class TestAsyncPasswordHashing:
+    """bcrypt helpers offloaded to the worker pool."""
+
+    async def test_hash_round_trips(self):
+        hashed = await get_password_hash_async("s3cret-pass")
+        assert verify_password("s3cret-pass", hashed)
+        assert await verify_password_async("s3cret-pass", hashed)
+
+    async def test_verify_rejects_wrong_password(self):
+        hashed = await get_password_hash_async("s3cret-pass")
+        assert not await verify_password_async("wrong-pass", hashed)
+
+
+class TestDecodeToken:
+    """Signature checks are memoized; expiry is checked on every call."""
+
+    def test_cached_token_still_expires(self, monkeypatch):
+        token = create_access_token({"sub": "user-1"}, expires_delta=timedelta(minutes=5))
+        payload = decode_token(token)
+        assert payload["sub"] == "user-1"
+
+        later = security.time.time() + 600
+        monkeypatch.setattr(security.time, "time", lambda: later)
+        assert decode_token(token) is None
+
+    def test_tampered_token_rejected(self):
+        token = create_access_token({"sub": "user-1"})
+        assert decode_token(token[:-2] + ("A" if token[-2] != "A" else "B") + token[-1]) is None
+
+    def test_callers_get_their_own_copy(self):
+        token = create_access_token({"sub": "user-1"})
+        decode_token(token)["sub"] = "someone-else"
+        assert decode_token(token)["sub"] == "user-1"
@@ -37,3 +37,99 @@ class TestTriageServiceMock:
         )
         assert result["priority"] == 1
         assert result["priority_label"] == "L1 - Critical"
+
+
+class TestTriageResultCache:
+    """Identical triage prompts are answered from the cache."""
+
+    async def test_repeated_prompt_skips_llm_call(self, monkeypatch):
+        import types
+        from app.services import triage
+
+        store = {}
+
+        async def _get(key):
+            return store.get(key)
+
+        async def _set(key, value, ttl):
+            store[key] = value
+
+        monkeypatch.setattr(triage, "cache_get", _get)
+        monkeypatch.setattr(triage, "cache_set", _set)
+
+        calls = []
+
+        async def _create(**kwargs):
+            calls.append(kwargs)
+            message = types.SimpleNamespace(content='{"priority": 3, "priority_label": "L3 - Urgent"}')
+            return types.SimpleNamespace(
+                id="req-1", usage=None, choices=[types.SimpleNamespace(message=message)]
+            )
+
+        service = TriageService()
+        service.client = types.SimpleNamespace(
+            chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=_create))
+        )
+
+        first = await service.run_triage("fever", age=30, vitals={"hr": "101"})
+        second = await service.run_triage("fever", age=30, vitals={"hr": "101"})
+        third = await service.run_triage("fever", age=31, vitals={"hr": "101"})
+
+        assert second["priority"] == first["priority"] == 3
+        assert first["groq_request_id"] == "req-1"
+        assert second["groq_request_id"] is None
+        assert second["processing_time_ms"] is None
+        assert second["cached"] is True
+        assert third["priority"] == 3
+        assert len(calls) == 2
+
+
+class TestUploadUrls:
+    """Stored photos are only reachable through signed, expiring URLs."""
+
+    def test_signed_url_resolves_to_file(self, tmp_path, monkeypatch):
+        from urllib.parse import parse_qs, urlsplit
+        from app.core.config import settings
+        from app.services.storage import local_upload_path, upload_url
+
+        monkeypatch.setattr(settings, "UPLOAD_STORAGE", "local")
+        monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+        key = "patients/t1/p1/photo.jpg"
+        (tmp_path / "patients/t1/p1").mkdir(parents=True)
+        (tmp_path / key).write_bytes(b"jpg")
+
+        query = parse_qs(urlsplit(upload_url(key)).query)
+        expires, signature = int(query["expires"][0]), query["signature"][0]
+
+        assert local_upload_path(key, expires, signature) == (tmp_path / key).resolve()
+        assert local_upload_path("patients/t2/p2/photo.jpg", expires, signature) is None
+        assert local_upload_path(key, expires + 1, signature) is None
+        assert local_upload_path(key, 1, signature) is None
+
+    def test_legacy_values_pass_through(self):
+        from app.services.storage import upload_url
+
+        assert upload_url(None) is None
+        assert upload_url("data:image/png;base64,AAAA") == "data:image/png;base64,AAAA"
+
+    def test_lambda_defaults_to_s3_storage(self, monkeypatch):
+        from app.core.config import Settings
+
+        monkeypatch.delenv("UPLOAD_STORAGE", raising=False)
+        assert Settings().UPLOAD_STORAGE == "local"
+        monkeypatch.setenv("AWS_LAMBDA_FUNCTION_NAME", "er-cmd-backend")
+        assert Settings().UPLOAD_STORAGE == "s3"
+        # An explicit choice is kept; local writes are refused at upload time
+        assert Settings(UPLOAD_STORAGE="local").UPLOAD_STORAGE == "local"
+
+    async def test_local_upload_refused_on_lambda(self, tmp_path, monkeypatch):
+        import io
+        from app.core.config import settings
+        from app.services.storage import store_upload
+
+        monkeypatch.setattr(settings, "UPLOAD_STORAGE", "local")
+        monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+        monkeypatch.setenv("AWS_LAMBDA_FUNCTION_NAME", "er-cmd-backend")
+        with pytest.raises(RuntimeError):
+            await store_upload("patients/t/p/photo.jpg", io.BytesIO(b"x"), "image/jpeg")
+        assert not any(tmp_path.iterdir())